@@ -11,16 +11,20 @@ from typing import Any
 import voluptuous as vol
 from homeassistant.components.calendar import CalendarEntityFeature, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.const import PERCENTAGE, Platform
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+from homeassistant.helpers.event import async_track_point_in_time, async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
 
 from .const import (
+    CALENDAR_SYNC_MARGIN,
     CONF_CALENDAR_SYNC,
     CONF_CALENDAR_SYNC_DAYS,
     CONF_CALENDAR_SYNC_INTERVAL_HOURS,
@@ -39,22 +43,31 @@ from .const import (
     DOMAIN,
     HOLIDAY_API,
     LOGGER,
-    PLATFORMS,
     SERVICE_EXPORT_EXCEPTIONS,
+    SERVICE_GET_CUSTODY_SHARE,
+    SERVICE_GET_OWNERSHIP,
     SERVICE_IMPORT_EXCEPTIONS,
     SERVICE_OVERRIDE_PRESENCE,
     SERVICE_PURGE_CALENDAR,
     SERVICE_REFRESH_SCHEDULE,
     SERVICE_SET_MANUAL_DATES,
     SERVICE_TEST_HOLIDAY_API,
+    STATISTICS_MONTHS,
     UPDATE_INTERVAL,
 )
 from .intent import async_setup_intents
-from .schedule import CustodyComputation, CustodyScheduleManager
+from .schedule import CustodyComputation, CustodyScheduleManager, async_remove_window_tiles
 from .school_holidays import SchoolHolidayClient
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR,
+    Platform.CALENDAR,
+    Platform.DEVICE_TRACKER,
+]
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the integration (YAML not supported, placeholder only)."""
@@ -85,15 +98,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     holidays = holiday_clients[api_url]
 
-    manager = CustodyScheduleManager(hass, config, holidays)
+    manager = CustodyScheduleManager(hass, config, holidays, entry.entry_id)
     _apply_manual_exceptions(manager, config)
     coordinator = CustodyScheduleCoordinator(hass, manager, entry)
 
     await coordinator.async_config_entry_first_refresh()
+    entry.async_on_unload(coordinator.async_cancel_transition_refresh)
+    entry.async_on_unload(coordinator.async_track_calendar_sync())
 
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "manager": manager,
+        "holidays": holidays,
     }
 
     entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
@@ -111,7 +127,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle entry removal by purging synced calendar events."""
+    """Handle entry removal by purging synced calendar events and the window cache."""
     config = {**entry.data, **(entry.options or {})}
     child_label = config.get(CONF_CHILD_NAME_DISPLAY, config.get(CONF_CHILD_NAME, ""))
     match_text = child_label or ""
@@ -130,6 +146,7 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
             log_context="entry removal",
         )
     )
+    await async_remove_window_tiles(hass, entry.entry_id)
 
 
 def _apply_manual_exceptions(manager: CustodyScheduleManager, config: dict[str, Any]) -> None:
@@ -138,6 +155,15 @@ def _apply_manual_exceptions(manager: CustodyScheduleManager, config: dict[str,
         manager.set_manual_windows(exceptions)
 
 
+def _calendar_sync_interval(config: dict[str, Any]) -> timedelta:
+    """Return the configured calendar sync interval, clamped to 1-24 hours (1 hour when invalid)."""
+    try:
+        hours = int(config.get(CONF_CALENDAR_SYNC_INTERVAL_HOURS, 1))
+    except (TypeError, ValueError):
+        hours = 1
+    return timedelta(hours=max(1, min(24, hours)))
+
+
 class CustodyScheduleCoordinator(DataUpdateCoordinator[CustodyComputation]):
     """Coordinator that keeps the schedule state up to date."""
 
@@ -157,6 +183,8 @@ class CustodyScheduleCoordinator(DataUpdateCoordinator[CustodyComputation]):
             locks[entry.entry_id] = asyncio.Lock()
         self._calendar_sync_lock = locks[entry.entry_id]
         self._last_calendar_sync: datetime | None = None
+        self._statistics_published: date | None = None
+        self._unsub_transition: CALLBACK_TYPE | None = None
 
     async def _async_update_data(self) -> CustodyComputation:
         """Fetch data from the schedule manager."""
@@ -167,10 +195,44 @@ class CustodyScheduleCoordinator(DataUpdateCoordinator[CustodyComputation]):
 
         self._fire_events(state)
         # Sync in background to allow setups/updates to return quickly
-        self.hass.async_create_task(self._maybe_sync_calendar(state))
+        self.hass.async_create_task(self._maybe_sync_calendar())
+        self.hass.async_create_task(self._async_publish_statistics())
         self._last_state = state
+        # La grille de garde commence aujourd'hui : recalculée aussi à minuit
+        midnight = dt_util.start_of_local_day(dt_util.now() + timedelta(days=1))
+        self._schedule_transition_refresh(min(state.next_transition or midnight, midnight))
         return state
 
+    @callback
+    def _schedule_transition_refresh(self, when: datetime | None) -> None:
+        """Wake up exactly at the next schedule transition instead of polling."""
+        self.async_cancel_transition_refresh()
+        if when is None:
+            return
+        LOGGER.debug("Next custody transition for %s scheduled at %s", self.entry.entry_id, when)
+        self._unsub_transition = async_track_point_in_time(self.hass, self._async_handle_transition, when)
+
+    async def _async_handle_transition(self, _now: datetime) -> None:
+        """Recompute the schedule when a transition is reached."""
+        self._unsub_transition = None
+        await self.async_refresh()
+
+    @callback
+    def async_track_calendar_sync(self) -> CALLBACK_TYPE:
+        """Sync the calendar at its configured interval (refreshes only follow the custody transitions)."""
+        interval = _calendar_sync_interval({**self.entry.data, **(self.entry.options or {})})
+        return async_track_time_interval(self.hass, self._async_calendar_sync_tick, interval)
+
+    async def _async_calendar_sync_tick(self, _now: datetime) -> None:
+        await self._maybe_sync_calendar()
+
+    @callback
+    def async_cancel_transition_refresh(self) -> None:
+        """Cancel the pending transition wake-up (entry unload or reschedule)."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
     def _fire_events(self, new_state: CustodyComputation) -> None:
         """Emit Home Assistant events when key transitions happen."""
         if self._last_state is None:
@@ -207,7 +269,50 @@ class CustodyScheduleCoordinator(DataUpdateCoordinator[CustodyComputation]):
                 },
             )
 
-    async def _maybe_sync_calendar(self, state: CustodyComputation) -> None:
+    async def _async_publish_statistics(self) -> None:
+        """Publish the monthly custody share and nights as long-term statistics (once a day)."""
+        today = dt_util.now().date()
+        if self._statistics_published == today or "recorder" not in self.hass.config.components:
+            return
+        if not self.manager.custody_enabled:
+            return
+        self._statistics_published = today
+
+        from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        child_label = self.entry.data.get(CONF_CHILD_NAME_DISPLAY, self.entry.data.get(CONF_CHILD_NAME))
+        slug = slugify(self.entry.data.get(CONF_CHILD_NAME) or child_label or self.entry.entry_id)
+        month = today.year * 12 + today.month - STATISTICS_MONTHS
+        first_month = date(month // 12, month % 12 + 1, 1)
+        try:
+            shares = await self.manager.async_monthly_shares(first_month, STATISTICS_MONTHS)
+            for key, name, unit, values in (
+                ("custody_share", "Custody share", PERCENTAGE, [share.share for share in shares]),
+                ("custody_nights", "Custody nights", "nights", [share.nights for share in shares]),
+            ):
+                metadata = StatisticMetaData(
+                    has_mean=True,
+                    has_sum=False,
+                    name=f"{child_label} {name}",
+                    source=DOMAIN,
+                    statistic_id=f"{DOMAIN}:{slug}_{key}",
+                    unit_of_measurement=unit,
+                )
+                rows = [
+                    StatisticData(
+                        start=dt_util.start_of_local_day(date.fromordinal(share.first_day)),
+                        mean=value,
+                        min=value,
+                        max=value,
+                    )
+                    for share, value in zip(shares, values)
+                ]
+                async_add_external_statistics(self.hass, metadata, rows)
+        except Exception as err:
+            LOGGER.warning("Unable to publish custody statistics for %s: %s", self.entry.entry_id, err)
+
+    async def _maybe_sync_calendar(self) -> None:
         """Sync custody windows to an external calendar if enabled."""
         config = {**self.entry.data, **(self.entry.options or {})}
         if not config.get(CONF_CALENDAR_SYNC):
@@ -220,28 +325,25 @@ class CustodyScheduleCoordinator(DataUpdateCoordinator[CustodyComputation]):
         LOGGER.debug("Calendar sync target resolved: %s (entry %s)", target, self.entry.entry_id)
 
         now = dt_util.now()
-        interval_hours = config.get(CONF_CALENDAR_SYNC_INTERVAL_HOURS, 1)
-        try:
-            interval_hours = int(interval_hours)
-        except (TypeError, ValueError):
-            interval_hours = 1
-        interval_hours = max(1, min(24, interval_hours))
+        interval = _calendar_sync_interval(config)
+        # Marge : le minuteur de synchro tombe juste après l'intervalle de la synchro précédente
+        due = interval - CALENDAR_SYNC_MARGIN
 
-        if self._last_calendar_sync and now - self._last_calendar_sync < timedelta(hours=interval_hours):
+        if self._last_calendar_sync and now - self._last_calendar_sync < due:
             LOGGER.debug(
-                "Calendar sync skipped (interval). Last sync: %s, interval: %sh",
+                "Calendar sync skipped (interval). Last sync: %s, interval: %s",
                 self._last_calendar_sync,
-                interval_hours,
+                interval,
             )
             return
 
         async with self._calendar_sync_lock:
             now = dt_util.now()
-            if self._last_calendar_sync and now - self._last_calendar_sync < timedelta(hours=interval_hours):
+            if self._last_calendar_sync and now - self._last_calendar_sync < due:
                 LOGGER.debug(
-                    "Calendar sync skipped inside lock (interval). Last sync: %s, interval: %sh",
+                    "Calendar sync skipped inside lock (interval). Last sync: %s, interval: %s",
                     self._last_calendar_sync,
-                    interval_hours,
+                    interval,
                 )
                 return
             try:
@@ -251,7 +353,7 @@ class CustodyScheduleCoordinator(DataUpdateCoordinator[CustodyComputation]):
                     )
                     return
                 LOGGER.debug("Calendar sync starting for %s", target)
-                await _sync_calendar_events(self.hass, target, state, config, self.entry.entry_id)
+                await _sync_calendar_events(self.hass, target, self.manager, config, self.entry.entry_id)
                 LOGGER.debug("Calendar sync completed for %s", target)
                 self._last_calendar_sync = now
             except Exception as err:
@@ -700,7 +802,7 @@ async def _get_calendar_events_direct(
 async def _sync_calendar_events(
     hass: HomeAssistant,
     target: str,
-    state: CustodyComputation,
+    manager: CustodyScheduleManager,
     config: dict[str, Any],
     entry_id: str,
 ) -> None:
@@ -822,11 +924,10 @@ async def _sync_calendar_events(
     # Deduplicate windows to prevent redundant creations in the same sync loop
     # Use a dict to keep the first occurrence of each unique key
     unique_windows = {}
-    for window in state.windows:
+    # Only the synced range is generated (the coordinator state holds the next weeks only)
+    for window in await manager.async_windows(start_range, end_range, now):
         if window.source == "vacation_filter":
             continue
-        if window.end < start_range or window.start > end_range:
-            continue
         summary = f"{child_label} • {window.label}".strip()
         key = _event_key(summary, window.start, window.end)
         if key not in unique_windows:
@@ -1433,6 +1534,72 @@ def _register_services(hass: HomeAssistant) -> None:
         ),
     )
 
+    async def _async_handle_get_ownership(call: ServiceCall) -> ServiceResponse:
+        """Return the custody of each day and night of a date range."""
+        _, manager = _get_manager(call.data["entry_id"])
+        first = call.data.get("start") or dt_util.now().date()
+        last = first + timedelta(days=call.data["days"] - 1)
+        grid = await manager.async_ownership(first, last)
+        return {
+            "start": first.isoformat(),
+            "end": last.isoformat(),
+            "days_with_custody": grid.count_days(grid.first_day, grid.last_day),
+            "nights_with_custody": grid.count_nights(grid.first_day, grid.last_day),
+            "days": [
+                {"date": date.fromordinal(day).isoformat(), "day": day_source, "night": night_source}
+                for day, day_source, night_source in grid.rows()
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_OWNERSHIP,
+        _async_handle_get_ownership,
+        schema=vol.Schema(
+            {
+                vol.Required("entry_id"): vol.All(cv.string, vol.Length(min=1)),
+                vol.Optional("start"): cv.date,
+                vol.Optional("days", default=30): vol.All(vol.Coerce(int), vol.Range(min=1, max=3660)),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def _async_handle_get_custody_share(call: ServiceCall) -> ServiceResponse:
+        """Return the custody share figures of a date range."""
+        _, manager = _get_manager(call.data["entry_id"])
+        first, last = call.data["start"], call.data["end"]
+        if last < first:
+            raise HomeAssistantError("end must not be before start")
+        share = await manager.async_custody_share(first, last)
+        return {
+            "start": first.isoformat(),
+            "end": last.isoformat(),
+            "share": share.share,
+            "night_share": share.night_share,
+            "days": share.days,
+            "nights": share.nights,
+            "total_days": share.total_days,
+            "weekends": share.weekends,
+            "total_weekends": share.total_weekends,
+            "longest_stay_days": round(share.longest_stay / 86400, 2),
+            "longest_separation_days": round(share.longest_separation / 86400, 2),
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CUSTODY_SHARE,
+        _async_handle_get_custody_share,
+        schema=vol.Schema(
+            {
+                vol.Required("entry_id"): vol.All(cv.string, vol.Length(min=1)),
+                vol.Required("start"): cv.date,
+                vol.Required("end"): cv.date,
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
     async def _async_handle_test_api(call: ServiceCall) -> None:
         """Test the holiday API connection."""
         entry_id = call.data.get("entry_id")
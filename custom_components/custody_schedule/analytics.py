@@ -0,0 +1,167 @@
+"""Custody share analytics on custody intervals without Home Assistant imports (testable in isolation).
+
+Everything is interval arithmetic on epoch seconds: windows are merged once, then each
+range only reads the merged intervals it touches (bisect) and counts days, nights and
+weekends arithmetically per interval.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Iterator
+
+from .local_time import LocalDayTable, weekday_of
+
+Interval = tuple[int, int]
+
+# Un week-end compte quand la nuit du samedi au dimanche est passée avec l'enfant
+WEEKEND_NIGHT = 5
+
+
+@dataclass(slots=True, frozen=True)
+class CustodyShare:
+    """Custody figures of one range of local days [first_day, last_day] (date ordinals)."""
+
+    first_day: int
+    last_day: int
+    custody_seconds: int
+    total_seconds: int
+    days: int
+    nights: int
+    weekends: int
+    total_weekends: int
+    # Longest continuous custody and longest time without the child inside the range (seconds)
+    longest_stay: int
+    longest_separation: int
+
+    @property
+    def total_days(self) -> int:
+        """Return the number of days (and nights) of the range."""
+        return self.last_day - self.first_day + 1
+
+    @property
+    def share(self) -> float:
+        """Return the custody share of the time, in percent."""
+        return round(100 * self.custody_seconds / self.total_seconds, 2) if self.total_seconds else 0.0
+
+    @property
+    def night_share(self) -> float:
+        """Return the custody share of the nights, in percent."""
+        return round(100 * self.nights / self.total_days, 2)
+
+
+class CustodyIntervals:
+    """Merged, sorted custody intervals [start, end) in epoch seconds."""
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, spans: Iterable[Interval]) -> None:
+        starts: list[int] = []
+        ends: list[int] = []
+        for start, end in sorted(spans):
+            if end <= start:
+                continue
+            if ends and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts = starts
+        self._ends = ends
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self._starts, self._ends)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def with_interval(self, start: int, end: int, present: bool) -> CustodyIntervals:
+        """Return the intervals with [start, end) added (present) or removed (absent), e.g. an override."""
+        if not present:
+            spans: list[Interval] = []
+            for low, high in self:
+                if high <= start or low >= end:
+                    spans.append((low, high))
+                    continue
+                if low < start:
+                    spans.append((low, start))
+                if high > end:
+                    spans.append((end, high))
+            return CustodyIntervals(spans)
+        return CustodyIntervals([*self, (start, end)])
+
+    def touching(self, low: int, high: int) -> list[Interval]:
+        """Return the intervals ending after `low` and starting at or before `high` (not clipped)."""
+        first = bisect_right(self._ends, low)
+        last = bisect_right(self._starts, high)
+        return list(zip(self._starts[first:last], self._ends[first:last]))
+
+
+def count_weekday(first_day: int, last_day: int, weekday: int) -> int:
+    """Return how many days of [first_day, last_day] fall on `weekday` (Monday = 0)."""
+    first_match = first_day + (weekday - weekday_of(first_day)) % 7
+    return (last_day - first_match) // 7 + 1 if first_match <= last_day else 0
+
+
+def custody_share(intervals: CustodyIntervals, first_day: int, last_day: int, table: LocalDayTable) -> CustodyShare:
+    """Measure the custody of the local days [first_day, last_day].
+
+    A day counts when custody covers part of it, a night (the one after a day) when the
+    child is there at the following local midnight, a weekend when the Saturday night is.
+    """
+    low, high = table.epoch(first_day), table.epoch(last_day + 1)
+
+    custody_seconds = days = nights = weekends = longest_stay = longest_separation = 0
+    previous_end = low
+    last_counted_day = first_day - 1
+    # Not clipped: the night of the last day closes at `high`, after the range
+    for start, end in intervals.touching(low, high):
+        inside_start, inside_end = max(start, low), min(end, high)
+        if inside_end > inside_start:
+            custody_seconds += inside_end - inside_start
+            longest_stay = max(longest_stay, inside_end - inside_start)
+            longest_separation = max(longest_separation, inside_start - previous_end)
+            previous_end = inside_end
+
+        start_day, _ = table.split_epoch(start)
+        end_day, _ = table.split_epoch(end)
+        # Days touched by [start, end), each counted once when two intervals share it
+        first_touched = max(start_day, first_day, last_counted_day + 1)
+        last_touched = min(end_day if end > table.epoch(end_day) else end_day - 1, last_day)
+        if first_touched <= last_touched:
+            days += last_touched - first_touched + 1
+            last_counted_day = last_touched
+        # Nights whose closing midnight falls in [start, end) (intervals are disjoint: no overlap)
+        first_night = max(start_day - 1 if start <= table.epoch(start_day) else start_day, first_day)
+        last_night = min(end_day - 1 if table.epoch(end_day) < end else end_day - 2, last_day)
+        if first_night <= last_night:
+            nights += last_night - first_night + 1
+            weekends += count_weekday(first_night, last_night, WEEKEND_NIGHT)
+    longest_separation = max(longest_separation, high - previous_end)
+
+    return CustodyShare(
+        first_day=first_day,
+        last_day=last_day,
+        custody_seconds=custody_seconds,
+        total_seconds=high - low,
+        days=days,
+        nights=nights,
+        weekends=weekends,
+        total_weekends=count_weekday(first_day, last_day, WEEKEND_NIGHT),
+        longest_stay=longest_stay,
+        longest_separation=longest_separation,
+    )
+
+
+def month_ranges(first_month: date, months: int) -> list[tuple[int, int]]:
+    """Return the (first day, last day) ordinals of `months` calendar months from `first_month`."""
+    ranges = []
+    year, month = first_month.year, first_month.month
+    for _ in range(months):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        ranges.append((date(year, month, 1).toordinal(), date(next_year, next_month, 1).toordinal() - 1))
+        year, month = next_year, next_month
+    return ranges
@@ -10,10 +10,12 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
 
 from . import CustodyScheduleCoordinator
 from .const import (
+    ATTR_CUSTODY_TONIGHT,
     ATTR_CUSTODY_TYPE,
     ATTR_DAYS_UNTIL_VACATION,
     ATTR_NEXT_ARRIVAL,
@@ -21,6 +23,7 @@ from .const import (
     ATTR_NEXT_VACATION_END,
     ATTR_NEXT_VACATION_NAME,
     ATTR_NEXT_VACATION_START,
+    ATTR_NIGHTS_NEXT_30_DAYS,
     ATTR_SCHOOL_HOLIDAYS_RAW,
     ATTR_VACATION_NAME,
     CONF_CHILD_NAME,
@@ -87,6 +90,9 @@ class CustodyPresenceBinarySensor(CoordinatorEntity[CustodyComputation], BinaryS
         if not data:
             return {}
 
+        ownership = data.ownership
+        # Aujourd'hui à la lecture : la grille a pu être calculée la veille
+        today = ownership.clamp(dt_util.now().date().toordinal()) if ownership else None
         return {
             "child_name": self._entry.data.get(CONF_CHILD_NAME_DISPLAY, self._entry.data.get(CONF_CHILD_NAME)),
             ATTR_CUSTODY_TYPE: self._entry.data.get("custody_type"),
@@ -96,6 +102,9 @@ class CustodyPresenceBinarySensor(CoordinatorEntity[CustodyComputation], BinaryS
             ATTR_NEXT_VACATION_NAME: data.next_vacation_name,
             ATTR_NEXT_VACATION_START: data.next_vacation_start.isoformat() if data.next_vacation_start else None,
             ATTR_NEXT_VACATION_END: data.next_vacation_end.isoformat() if data.next_vacation_end else None,
-            ATTR_DAYS_UNTIL_VACATION: data.days_until_vacation,
+            ATTR_DAYS_UNTIL_VACATION: data.days_until_vacation_at(dt_util.now()),
             ATTR_SCHOOL_HOLIDAYS_RAW: data.school_holidays_raw,
+            # Lectures directes dans la grille de garde
+            ATTR_CUSTODY_TONIGHT: ownership.night_source(today) is not None if ownership else None,
+            ATTR_NIGHTS_NEXT_30_DAYS: ownership.count_nights(today, ownership.last_day) if ownership else None,
         }
@@ -68,9 +68,7 @@ class CustodyCalendarEntity(CoordinatorEntity[CustodyComputation], CalendarEntit
         if not data:
             return None
 
-        now = dt_util.now()
-        upcoming = sorted((window for window in data.windows if window.end > now), key=lambda window: window.start)
-        window = upcoming[0] if upcoming else None
+        window = data.window_index.first_ending_after(dt_util.now())
         return self._window_to_event(window) if window else None
 
     async def async_get_events(
@@ -81,12 +79,9 @@ class CustodyCalendarEntity(CoordinatorEntity[CustodyComputation], CalendarEntit
         if not data:
             return []
 
-        events: list[CalendarEvent] = []
-        for window in data.windows:
-            if window.end < start_date or window.start > end_date:
-                continue
-            events.append(self._window_to_event(window))
-        return events
+        # Windows are generated for the requested range only (the coordinator keeps the next weeks)
+        windows = await self.coordinator.manager.async_windows(start_date, end_date)
+        return [self._window_to_event(window) for window in windows]
 
     def _window_to_event(self, window: CustodyWindow) -> CalendarEvent:
         """Convert an internal window to a CalendarEvent."""
@@ -1,22 +1,22 @@
-"""Constants for the Custody Schedule integration."""
+"""Constants for the Custody Schedule integration (no Home Assistant imports: shared with the engine)."""
 
 from __future__ import annotations
 
 import logging
 from datetime import timedelta
 
-from homeassistant.const import Platform
-
 LOGGER = logging.getLogger(__package__)
 
 DOMAIN = "custody_schedule"
-PLATFORMS: list[Platform] = [
-    Platform.BINARY_SENSOR,
-    Platform.SENSOR,
-    Platform.CALENDAR,
-    Platform.DEVICE_TRACKER,
-]
-UPDATE_INTERVAL = timedelta(minutes=15)
+# Safety refresh only: the coordinator also wakes up at the exact next transition
+# (window boundary, vacation boundary or override expiry) computed by the schedule.
+UPDATE_INTERVAL = timedelta(hours=6)
+# Countdown sensors (days_remaining, days_until_vacation) are recomputed from the clock at this pace
+COUNTDOWN_INTERVAL = timedelta(minutes=15)
+# Calendar sync runs on its own timer (calendar_sync_interval_hours); this margin absorbs its drift
+CALENDAR_SYNC_MARGIN = timedelta(minutes=1)
+# Mois publiés en statistiques long terme (les 24 précédents et le mois en cours)
+STATISTICS_MONTHS = 25
 # API du calendrier scolaire français (data.education.gouv.fr)
 # Format année scolaire: "2024-2025" (septembre à juin)
 # Zones: A, B, C, Corse, Guadeloupe, Martinique, Guyane, La Réunion, Mayotte, etc.
@@ -175,6 +175,8 @@ ATTR_ZONE = "zone"
 ATTR_LOCATION = "location"
 ATTR_NOTES = "notes"
 ATTR_DAYS_REMAINING = "days_remaining"
+ATTR_CUSTODY_TONIGHT = "custody_tonight"
+ATTR_NIGHTS_NEXT_30_DAYS = "nights_next_30_days"
 
 SERVICE_SET_MANUAL_DATES = "set_manual_dates"
 SERVICE_OVERRIDE_PRESENCE = "override_presence"
@@ -183,3 +185,5 @@ SERVICE_TEST_HOLIDAY_API = "test_holiday_api"
 SERVICE_EXPORT_EXCEPTIONS = "export_exceptions"
 SERVICE_IMPORT_EXCEPTIONS = "import_exceptions"
 SERVICE_PURGE_CALENDAR = "purge_calendar_events"
+SERVICE_GET_OWNERSHIP = "get_ownership"
+SERVICE_GET_CUSTODY_SHARE = "get_custody_share"
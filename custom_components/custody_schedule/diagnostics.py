@@ -0,0 +1,23 @@
+"""Diagnostics support for the custody schedule."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_CHILD_NAME, CONF_CHILD_NAME_DISPLAY, CONF_LOCATION, CONF_NOTES, CONF_PHOTO, DOMAIN
+
+TO_REDACT = {CONF_CHILD_NAME, CONF_CHILD_NAME_DISPLAY, CONF_LOCATION, CONF_NOTES, CONF_PHOTO}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the configuration and the state of the holiday client (cache and circuit breakers)."""
+    entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    holidays = entry_data.get("holidays")
+    return {
+        "config": async_redact_data({**entry.data, **(entry.options or {})}, TO_REDACT),
+        "holidays": holidays.diagnostics() if holidays is not None else None,
+    }
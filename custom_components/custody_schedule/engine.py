@@ -0,0 +1,1154 @@
+"""Pure, synchronous schedule engine without Home Assistant imports (testable in isolation).
+
+A ScheduleEngine takes a compiled plan, the time zone and the configured windows; with a
+holiday timeline and "now" it returns the custody windows and the resolved state. It never
+awaits nor touches Home Assistant: the manager (schedule.py) feeds it and may run the heavy
+generations in an executor thread.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+from dataclasses import astuple, dataclass, field
+from datetime import date, datetime, time, timedelta, tzinfo
+from operator import attrgetter
+from typing import TYPE_CHECKING, AbstractSet, Any, Iterable, Iterator, Mapping
+
+from .const import LOGGER
+from .holiday_bridge import (
+    easter_sunday,
+    get_public_holiday_ordinals,
+    public_holiday_bridge_end_day,
+    public_holiday_bridge_start_day,
+)
+from .interval_index import IntervalIndex
+from .local_time import get_local_day_table, weekday_of
+from .ownership_grid import OwnershipGrid
+from .pattern_expand import expand_cycled_pattern
+from .schedule_plan import RecurringException, SchedulePlan
+from .window_columns import WindowColumns
+
+if TYPE_CHECKING:
+    from .school_holidays import SchoolHoliday
+
+
+def get_parent_days(year: int, country: str = "FR") -> dict[str, date]:
+    """Calculate parent holidays (Mother/Father days).
+
+    Currently supports: France (FR).
+    """
+    # Father's day: 3rd Sunday of June
+    first_june = date(year, 6, 1)
+    days_to_first_sunday = (6 - first_june.weekday()) % 7
+    fathers_day = first_june + timedelta(days=days_to_first_sunday + 14)
+
+    # Mother's day: Last Sunday of May.
+    last_may = date(year, 5, 31)
+    days_back_to_sunday = (last_may.weekday() - 6) % 7
+    mothers_day = last_may - timedelta(days=days_back_to_sunday)
+
+    # Check for Pentecost (Easter + 49 days)
+    easter = easter_sunday(year)
+    pentecost_sunday = easter + timedelta(days=49)
+    if mothers_day == pentecost_sunday:
+        mothers_day = mothers_day + timedelta(days=7)
+
+    return {"mother": mothers_day, "father": fathers_day}
+
+
+@dataclass(slots=True)
+class CustodyWindow:
+    """Window representing when the child is present."""
+
+    start: datetime
+    end: datetime
+    label: str
+    source: str = "pattern"
+
+
+def build_window_index(windows: Iterable[CustodyWindow]) -> IntervalIndex[CustodyWindow]:
+    """Index windows by start/end for logarithmic current/next lookups."""
+    return IntervalIndex(windows, attrgetter("start"), attrgetter("end"))
+
+
+# Plages successives essayées par le calcul d'état : quelques semaines suffisent presque toujours
+_STATE_LOOKAHEADS = (timedelta(days=28), timedelta(days=91), timedelta(days=365), timedelta(days=730))
+
+
+def countdown_days(now: datetime, target: datetime | None) -> float | None:
+    """Return the days left until target (two decimals, never negative), None without target."""
+    if target is None:
+        return None
+    return max(0, round((target - now).total_seconds() / 86400, 2))
+
+
+def _is_summer(holiday: SchoolHoliday) -> bool:
+    """Return True for the summer break (French or English name, or starting in July/August)."""
+    name = holiday.name.lower()
+    return "été" in name or "summer" in name or holiday.start.month in (7, 8)
+
+
+def _in_range(window: CustodyWindow, start: datetime, end: datetime) -> bool:
+    """Return True when the window touches [start, end] (bounds inclusive, like IntervalIndex.overlapping)."""
+    return window.end >= start and window.start <= end
+
+
+def _by_start(windows: Iterable[CustodyWindow], start: datetime, end: datetime) -> list[CustodyWindow]:
+    """Keep the windows touching [start, end], stably sorted by start (heap merge input)."""
+    return sorted((window for window in windows if _in_range(window, start, end)), key=attrgetter("start"))
+
+
+def unique_windows(windows: Iterable[CustodyWindow]) -> Iterator[CustodyWindow]:
+    """Drop repeated (start, end, label) windows, keeping the first (highest priority) one."""
+    seen: set[tuple[datetime, datetime, str]] = set()
+    for window in windows:
+        key = (window.start, window.end, window.label)
+        if key not in seen:
+            seen.add(key)
+            yield window
+
+
+@dataclass(slots=True)
+class WindowTile:
+    """Windows touching one calendar year (columnar) and the fingerprint of what produced them."""
+
+    fingerprint: str
+    columns: WindowColumns
+    # Day/night custody of the year, derived from the columns on the first ownership query
+    grid: OwnershipGrid | None = None
+
+
+@dataclass(slots=True)
+class CustodyComputation:
+    """Final state consumed by entities."""
+
+    is_present: bool
+    next_arrival: datetime | None = None
+    next_arrival_label: str | None = None
+    next_departure: datetime | None = None
+    next_departure_label: str | None = None
+    days_remaining: int | None = None
+    current_period: str = "school"
+    vacation_name: str | None = None
+    next_vacation_name: str | None = None
+    next_vacation_start: datetime | None = None
+    next_vacation_end: datetime | None = None
+    days_until_vacation: int | None = None
+    school_holidays_raw: list[dict[str, Any]] = field(default_factory=list)
+    windows: list[CustodyWindow] = field(default_factory=list)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    next_transition: datetime | None = None
+    window_index: IntervalIndex[CustodyWindow] = field(default_factory=lambda: build_window_index([]))
+    # Custody of today and the following days (None when custody management is disabled)
+    ownership: OwnershipGrid | None = None
+
+    def days_remaining_at(self, now: datetime) -> float | None:
+        """Return days_remaining against `now`: days until the next departure (child present) or arrival."""
+        return countdown_days(now, self.next_departure if self.is_present else self.next_arrival)
+
+    def days_until_vacation_at(self, now: datetime) -> float | None:
+        """Return days_until_vacation against `now`: 0 while a vacation is in progress, as computed."""
+        if self.current_period == "vacation":
+            return 0
+        return countdown_days(now, self.next_vacation_start)
+
+
+@dataclass(slots=True, frozen=True)
+class HolidayBounds:
+    """Effective bounds of one school holiday and the custody segments it gives."""
+
+    holiday: SchoolHoliday
+    start: datetime
+    end: datetime
+    midpoint: datetime
+    # One segment, or the two alternated quarters when the summer is split in four
+    segments: tuple[tuple[datetime, datetime], ...]
+    # Split given by the vacation rule (the custody windows) and its label, even when custody is disabled
+    split: tuple[tuple[datetime, datetime], ...]
+    split_label: str
+    # Row of school_holidays_raw, formatted once with the timeline
+    display: dict[str, Any] = field(default_factory=dict, compare=False)
+
+    def segment_at(self, now: datetime) -> tuple[datetime, datetime]:
+        """Return the custody segment relevant at `now` (first one not finished yet)."""
+        return next((segment for segment in self.segments if segment[1] > now), self.segments[-1])
+
+
+class HolidayTimeline:
+    """Holidays with precomputed effective bounds, sorted by effective start.
+
+    Built once per holiday list and time/end-day/split settings; "current vacation"
+    and "next custody segment" are answered with bisect queries.
+    """
+
+    __slots__ = ("entries", "_index")
+
+    def __init__(self, entries: Iterable[HolidayBounds]) -> None:
+        self._index: IntervalIndex[HolidayBounds] = IntervalIndex(entries, attrgetter("start"), attrgetter("end"))
+        self.entries = self._index.items
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def upcoming(self, now: datetime) -> Iterable[HolidayBounds]:
+        """Return the holidays not finished at `now` (effective end >= now)."""
+        return self._index.ending_after(now, inclusive=True)
+
+    def overlapping(self, start: datetime, end: datetime) -> Iterable[HolidayBounds]:
+        """Return the holidays whose effective bounds touch [start, end]."""
+        return self._index.overlapping(start, end)
+
+    def current(self, now: datetime) -> HolidayBounds | None:
+        """Return the holiday whose effective bounds contain `now` (bounds inclusive)."""
+        return next(self._index.overlapping(now, now), None)
+
+    def next_segment(self, now: datetime) -> tuple[HolidayBounds, tuple[datetime, datetime]] | None:
+        """Return the first holiday whose custody segment starts after `now`."""
+        for entry in self._index.ending_after(now):
+            segment = entry.segment_at(now)
+            if segment[0] > now:
+                return entry, segment
+        return None
+
+
+def _first_cycle_boundary(anchor: int, cycle_days: int, target: int) -> int:
+    """Return the first day ordinal anchor + k * cycle_days (k may be negative) falling on or after target."""
+    return anchor - ((anchor - target) // cycle_days) * cycle_days
+
+
+def _iso_mondays_with_parity(first: date, last: date, parity: int) -> Iterator[date]:
+    """Yield the Mondays in [first, last) whose ISO week number has the given parity (0 even / 1 odd).
+
+    Weeks are enumerated per ISO year (52 or 53 weeks): the parity break after a week 53
+    (week 53 then week 1, both odd) needs no stepping nor fix-up.
+    """
+    monday = first + timedelta(days=-first.weekday() % 7)
+    iso_year, week, _ = monday.isocalendar()
+    if week % 2 != parity:
+        week += 1
+    while True:
+        weeks_in_year = date(iso_year, 12, 28).isocalendar().week
+        for number in range(week, weeks_in_year + 1, 2):
+            candidate = date.fromisocalendar(iso_year, number, 1)
+            if candidate >= last:
+                return
+            yield candidate
+        iso_year += 1
+        week = 2 if parity == 0 else 1
+
+
+def _merge_periods(periods: Iterable[tuple[datetime, datetime]]) -> list[tuple[datetime, datetime]]:
+    """Sort periods by start and merge the overlapping or touching ones."""
+    merged: list[tuple[datetime, datetime]] = []
+    for start, end in sorted(periods):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_periods(
+    windows: Iterable[CustodyWindow], periods: list[tuple[datetime, datetime]]
+) -> Iterator[CustodyWindow]:
+    """Yield the parts of `windows` outside the merged, sorted `periods`.
+
+    Single sweep over both streams sorted by start (O(n + m)): periods ending before a
+    window starts can't touch any later window either, so the period cursor only moves
+    forward. Untouched windows are yielded as-is, only real fragments are allocated.
+    """
+    first = 0
+    for window in sorted(windows, key=attrgetter("start")):
+        while first < len(periods) and periods[first][1] <= window.start:
+            first += 1
+
+        cursor = window.start
+        touched = False
+        pos = first
+        while pos < len(periods) and periods[pos][0] < window.end:
+            period_start, period_end = periods[pos]
+            if period_start > cursor:
+                yield CustodyWindow(cursor, period_start, window.label, window.source)
+            cursor = max(cursor, period_end)
+            touched = True
+            pos += 1
+
+        if not touched:
+            yield window
+        elif cursor < window.end:
+            yield CustodyWindow(cursor, window.end, window.label, window.source)
+
+
+WEEKDAY_FR = ("Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche")
+
+
+class ScheduleEngine:
+    """Custody windows and state of one entry, computed synchronously from its plan.
+
+    Immutable once built (the manager builds a new engine when the configuration or the
+    manual windows change), so a generation running in an executor thread never sees a
+    half-updated configuration.
+    """
+
+    def __init__(
+        self,
+        plan: SchedulePlan,
+        tz: tzinfo,
+        custom_windows: Iterable[CustodyWindow] = (),
+        manual_windows: Iterable[CustodyWindow] = (),
+    ) -> None:
+        self._plan = plan
+        self._tz = tz
+        # Le moteur travaille en ordinaux de jour local + minutes ; les datetimes ne sont créés qu'en sortie
+        self._days = get_local_day_table(tz)
+        self._custom_windows = tuple(custom_windows)
+        self._manual_windows = tuple(manual_windows)
+
+    def with_manual_windows(self, windows: Iterable[CustodyWindow]) -> ScheduleEngine:
+        """Return an engine with the same plan and other manual windows."""
+        return ScheduleEngine(self._plan, self._tz, self._custom_windows, windows)
+
+    def _apply_holiday_extension(self, end_day: int, holidays: AbstractSet[int]) -> int:
+        """Extend the end day (date ordinal) while it falls on a holiday."""
+        while end_day in holidays:
+            end_day += 1
+        return end_day
+
+    def calculate_end_date(self, start_date: datetime, holidays: AbstractSet[date]) -> datetime:
+        """Calculate the end date based on start_date, configured end_day and holidays."""
+        start_day = start_date.toordinal()
+        end_day = self._calculate_end_day(start_day, {holiday.toordinal() for holiday in holidays})
+        return start_date + timedelta(days=end_day - start_day)
+
+    def _calculate_end_day(self, start_day: int, holidays: AbstractSet[int]) -> int:
+        """Ordinal form of calculate_end_date (holidays as date ordinals)."""
+        plan = self._plan
+        target_end_weekday = plan.end_weekday  # Default Sunday
+        start_weekday = weekday_of(start_day)
+
+        # Calculate days until the target weekday
+        days_to_end = (target_end_weekday - start_weekday) % 7
+
+        # Special case: if end_day is same as start_day (e.g. Monday to Monday)
+        # we want a full week, not 0 days.
+        if days_to_end == 0 and plan.end_day != "sunday":
+            days_to_end = 7
+        elif days_to_end == 0 and start_weekday == 4:  # Friday to Friday?
+            days_to_end = 7
+
+        return self._apply_holiday_extension(start_day + days_to_end, holidays)
+
+    def compute_state(
+        self, now: datetime, timeline: HolidayTimeline | None, override: Mapping[str, Any] | None = None
+    ) -> CustodyComputation:
+        """Resolve the state at `now` (aware, local) from the windows around it.
+
+        `override` is the active presence override ({"state": "on"|"off", "until": ...}), if any.
+        The attributes and the ownership grid are left to the caller.
+        """
+        override_until: datetime | None = override.get("until") if override else None
+
+        # Les fenêtres qui se terminent dans moins d'1 minute sont considérées comme terminées
+        # (marge pour éviter les problèmes de timing)
+        cutoff = now + timedelta(minutes=1)
+
+        # Seules les fenêtres autour de maintenant sont générées ; la plage n'est élargie
+        # que si la prochaine arrivée (ou celle qui suit le départ en cours) n'y figure pas
+        for lookahead in _STATE_LOOKAHEADS:
+            all_windows, vacation_periods = self.collect_windows(now, now, now + lookahead, timeline)
+            # Index construit une seule fois par calcul
+            index = build_window_index(all_windows)
+            # current_window : fenêtre qui commence avant ou à maintenant et se termine après maintenant + marge
+            current_window = index.containing(now, end_after=cutoff)
+            if self._lookahead_is_enough(index, now, cutoff, current_window, override_until):
+                break
+
+        # next_window doit être une fenêtre qui commence dans le futur ET qui se termine dans le futur
+        next_window = index.first_starting_after(now, end_after=cutoff)
+
+        override_state = None if override is None else override["state"] == "on"
+
+        # Check if custody management is enabled
+        if not self._plan.enabled:
+            # Full Custody Mode (Vacations Only)
+            # Default to Present unless manually overridden to Absent
+            is_present = True
+            if override_state is False:
+                is_present = False
+
+            # No scheduled movements in full custody
+            next_arrival = None
+            next_arrival_label = None
+            next_departure = None
+            next_departure_label = None
+            days_remaining = None
+
+            # Determine current period (still useful)
+            period, vacation_name = self.determine_period(now, timeline)
+        else:
+            # Standard Custody Management
+            is_present = override_state if override_state is not None else current_window is not None
+
+            # Si current_window existe mais se termine très bientôt (déjà exclu par l'index, mais sécurité supplémentaire)
+            # forcer is_present à False pour éviter d'afficher une date de départ dans le passé ou très proche
+            if current_window and current_window.end <= now + timedelta(minutes=1):
+                # La fenêtre se termine dans moins d'1 minute, considérer que l'enfant n'est plus en garde
+                if override_state is None:
+                    is_present = False
+                    current_window = None
+
+            next_arrival = None
+            next_arrival_label = None
+            next_departure = None
+            next_departure_label = None
+            if is_present:
+                # En garde actuellement
+                if current_window:
+                    # On est dans une vraie fenêtre de garde
+                    next_departure = current_window.end
+                    next_departure_label = current_window.label
+                    # S'assurer que next_departure est dans le futur (avec une marge de 1 minute)
+                    if next_departure and next_departure > now + timedelta(minutes=1):
+                        # Chercher la fenêtre qui commence après next_departure
+                        next_arrival_win = index.first_starting_after(next_departure)
+                        if next_arrival_win:
+                            next_arrival = next_arrival_win.start
+                            next_arrival_label = next_arrival_win.label
+                    else:
+                        # Si la fin est dans le passé ou très proche, utiliser la prochaine fenêtre
+                        next_departure = next_window.end if next_window else None
+                        next_departure_label = next_window.label if next_window else None
+                        next_arrival = next_window.start if next_window else None
+                        next_arrival_label = next_window.label if next_window else None
+                        # Si on n'a pas de next_window, chercher la prochaine fenêtre future
+                        if not next_departure:
+                            matching_window = index.first_ending_after(cutoff)
+                            if matching_window:
+                                next_departure = matching_window.end
+                                next_arrival = matching_window.start
+                                next_arrival_label = matching_window.label
+                elif override_state is True and override_until:
+                    # Override avec une date de fin spécifiée
+                    next_departure = override_until
+                    if next_departure > now + timedelta(minutes=1):
+                        # Chercher la fenêtre qui commence après l'override
+                        next_arrival_win = index.first_starting_after(next_departure)
+                        if next_arrival_win:
+                            next_arrival = next_arrival_win.start
+                            next_arrival_label = next_arrival_win.label
+                    else:
+                        # Override dans le passé ou très proche, utiliser la prochaine fenêtre
+                        next_departure = next_window.end if next_window else None
+                        next_departure_label = next_window.label if next_window else None
+                        next_arrival = next_window.start if next_window else None
+                        next_arrival_label = next_window.label if next_window else None
+                        # Si on n'a pas de next_window, chercher la prochaine fenêtre future
+                        if not next_departure:
+                            matching_window = index.first_ending_after(cutoff)
+                            if matching_window:
+                                next_departure = matching_window.end
+                                next_arrival = matching_window.start
+                                next_arrival_label = matching_window.label
+                else:
+                    # Override sans date de fin ou cas spécial, utiliser la prochaine fenêtre
+                    next_departure = next_window.end if next_window else None
+                    next_departure_label = next_window.label if next_window else None
+                    next_arrival = next_window.start if next_window else None
+                    next_arrival_label = next_window.label if next_window else None
+            else:
+                # Quand l'enfant n'est pas présent, next_arrival est toujours la prochaine fenêtre de garde future
+                # et next_departure est la fin de cette même prochaine fenêtre
+                next_arrival = next_window.start if next_window else None
+                next_arrival_label = next_window.label if next_window else None
+                next_departure = next_window.end if next_window else None
+                next_departure_label = next_window.label if next_window else None
+
+                # S'assurer que next_departure est toujours dans le futur (avec marge d'1 minute)
+                # Normalement next_window.end devrait toujours être dans le futur, mais sécurité supplémentaire
+                if next_departure and next_departure <= now + timedelta(minutes=1):
+                    # Si next_departure est dans le passé ou très proche, chercher la prochaine fenêtre après
+                    next_departure_win = index.first_ending_after(cutoff)
+                    if next_departure_win:
+                        next_departure = next_departure_win.end
+                        next_departure_label = next_departure_win.label
+                        next_arrival = next_departure_win.start
+                        next_arrival_label = next_departure_win.label
+                    else:
+                        # Si aucune fenêtre future, next_arrival devrait aussi être None
+                        next_arrival = None
+                        next_arrival_label = None
+
+            days_remaining = countdown_days(now, next_departure if is_present else next_arrival)
+
+            period, vacation_name = self.determine_period(now, timeline)
+
+        # Get next vacation information and raw holidays data
+        (
+            next_vacation_name,
+            next_vacation_start,
+            next_vacation_end,
+            days_until_vacation,
+            school_holidays_raw,
+        ) = self.next_vacation(now, timeline)
+
+        return CustodyComputation(
+            is_present=is_present,
+            next_arrival=next_arrival,
+            next_arrival_label=next_arrival_label,
+            next_departure=next_departure,
+            next_departure_label=next_departure_label,
+            days_remaining=days_remaining,
+            current_period=period,
+            vacation_name=vacation_name,
+            next_vacation_name=next_vacation_name,
+            next_vacation_start=next_vacation_start,
+            next_vacation_end=next_vacation_end,
+            days_until_vacation=days_until_vacation,
+            school_holidays_raw=school_holidays_raw,
+            windows=all_windows,
+            next_transition=self._next_transition(now, all_windows, vacation_periods, override_until),
+            window_index=index,
+        )
+
+    def _next_transition(
+        self,
+        now: datetime,
+        windows: list[CustodyWindow],
+        vacation_periods: list[tuple[datetime, datetime]],
+        override_until: datetime | None,
+    ) -> datetime | None:
+        """Return the next instant at which the computed state is expected to change.
+
+        Presence flips at a window start and one minute before its end (same margin as
+        compute_state), the period flips at the effective vacation bounds and an
+        override stops applying right after its expiry.
+        """
+        margin = timedelta(minutes=1)
+        candidates: list[datetime] = []
+        for window in windows:
+            candidates.append(window.start)
+            candidates.append(window.end - margin)
+        for start, end in vacation_periods:
+            candidates.append(start)
+            candidates.append(end + timedelta(seconds=1))
+        if override_until:
+            candidates.append(override_until.astimezone(self._tz) + timedelta(seconds=1))
+        return min((instant for instant in candidates if instant > now), default=None)
+
+    def _lookahead_is_enough(
+        self,
+        index: IntervalIndex[CustodyWindow],
+        now: datetime,
+        cutoff: datetime,
+        current: CustodyWindow | None,
+        override_until: datetime | None,
+    ) -> bool:
+        """Return True when the generated range already holds every window the state needs."""
+        # The arrival following the current window / override must be in range as well
+        after = now
+        if current is not None:
+            after = max(after, current.end)
+        if override_until:
+            after = max(after, override_until)
+        return index.first_starting_after(after, end_after=cutoff) is not None
+
+    def year_bounds(self, year: int) -> tuple[datetime, datetime]:
+        """Return the local bounds of a tile."""
+        return datetime(year, 1, 1, tzinfo=self._tz), datetime(year + 1, 1, 1, tzinfo=self._tz)
+
+    def build_tile(self, now: datetime, year: int, timeline: HolidayTimeline | None, fingerprint: str) -> WindowTile:
+        """Generate the windows touching one calendar year."""
+        windows, _ = self.collect_windows(now, *self.year_bounds(year), timeline)
+        rows = ((w.start, w.end, w.label, w.source) for w in windows)
+        return WindowTile(fingerprint, WindowColumns.from_rows(rows, self._tz))
+
+    def build_tiles(
+        self, now: datetime, fingerprints: Mapping[int, str], timeline: HolidayTimeline | None
+    ) -> dict[int, WindowTile]:
+        """Generate the tiles of several years at once (one executor job)."""
+        return {year: self.build_tile(now, year, timeline, fingerprint) for year, fingerprint in fingerprints.items()}
+
+    def tile_grid(self, year: int, tile: WindowTile) -> OwnershipGrid:
+        """Derive the day/night custody grid of one year from its tile."""
+        first_day, last_day = date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal()
+        return OwnershipGrid.from_spans(first_day, last_day, tile.columns.spans(), self._days)
+
+    def tile_fingerprint(self, now: datetime, year: int, timeline: HolidayTimeline | None) -> str:
+        """Hash what the windows of one year depend on.
+
+        The plan fingerprint (global settings), plus only the holidays, custom rules, recurring
+        exceptions and manual dates near that year: an exception added in March 2026 leaves 2025
+        and 2027 alone.
+        """
+        first, last = self.year_bounds(year)
+        # Same reach as collect_windows (pattern windows starting before / ending after the year)
+        margin = self._pattern_margin()
+        low, high = first - margin, last + margin
+        low_day, high_day = self._days.day(low), self._days.day(high)
+
+        recurring = [
+            astuple(item)
+            for item in self._plan.recurring
+            if (item.first_day is None or item.first_day <= high_day)
+            and (item.last_day is None or item.last_day >= low_day)
+        ]
+
+        payload = {
+            # The cycle anchor and the public holidays set depend on the current year
+            "anchor": now.year,
+            "tz": str(self._tz),
+            "plan": self._plan.fingerprint,
+            "holidays": [
+                (entry.holiday.name, entry.start, entry.end)
+                for entry in (timeline.overlapping(low, high) if timeline is not None else ())
+            ],
+            "custom": [(w.start, w.end, w.label) for w in self._custom_windows if _in_range(w, low, high)],
+            "recurring": recurring,
+            "manual": [(w.start, w.end, w.label) for w in self._manual_windows if _in_range(w, low, high)],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode(), usedforsecurity=False).hexdigest()
+
+    def collect_windows(
+        self, now: datetime, start: datetime, end: datetime, timeline: HolidayTimeline | None
+    ) -> tuple[list[CustodyWindow], list[tuple[datetime, datetime]]]:
+        """Generate presence windows touching [start, end] from every source.
+
+        Two separate planning systems:
+        1. Weekend/Pattern planning: Based on custody_type (even_weekends, alternate_week, etc.)
+        2. Vacation planning: Based on vacation_rule (first_week_odd_year, first_half, etc.)
+
+        Priority: Vacation rules > Custom rules > Normal pattern rules
+        Vacation periods completely replace normal pattern windows during their entire duration.
+
+        Each source only produces its windows for the range; the sorted streams are
+        combined with a heap merge. Returns the display windows and the effective
+        vacation periods (start, end).
+        """
+        # Pattern windows touching the range may start up to one cycle earlier (and end after the range)
+        margin = self._pattern_margin()
+        pattern_start = start - margin
+
+        # 1. Vacation windows (custody windows during school holidays + filter windows covering
+        # the entire vacation period) and parental day windows, kept together for priority filtering
+        vacation_windows = _by_start(
+            [
+                *self._iter_vacation_windows(timeline, pattern_start, end + margin),
+                *self._iter_parental_day_windows(pattern_start, end + margin),
+            ],
+            pattern_start,
+            end + margin,
+        )
+
+        # 2. Weekend/pattern windows based on custody_type; vacation rules have priority: they
+        # completely replace normal rules during vacations. Only the filter windows are used, so the
+        # result does not depend on which windows happen to fall in the requested range.
+        pattern_windows = list(self._iter_pattern_windows(now, pattern_start, end))
+        filter_windows = [w for w in vacation_windows if w.source == "vacation_filter"]
+        filtered_pattern_windows = _by_start(
+            self.filter_windows_by_vacations(pattern_windows, filter_windows), start, end
+        )
+
+        # 3. Filter windows are only used for filtering, not displayed in the final schedule
+        in_range = [w for w in vacation_windows if _in_range(w, start, end)]
+        vacation_display_windows = [w for w in in_range if w.source != "vacation_filter"]
+        vacation_periods = [(w.start, w.end) for w in in_range if w.source == "vacation_filter"]
+
+        # 4. Merge in priority order: vacation windows (highest), custom rules, filtered pattern,
+        # manual dates then recurring exceptions; heapq.merge keeps that order between equal starts
+        merged = heapq.merge(
+            vacation_display_windows,
+            _by_start(self._custom_windows, start, end),
+            filtered_pattern_windows,
+            _by_start(self._manual_windows, start, end),
+            self._iter_recurring_windows(start, end),
+            key=attrgetter("start"),
+        )
+        return list(unique_windows(merged)), vacation_periods
+
+    def _pattern_margin(self) -> timedelta:
+        """Return how long before a range a pattern window touching it may start (one cycle + extensions)."""
+        return timedelta(days=self._plan.cycle_days + 7)
+
+    def _iter_parental_day_windows(self, start: datetime, end: datetime) -> Iterator[CustodyWindow]:
+        """Automatically create windows for Mother's day and Father's day in the years of [start, end]."""
+        role = self._plan.parental_role
+        if role is None:
+            return
+
+        country = self._plan.country
+        days = self._days
+        for year in range(start.year, end.year + 1):
+            dates = get_parent_days(year, country)
+
+            # Mother's Day
+            m_day = dates.get("mother")
+            if m_day:
+                m_start = days.datetime(m_day.toordinal())
+                m_end = days.datetime(m_day.toordinal(), 23 * 60 + 59, 59)
+
+                if role == "mother":
+                    yield CustodyWindow(m_start, m_end, "Mother's Day", "special")
+                elif role == "father":
+                    yield CustodyWindow(m_start, m_end, "Mother's Day (Secondary parent)", "vacation_filter")
+
+            # Father's Day
+            f_day = dates.get("father")
+            if f_day:
+                f_start = days.datetime(f_day.toordinal())
+                f_end = days.datetime(f_day.toordinal(), 23 * 60 + 59, 59)
+
+                if role == "father":
+                    yield CustodyWindow(f_start, f_end, "Father's Day", "special")
+                elif role == "mother":
+                    yield CustodyWindow(f_start, f_end, "Father's Day (Secondary parent)", "vacation_filter")
+
+    def _iter_recurring_windows(self, start: datetime, end: datetime) -> Iterator[CustodyWindow]:
+        """Yield the recurring exception windows touching [start, end], ordered by start."""
+        if not self._plan.recurring:
+            return
+
+        # One weekly stream per exception, merged lazily (configuration order between equal starts)
+        streams = [self._iter_recurring_occurrences(item, start, end) for item in self._plan.recurring]
+        yield from heapq.merge(*streams, key=attrgetter("start"))
+
+    def _iter_recurring_occurrences(
+        self, item: RecurringException, start: datetime, end: datetime
+    ) -> Iterator[CustodyWindow]:
+        """Yield the weekly occurrences of one recurring exception touching [start, end]."""
+        days = self._days
+        range_start = days.day(start)
+        horizon_end = days.day(end)
+        current = max(range_start, item.first_day) if item.first_day is not None else range_start
+        range_end = min(horizon_end, item.last_day) if item.last_day is not None else horizon_end
+        if current > range_end:
+            return
+
+        occ_day = current + (item.weekday - weekday_of(current)) % 7
+        start_minute, end_minute, label = item.start_minute, item.end_minute, item.label
+        start_ts = start.timestamp()
+        end_ts = end.timestamp()
+
+        while occ_day <= range_end:
+            occ_start = days.epoch(occ_day, start_minute)
+            occ_end = days.epoch(occ_day, end_minute)
+            if occ_end > occ_start and occ_end >= start_ts and occ_start <= end_ts:
+                yield CustodyWindow(
+                    start=days.from_epoch(occ_start),
+                    end=days.from_epoch(occ_end),
+                    label=label,
+                    source="exception_recurring",
+                )
+            occ_day += 7
+
+    def filter_windows_by_vacations(
+        self, pattern_windows: list[CustodyWindow], vacation_windows: list[CustodyWindow]
+    ) -> list[CustodyWindow]:
+        """Remove or truncate pattern windows that overlap with vacation periods."""
+        if not vacation_windows:
+            return pattern_windows
+
+        # Build a list of priority periods (start, end) for quick overlap checking.
+        vacation_periods = [(vw.start, vw.end) for vw in vacation_windows if vw.source == "vacation_filter"]
+        if not vacation_periods:
+            vacation_periods = [(vw.start, vw.end) for vw in vacation_windows]
+
+        return list(_subtract_periods(pattern_windows, _merge_periods(vacation_periods)))
+
+    def generate_pattern_windows(
+        self,
+        now: datetime,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[CustodyWindow]:
+        """Create repeating windows from the selected custody type (see _iter_pattern_windows)."""
+        return list(self._iter_pattern_windows(now, start, end))
+
+    def _iter_pattern_windows(
+        self, now: datetime, start: datetime | None = None, end: datetime | None = None
+    ) -> Iterator[CustodyWindow]:
+        """Yield the repeating windows of the selected custody type, ordered by start.
+
+        Args:
+            now: Current datetime
+            start: Beginning of the generated range (default: cycle reference, at most 730 days back)
+            end: End of the generated range (default: now + 365 days)
+
+        Only cycles beginning in [start, end) are produced. The cycle is aligned
+        arithmetically on `start`, so the cost only depends on the number of windows in the range.
+        Days are handled as date ordinals; datetimes are only built for the yielded windows.
+        """
+        plan = self._plan
+        if not plan.enabled:
+            return
+
+        custody_type = plan.custody_type
+        days = self._days
+        arrival, departure = plan.arrival_minute, plan.departure_minute
+        # Use a longer horizon based on calendar sync settings
+        # Calcul par défaut fixé à 12 mois (365 jours)
+        horizon = now + timedelta(days=365) if end is None else end
+        # Dernier jour dont le début (minuit local) précède l'horizon
+        horizon_day = days.day(horizon)
+        last_day = horizon_day if days.epoch(horizon_day) < horizon.timestamp() else horizon_day - 1
+        # Jours fériés de l'année courante (ou du début de plage demandé) jusqu'à l'horizon, au moins deux ans
+        first_year = now.year if start is None else min(now.year, start.year)
+        reference_day = self._reference_day(now, custody_type)
+        if start is None:
+            start_day = max(reference_day, days.day(now - timedelta(days=730)))
+        else:
+            start_day = days.day(start)
+
+        # Ordinaux mémoïsés, partagés entre entrées
+        holidays = frozenset(
+            get_public_holiday_ordinals(
+                first_year,
+                max(now.year + 2, horizon.year + 1),
+                plan.country,
+                plan.alsace_moselle,
+            )
+        )
+        target_end_weekday = plan.end_weekday
+
+        # Cas particulier : week-ends basés sur la parité ISO des semaines
+        if custody_type == "alternate_weekend":
+            # Parity from reference_year (even = even weeks, odd = odd weeks)
+            target_parity = plan.week_parity
+            # Weekend start day from config (Friday or Saturday)
+            # Monday of the week: +4=Fri, +5=Sat, +6=Sun, +7=Mon
+            weekend_offset = plan.weekend_offset
+
+            # Lundis des semaines ISO de la bonne parité, calculés directement (pas de parcours semaine par semaine)
+            last = date.fromordinal(horizon_day + 1)
+            for monday_date in _iso_mondays_with_parity(date.fromordinal(start_day), last, target_parity):
+                monday = monday_date.toordinal()
+                if monday > last_day:
+                    break
+                nominal_weekend_start = monday + weekend_offset
+                weekend_start = public_holiday_bridge_start_day(nominal_weekend_start, holidays)
+
+                # Resolve base end day (anchor on ISO week Monday)
+                base_end_day = monday + target_end_weekday
+                # Check if end falls before nominal weekend start (weekend spanning)
+                if base_end_day < nominal_weekend_start:
+                    base_end_day += 7
+
+                end_after_calculate = self._calculate_end_day(weekend_start, holidays)
+                window_end = public_holiday_bridge_end_day(end_after_calculate, holidays)
+
+                bridged = (
+                    weekend_start != nominal_weekend_start
+                    or window_end != end_after_calculate
+                    or end_after_calculate != base_end_day
+                )
+
+                yield CustodyWindow(
+                    start=days.datetime(weekend_start, arrival),
+                    end=days.datetime(window_end, departure),
+                    label=plan.holiday_label if bridged else plan.label,
+                    source="pattern",
+                )
+            return
+
+        # Cas particulier : semaines alternées basées sur la parité ISO des semaines
+        if custody_type == "alternate_week_parity":
+            last = date.fromordinal(horizon_day + 1)
+            for monday_date in _iso_mondays_with_parity(date.fromordinal(start_day), last, plan.week_parity):
+                # Week starts Monday
+                monday = monday_date.toordinal()
+                if monday > last_day:
+                    break
+
+                # Resolve end date using helper
+                base_end_day = monday + (target_end_weekday or 7)
+                end_after_calculate = self._calculate_end_day(monday, holidays)
+                window_end = public_holiday_bridge_end_day(end_after_calculate, holidays)
+
+                yield CustodyWindow(
+                    start=days.datetime(monday, arrival),
+                    end=days.datetime(window_end, departure),
+                    label=plan.holiday_label if window_end > base_end_day else plan.label,
+                    source="pattern",
+                )
+            return
+
+        cycle_days = plan.cycle_days
+        # Premier début de cycle à partir de `start`, obtenu par calcul (sans parcourir l'historique)
+        pointer = _first_cycle_boundary(reference_day, cycle_days, start_day)
+
+        if custody_type != "alternate_week":
+            # Cycled patterns: fixed durations + holiday extension, the next segments keep their place
+            # (the whole range is expanded at once, vectorized when NumPy is available)
+            for segment_start, segment_end in expand_cycled_pattern(
+                plan.segments, cycle_days, pointer, last_day, holidays
+            ):
+                yield CustodyWindow(
+                    start=days.datetime(segment_start, arrival),
+                    end=days.datetime(segment_end, departure),
+                    label=plan.label,
+                    source="pattern",
+                )
+            return
+
+        while pointer <= last_day:
+            offset = 0
+            for segment_days, custody_on in plan.segments:
+                segment_start = pointer + offset
+                # The end_day logic decides where the week ends;
+                # the next segment starts exactly when this one ends
+                segment_end = self._calculate_end_day(segment_start, holidays)
+                if custody_on:
+                    yield CustodyWindow(
+                        start=days.datetime(segment_start, arrival),
+                        end=days.datetime(segment_end, departure),
+                        label=plan.label,
+                        source="pattern",
+                    )
+                offset += segment_end - segment_start
+            pointer += cycle_days
+
+    def build_timeline(self, holidays: Iterable[SchoolHoliday]) -> HolidayTimeline:
+        """Compute effective bounds and custody segments once for every holiday."""
+        enable_custody = self._plan.enabled
+        split_mode = self._plan.vacation_split_mode
+        summer_mode = self._plan.summer_split_mode
+
+        entries: list[HolidayBounds] = []
+        for holiday in holidays:
+            eff_start, eff_end, mid = self.effective_holiday_bounds(holiday)
+
+            # Automatic vacation rule based on year parity + split mode
+            is_even_year = eff_start.year % 2 == 0
+            if split_mode == "odd_second":
+                rule_for_year = "second_half" if not is_even_year else "first_half"
+            else:
+                rule_for_year = "first_half" if not is_even_year else "second_half"
+
+            if _is_summer(holiday) and summer_mode == "quarter":
+                seg_duration = (eff_end - eff_start) / 4
+                parts = [
+                    (eff_start, eff_start + seg_duration),
+                    (eff_start + seg_duration, eff_start + 2 * seg_duration),
+                    (eff_start + 2 * seg_duration, eff_start + 3 * seg_duration),
+                    (eff_start + 3 * seg_duration, eff_end),
+                ]
+                # "first_half" gets parts 1 and 3, "second_half" parts 2 and 4
+                split = (parts[0], parts[2]) if rule_for_year == "first_half" else (parts[1], parts[3])
+                split_label = "Quinzaine"
+            elif rule_for_year == "second_half":
+                split, split_label = ((mid, eff_end),), "2ème moitié"
+            else:
+                split, split_label = ((eff_start, mid),), "1ère moitié"
+            # Custody management disabled (Vacations Only): the full vacation period
+            segments = split if enable_custody else ((eff_start, eff_end),)
+
+            entries.append(
+                HolidayBounds(
+                    holiday,
+                    eff_start,
+                    eff_end,
+                    mid,
+                    segments,
+                    split,
+                    split_label,
+                    self._holiday_display(holiday, eff_start, eff_end),
+                )
+            )
+        return HolidayTimeline(entries)
+
+    def _holiday_display(self, holiday: SchoolHoliday, eff_start: datetime, eff_end: datetime) -> dict[str, Any]:
+        """Format the raw holiday row shown in the attributes (official and effective bounds)."""
+        official_start = holiday.start.astimezone(self._tz)
+        official_end = holiday.end.astimezone(self._tz)
+        return {
+            "name": holiday.name,
+            "official_start": official_start.strftime("%d %B %Y"),
+            "official_end": official_end.strftime("%d %B %Y"),
+            "official_start_weekday": WEEKDAY_FR[official_start.weekday()],
+            "official_end_weekday": WEEKDAY_FR[official_end.weekday()],
+            "effective_start": eff_start.strftime("%d %B %Y %H:%M"),
+            "effective_end": eff_end.strftime("%d %B %Y %H:%M"),
+        }
+
+    def _iter_vacation_windows(
+        self, timeline: HolidayTimeline | None, start: datetime, end: datetime
+    ) -> Iterator[CustodyWindow]:
+        """Optional windows driven by vacation rules, for the holidays touching [start, end].
+
+        The split (halves by year parity, quarters for the summer) comes from the timeline,
+        so the windows always agree with next_vacation and the ownership grid.
+        """
+        if timeline is None:
+            return
+        for bounds in timeline.overlapping(start, end):
+            holiday = bounds.holiday
+            # Always add a filter window covering the full effective vacation period.
+            # This enforces: vacances scolaires > garde normale (no weekend/week pattern windows inside holidays).
+            yield CustodyWindow(
+                start=bounds.start,
+                end=bounds.end,
+                label=f"{holiday.name} - Full period (Filter)",
+                source="vacation_filter",
+            )
+            for window_start, window_end in bounds.split:
+                if window_end > window_start:
+                    yield CustodyWindow(
+                        start=window_start,
+                        end=window_end,
+                        label=f"Vacances scolaires - {holiday.name} ({bounds.split_label})",
+                        source="vacation",
+                    )
+
+    def _reference_day(self, now: datetime, custody_type: str) -> int:
+        """Return the day ordinal used as anchor for the cycle."""
+        reference_year = now.year
+        desired = self._plan.reference_parity
+        if desired == "even" and reference_year % 2 != 0:
+            reference_year -= 1
+        elif desired == "odd" and reference_year % 2 == 0:
+            reference_year -= 1
+
+        if custody_type in ("alternate_weekend", "alternate_week_parity"):
+            # Use reference_year to determine parity (even = even weeks, odd = odd weeks)
+            # For week-parity modes, always anchor on Monday; ignore start_day.
+            return self._first_monday_with_week_parity(reference_year, self._plan.week_parity)
+
+        base = date(reference_year, 1, 1).toordinal()
+        return base + (self._plan.start_weekday - weekday_of(base)) % 7
+
+    def _first_monday_with_week_parity(self, year: int, parity: int) -> int:
+        """Return the first Monday (day ordinal) of the ISO week with the requested parity (0 even / 1 odd)."""
+        return next(_iso_mondays_with_parity(date(year, 1, 1), date(year + 1, 1, 1), parity)).toordinal()
+
+    def _apply_time(self, dt_value: datetime, target: time) -> datetime:
+        """Attach the configured time to a datetime."""
+        return dt_value.replace(hour=target.hour, minute=target.minute, second=0, microsecond=0)
+
+    def effective_holiday_bounds(self, holiday: SchoolHoliday) -> tuple[datetime, datetime, datetime]:
+        """Return (effective_start, effective_end, midpoint) for a holiday.
+
+        Custom vacation custody rules:
+        - Effective start: previous Friday at arrival_time (e.g., school pickup Friday 16:15),
+          even if the API indicates a Saturday start.
+        - Effective end: previous Sunday at departure_time (e.g., Sunday 19:00),
+          even if the API indicates a Monday reprise at 00:00.
+        - Midpoint: exact half between effective start and effective end (midpoint time overrides standard times).
+        """
+        days = self._days
+        start_day = days.day(holiday.start)
+        end_day, end_second = days.split(holiday.end)
+        # If the API returns an end at 00:00, it's typically the "reprise" day (exclusive end)
+        reprise = end_second < 60
+        last_day = end_day - 1 if end_second == 0 else end_day
+
+        # Effective start is the previous Friday (school pickup)
+        effective_start_day = start_day - (weekday_of(start_day) - 4) % 7
+
+        # Effective end matches the configured end_day (usually Sunday or Monday)
+        # We look for the next occurrence of end_day after the vacation end_date
+        plan = self._plan
+        target_end_weekday = plan.end_weekday
+        effective_end_day = last_day
+
+        # If the holiday already ends on or after the target weekday,
+        # we might need to go to the NEXT one to cover the weekend.
+        # But if it ends on Monday 00:00 (FR), we want the previous Sunday.
+
+        if not reprise:
+            # Case BE/CH/LU: Ends Friday or Saturday -> Effective end is the following Sunday/Monday
+            # (Any holiday ending at 00:00, like in the French API, is a school reprise day: the child
+            # is back for school morning, so the end is not shifted.)
+            effective_end_day += (target_end_weekday - weekday_of(effective_end_day)) % 7
+
+        # Safety fallback: avoid inverted windows on unexpected API shapes
+        if (effective_end_day, plan.departure_minute) <= (effective_start_day, plan.arrival_minute):
+            effective_start_day, effective_end_day = start_day, end_day
+        start_ts = days.epoch(effective_start_day, plan.arrival_minute)
+        end_ts = days.epoch(effective_end_day, plan.departure_minute)
+
+        # Calculate exact mathematical midpoint (half of the wall-clock span, like datetime arithmetic)
+        span = (effective_end_day - effective_start_day) * 86400 + (plan.departure_minute - plan.arrival_minute) * 60
+        mid_day, mid_second = divmod(plan.arrival_minute * 60 + span // 2, 86400)
+        exact_midpoint = days.epoch(effective_start_day + mid_day, 0, mid_second)
+
+        # Round midpoint to the nearest 30 minutes for a "clean" but accurate transition
+        # This resolves the 01:31 or 13:31 issues while keeping the duration fair
+        rounded_seconds = round(exact_midpoint / 1800) * 1800
+
+        return days.from_epoch(start_ts), days.from_epoch(end_ts), days.from_epoch(rounded_seconds)
+
+    def determine_period(self, now: datetime, timeline: HolidayTimeline | None) -> tuple[str, str | None]:
+        """Return ('school'|'vacation', holiday_name)."""
+        current = timeline.current(now) if timeline else None
+        if current:
+            return "vacation", current.holiday.name
+
+        return "school", None
+
+    def next_vacation(
+        self, now: datetime, timeline: HolidayTimeline | None
+    ) -> tuple[str | None, datetime | None, datetime | None, int | None, list[dict[str, Any]]]:
+        """Return information about the next upcoming vacation (custody-focused).
+
+        Uses the *effective* vacation bounds (custom rules):
+        - Start: previous Friday at arrival_time (pickup at school)
+        - End: previous Sunday at departure_time (return Sunday evening)
+        - Midpoint: exact half (time is preserved and overrides standard times)
+
+        Returned start/end correspond to the next *custody segment* during that vacation
+        (e.g., if rule is "second_half", start is the midpoint, not the vacation start).
+        """
+        zone = self._plan.zone
+        if not zone:
+            LOGGER.warning("No zone configured, cannot fetch school holidays")
+            return None, None, None, None, []
+
+        LOGGER.debug("Using school holidays for country=%s, zone=%s", self._plan.country, zone)
+        if timeline is None:
+            return None, None, None, None, []
+        LOGGER.debug("Retrieved %d holidays from API", len(timeline))
+
+        if not timeline:
+            LOGGER.warning("No holidays found for zone %s, year %s", zone, now.year)
+
+        # Build raw holidays list for debugging/display
+        # Filter to only show holidays from current calendar year onwards
+        # This includes holidays from current school year and previous school year if they're in current year
+        # Only show upcoming/current holidays (based on effective end), sorted by effective start
+        # (rows formatted once when the timeline is built)
+        school_holidays_raw = [bounds.display for bounds in timeline.upcoming(now)]
+
+        # First, check if we're currently in a vacation (effective bounds)
+        current = timeline.current(now)
+        if current:
+            seg_start, seg_end = current.segment_at(now)
+            return (
+                current.holiday.name,
+                seg_start,
+                seg_end,
+                0,
+                school_holidays_raw,
+            )
+
+        # Not in vacation, find the next custody segment start
+        found = timeline.next_segment(now)
+        if not found:
+            LOGGER.warning("No next vacation found after %s. Total holidays: %d", now, len(timeline))
+            if timeline:
+                last = timeline.entries[-1].holiday
+                LOGGER.debug("Last holiday: %s (ends %s)", last.name, last.end)
+            return None, None, None, None, school_holidays_raw
+
+        next_vacation, (next_seg_start, next_seg_end) = found
+        LOGGER.debug("Found next vacation custody segment: %s, start=%s", next_vacation.holiday.name, next_seg_start)
+
+        return (
+            next_vacation.holiday.name,
+            next_seg_start,
+            next_seg_end,
+            countdown_days(now, next_seg_start),
+            school_holidays_raw,
+        )
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import AbstractSet
 
 
+@lru_cache(maxsize=None)
 def easter_sunday(year: int) -> date:
-    """Calculate Easter Sunday date using the Anonymous Gregorian algorithm."""
+    """Calculate Easter Sunday date using the Anonymous Gregorian algorithm (memoized)."""
     a = year % 19
     b = year // 100
     c = year % 100
@@ -24,9 +27,12 @@ def easter_sunday(year: int) -> date:
     return date(year, month, day)
 
 
-def get_public_holidays(year: int, country: str = "FR", include_alsace_moselle: bool = False) -> set[date]:
-    """Return set of public holidays for a given year and country.
+@lru_cache(maxsize=None)
+def get_public_holidays(year: int, country: str = "FR", include_alsace_moselle: bool = False) -> frozenset[date]:
+    """Return the public holidays for a given year and country.
 
+    Memoized per (year, country, alsace_moselle) for the whole process: the returned
+    frozenset is shared by every entry and every refresh, never mutate it.
     Currently supports: France (FR).
     """
     holidays: set[date] = set()
@@ -52,10 +58,30 @@ def get_public_holidays(year: int, country: str = "FR", include_alsace_moselle:
         if include_alsace_moselle:
             holidays.add(easter - timedelta(days=2))
 
+    return frozenset(holidays)
+
+
+@lru_cache(maxsize=256)
+def get_public_holidays_range(
+    first_year: int, last_year: int, country: str = "FR", include_alsace_moselle: bool = False
+) -> frozenset[date]:
+    """Return the (memoized) union of public holidays from first_year to last_year inclusive."""
+    holidays: frozenset[date] = frozenset()
+    for year in range(first_year, last_year + 1):
+        holidays |= get_public_holidays(year, country, include_alsace_moselle)
     return holidays
 
 
-def apply_public_holiday_bridge_after_last_day(end_date: datetime, holidays: set[date]) -> datetime:
+@lru_cache(maxsize=256)
+def get_public_holiday_ordinals(
+    first_year: int, last_year: int, country: str = "FR", include_alsace_moselle: bool = False
+) -> tuple[int, ...]:
+    """Return the same holidays as sorted date ordinals (for bisect or array based lookups)."""
+    holidays = get_public_holidays_range(first_year, last_year, country, include_alsace_moselle)
+    return tuple(sorted(day.toordinal() for day in holidays))
+
+
+def apply_public_holiday_bridge_after_last_day(end_date: datetime, holidays: AbstractSet[date]) -> datetime:
     """Extend custody through consecutive public holidays immediately after the last custody day.
 
     If custody nominally ends Sunday but Monday is a public holiday (e.g. Easter Monday in FR),
@@ -67,9 +93,23 @@ def apply_public_holiday_bridge_after_last_day(end_date: datetime, holidays: set
     return current
 
 
-def apply_public_holiday_bridge_before_weekend_start(weekend_start: datetime, holidays: set[date]) -> datetime:
+def apply_public_holiday_bridge_before_weekend_start(weekend_start: datetime, holidays: AbstractSet[date]) -> datetime:
     """Move weekend start earlier while the start day is a public holiday (e.g. Friday off -> Thursday)."""
     current = weekend_start
     while current.date() in holidays:
         current = current - timedelta(days=1)
     return current
+
+
+def public_holiday_bridge_end_day(day: int, holidays: AbstractSet[int]) -> int:
+    """Ordinal form of apply_public_holiday_bridge_after_last_day (holidays as date ordinals)."""
+    while day + 1 in holidays:
+        day += 1
+    return day
+
+
+def public_holiday_bridge_start_day(day: int, holidays: AbstractSet[int]) -> int:
+    """Ordinal form of apply_public_holiday_bridge_before_weekend_start (holidays as date ordinals)."""
+    while day in holidays:
+        day -= 1
+    return day
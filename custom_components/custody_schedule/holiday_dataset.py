@@ -0,0 +1,145 @@
+"""Bundled offline school holiday dataset without Home Assistant imports (testable in isolation).
+
+The file is generated by scripts/build_holiday_dataset.py from local copies of the
+provider exports and read through mmap: an index of fixed-size records sorted by
+(country, zone, school year) is bisected in place, and only the rows of the
+requested school year are unpacked.
+"""
+
+from __future__ import annotations
+
+import mmap
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from struct import Struct
+from typing import Iterable
+
+DATASET_PATH = Path(__file__).parent / "data" / "school_holidays.bin"
+
+MAGIC = b"CSHD"
+FORMAT_VERSION = 1
+
+# magic, format version, revision (date ordinal of the last holiday end), strings, index records, rows
+_HEADER = Struct("<4sHIIII")
+# Offsets of the strings in the UTF-8 blob (one more than strings, the last one is the blob size)
+_OFFSET = Struct("<I")
+# country, zone (string ids), school year (calendar year of its September), first row, row count
+_INDEX = Struct("<HHHII")
+# name (string id), start, end (epoch seconds)
+_ROW = Struct("<Hqq")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# (country, zone, school year, name, start, end), start and end aware datetimes
+DatasetRecord = tuple[str, str, int, str, datetime, datetime]
+
+
+def school_year_of(day: datetime) -> int:
+    """Return the school year of a date, as the calendar year of its September."""
+    return day.year if day.month >= 9 else day.year - 1
+
+
+def build_dataset(records: Iterable[DatasetRecord], revision: int) -> bytes:
+    """Encode records into the dataset format (rows of a school year ordered by start)."""
+    strings: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        return strings.setdefault(value, len(strings))
+
+    groups: dict[tuple[int, int, int], set[tuple[int, int, int]]] = {}
+    for country, zone, school_year, name, start, end in records:
+        key = (intern(country), intern(zone), school_year)
+        groups.setdefault(key, set()).add(
+            (int((start - _EPOCH).total_seconds()), int((end - _EPOCH).total_seconds()), intern(name))
+        )
+
+    index = bytearray()
+    rows = bytearray()
+    row_count = 0
+    for country_id, zone_id, school_year in sorted(groups):
+        group = sorted(groups[(country_id, zone_id, school_year)])
+        index += _INDEX.pack(country_id, zone_id, school_year, row_count, len(group))
+        for start, end, name_id in group:
+            rows += _ROW.pack(name_id, start, end)
+        row_count += len(group)
+
+    blob = bytearray()
+    offsets = bytearray()
+    for value in strings:
+        offsets += _OFFSET.pack(len(blob))
+        blob += value.encode()
+    offsets += _OFFSET.pack(len(blob))
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, revision, len(strings), len(groups), row_count)
+    return bytes(header + offsets + blob + index + rows)
+
+
+class HolidayDataset:
+    """Read-only view of a dataset buffer (usually a memory map of the bundled file)."""
+
+    __slots__ = ("revision", "_data", "_strings", "_string_ids", "_index_offset", "_index_count", "_rows_offset")
+
+    def __init__(self, data: bytes | mmap.mmap) -> None:
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated holiday dataset")
+        magic, version, revision, string_count, index_count, row_count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Unknown holiday dataset format")
+        offsets = [_OFFSET.unpack_from(data, _HEADER.size + i * _OFFSET.size)[0] for i in range(string_count + 1)]
+        blob_offset = _HEADER.size + len(offsets) * _OFFSET.size
+        self._index_offset = blob_offset + offsets[-1]
+        self._rows_offset = self._index_offset + index_count * _INDEX.size
+        if len(data) != self._rows_offset + row_count * _ROW.size:
+            raise ValueError("Truncated holiday dataset")
+        # Quelques dizaines de chaînes (pays, zones, noms) : décodées à l'ouverture
+        self._strings = tuple(
+            bytes(data[blob_offset + offsets[i] : blob_offset + offsets[i + 1]]).decode() for i in range(string_count)
+        )
+        self._string_ids = {value: string_id for string_id, value in enumerate(self._strings)}
+        self._data = data
+        self._index_count = index_count
+        self.revision = revision
+
+    @classmethod
+    def open(cls, path: Path = DATASET_PATH) -> HolidayDataset | None:
+        """Map the dataset file, None when it is missing or not a dataset (blocking: run in the executor)."""
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls(data)
+        except ValueError:
+            data.close()
+            return None
+
+    def __len__(self) -> int:
+        return self._index_count
+
+    def holidays(self, country: str, zone: str, school_year: int) -> list[tuple[str, datetime, datetime]]:
+        """Return the (name, start, end) holidays of a school year, in UTC and ordered by start."""
+        country_id = self._string_ids.get(country)
+        zone_id = self._string_ids.get(zone)
+        if country_id is None or zone_id is None:
+            return []
+        target = (country_id, zone_id, school_year)
+        low, high = 0, self._index_count
+        while low < high:
+            middle = (low + high) // 2
+            if _INDEX.unpack_from(self._data, self._index_offset + middle * _INDEX.size)[:3] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._index_count:
+            return []
+        *key, first_row, row_count = _INDEX.unpack_from(self._data, self._index_offset + low * _INDEX.size)
+        if tuple(key) != target:
+            return []
+        holidays = []
+        for row in range(first_row, first_row + row_count):
+            name_id, start, end = _ROW.unpack_from(self._data, self._rows_offset + row * _ROW.size)
+            holidays.append(
+                (self._strings[name_id], _EPOCH + timedelta(seconds=start), _EPOCH + timedelta(seconds=end))
+            )
+        return holidays
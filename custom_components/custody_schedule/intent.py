@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import intent
+from homeassistant.util import dt as dt_util
 
 from .const import CONF_CHILD_NAME, CONF_CHILD_NAME_DISPLAY, DOMAIN, LOGGER
 
 INTENT_WHO_HAS_CHILD = "CustodyWhoHasChild"
+INTENT_NIGHTS_WITH_CHILD = "CustodyNightsWithChild"
 
 
 async def async_setup_intents(hass: HomeAssistant) -> None:
@@ -20,11 +24,42 @@ async def async_setup_intents(hass: HomeAssistant) -> None:
 
     try:
         intent.async_register(hass, CustodyWhoHasChildHandler())
+        intent.async_register(hass, CustodyNightsWithChildHandler())
         hass.data.setdefault(DOMAIN, {})["intents_registered"] = True
     except Exception as err:
         LOGGER.error("Error registering intents: %s", err)
 
 
+def _find_child(hass: HomeAssistant, child_name_query: str) -> tuple[Any, str | None]:
+    """Return the coordinator and display name of the entry matching the spoken child name."""
+    # Iterate over all registered entries for our domain
+    for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+        if not isinstance(entry_data, dict) or "coordinator" not in entry_data:
+            continue
+
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if not entry:
+            continue
+
+        display_name = (entry.data.get(CONF_CHILD_NAME_DISPLAY) or "").lower()
+        slug_name = (entry.data.get(CONF_CHILD_NAME) or "").lower()
+
+        if child_name_query in display_name or child_name_query in slug_name or display_name in child_name_query:
+            return entry_data["coordinator"], entry.data.get(CONF_CHILD_NAME_DISPLAY, entry.data.get(CONF_CHILD_NAME))
+    return None, None
+
+
+def _no_data_speech(language: str, child_name_query: str, match_display_name: str | None, found: bool) -> str:
+    """Return the answer when the child is unknown or not computed yet."""
+    if not found:
+        if language == "fr":
+            return f"Désolé, je ne trouve pas d'enfant nommé {child_name_query} dans votre configuration Custody."
+        return f"Sorry, I cannot find a child named {child_name_query} in your Custody configuration."
+    if language == "fr":
+        return f"Je n'ai pas encore pu calculer la position de {match_display_name}."
+    return f"I haven't been able to calculate {match_display_name}'s position yet."
+
+
 class CustodyWhoHasChildHandler(intent.IntentHandler):
     """Handler for CustodyWhoHasChild intent."""
 
@@ -37,43 +72,12 @@ class CustodyWhoHasChildHandler(intent.IntentHandler):
         child_name_query = slots["child_name"]["value"].lower().strip()
         language = intent_obj.language
 
-        hass = intent_obj.hass
-        best_match_coordinator = None
-        match_display_name = None
-
-        # Iterate over all registered entries for our domain
-        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
-            if not isinstance(entry_data, dict) or "coordinator" not in entry_data:
-                continue
-
-            entry = hass.config_entries.async_get_entry(entry_id)
-            if not entry:
-                continue
-
-            display_name = (entry.data.get(CONF_CHILD_NAME_DISPLAY) or "").lower()
-            slug_name = (entry.data.get(CONF_CHILD_NAME) or "").lower()
-
-            if child_name_query in display_name or child_name_query in slug_name or display_name in child_name_query:
-                best_match_coordinator = entry_data["coordinator"]
-                match_display_name = entry.data.get(CONF_CHILD_NAME_DISPLAY, entry.data.get(CONF_CHILD_NAME))
-                break
-
+        best_match_coordinator, match_display_name = _find_child(intent_obj.hass, child_name_query)
         response = intent_obj.create_response()
 
-        if not best_match_coordinator:
-            if language == "fr":
-                speech = f"Désolé, je ne trouve pas d'enfant nommé {child_name_query} dans votre configuration Custody."
-            else:
-                speech = f"Sorry, I cannot find a child named {child_name_query} in your Custody configuration."
-            response.async_set_speech(speech)
-            return response
-
-        data = best_match_coordinator.data
+        data = best_match_coordinator.data if best_match_coordinator else None
         if not data:
-            if language == "fr":
-                speech = f"Je n'ai pas encore pu calculer la position de {match_display_name}."
-            else:
-                speech = f"I haven't been able to calculate {match_display_name}'s position yet."
+            speech = _no_data_speech(language, child_name_query, match_display_name, best_match_coordinator is not None)
             response.async_set_speech(speech)
             return response
 
@@ -88,5 +92,49 @@ class CustodyWhoHasChildHandler(intent.IntentHandler):
             else:
                 text = f"{match_display_name} is currently with the other parent."
 
+        # Nuit à venir, lue dans la grille de garde
+        ownership = data.ownership
+        if ownership is not None and data.is_present != (
+            ownership.night_source(ownership.clamp(dt_util.now().date().toordinal())) is not None
+        ):
+            if language == "fr":
+                text += " Passage de garde avant ce soir." if data.is_present else " Retour chez vous ce soir."
+            else:
+                text += " The handover happens before tonight." if data.is_present else " Back with you tonight."
+
+        response.async_set_speech(text)
+        return response
+
+
+class CustodyNightsWithChildHandler(intent.IntentHandler):
+    """Handler for CustodyNightsWithChild intent (custody nights over the next 30 days)."""
+
+    intent_type = INTENT_NIGHTS_WITH_CHILD
+    slot_schema = {vol.Required("child_name"): cv.string}
+
+    async def async_handle(self, intent_obj: intent.Intent) -> intent.IntentResponse:
+        """Handle the intent."""
+        slots = self.async_validate_slots(intent_obj.slots)
+        child_name_query = slots["child_name"]["value"].lower().strip()
+        language = intent_obj.language
+
+        coordinator, match_display_name = _find_child(intent_obj.hass, child_name_query)
+        response = intent_obj.create_response()
+
+        data = coordinator.data if coordinator else None
+        ownership = data.ownership if data else None
+        if ownership is None:
+            speech = _no_data_speech(language, child_name_query, match_display_name, coordinator is not None)
+            response.async_set_speech(speech)
+            return response
+
+        # Nuits restantes à partir d'aujourd'hui (la grille a pu être calculée la veille)
+        today = ownership.clamp(dt_util.now().date().toordinal())
+        nights = ownership.count_nights(today, ownership.last_day)
+        total = ownership.last_day - today + 1
+        if language == "fr":
+            text = f"{match_display_name} passe {nights} des {total} prochaines nuits avec vous."
+        else:
+            text = f"{match_display_name} spends {nights} of the next {total} nights with you."
         response.async_set_speech(text)
         return response
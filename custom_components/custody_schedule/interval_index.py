@@ -0,0 +1,85 @@
+"""Sorted interval index without Home Assistant imports (testable in isolation)."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Generic, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Immutable index over [start, end) intervals ordered by start.
+
+    Parallel start/end arrays are kept alongside a running maximum of the ends
+    (max-end augmentation): it is non-decreasing, so "first interval ending after t"
+    is a bisect even when intervals overlap or are nested.
+    """
+
+    __slots__ = ("_items", "_starts", "_ends", "_max_ends")
+
+    def __init__(self, items: Iterable[T], start: Callable[[T], Any], end: Callable[[T], Any]) -> None:
+        # sorted() is stable: intervals sharing a start keep their input order
+        self._items: list[T] = sorted(items, key=start)
+        self._starts: list[Any] = [start(item) for item in self._items]
+        self._ends: list[Any] = [end(item) for item in self._items]
+        self._max_ends: list[Any] = []
+        running = None
+        for value in self._ends:
+            if running is None or value > running:
+                running = value
+            self._max_ends.append(running)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    @property
+    def items(self) -> list[T]:
+        """Return the intervals ordered by start (do not mutate)."""
+        return self._items
+
+    def containing(self, instant: Any, end_after: Any = None) -> T | None:
+        """Return the first interval (by start) with start <= instant < end.
+
+        end_after raises the bound the end must exceed (e.g. instant + a safety margin).
+        """
+        threshold = instant if end_after is None else end_after
+        upper = bisect_right(self._starts, instant)
+        for pos in range(bisect_right(self._max_ends, threshold), upper):
+            if self._ends[pos] > threshold:
+                return self._items[pos]
+        return None
+
+    def first_starting_after(self, instant: Any, end_after: Any = None) -> T | None:
+        """Return the first interval with start > instant (and end > end_after if given)."""
+        for pos in range(bisect_right(self._starts, instant), len(self._items)):
+            if end_after is None or self._ends[pos] > end_after:
+                return self._items[pos]
+        return None
+
+    def first_ending_after(self, instant: Any) -> T | None:
+        """Return the first interval (by start) whose end is strictly after instant."""
+        pos = bisect_right(self._max_ends, instant)
+        return self._items[pos] if pos < len(self._items) else None
+
+    def ending_after(self, instant: Any, inclusive: bool = False) -> Iterator[T]:
+        """Yield intervals whose end is after instant (or equal if inclusive), ordered by start."""
+        if inclusive:
+            start = bisect_left(self._max_ends, instant)
+            for pos in range(start, len(self._items)):
+                if self._ends[pos] >= instant:
+                    yield self._items[pos]
+            return
+        for pos in range(bisect_right(self._max_ends, instant), len(self._items)):
+            if self._ends[pos] > instant:
+                yield self._items[pos]
+
+    def overlapping(self, start: Any, end: Any) -> Iterator[T]:
+        """Yield intervals touching [start, end] (bounds inclusive), ordered by start."""
+        upper = bisect_right(self._starts, end)
+        for pos in range(bisect_left(self._max_ends, start), upper):
+            if self._ends[pos] >= start:
+                yield self._items[pos]
@@ -0,0 +1,151 @@
+"""Local day table for the schedule engine without Home Assistant imports (testable in isolation)."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from threading import Lock
+
+EPOCH_DAY = date(1970, 1, 1).toordinal()
+DAY_SECONDS = 86400
+
+
+def weekday_of(day: int) -> int:
+    """Return the weekday (Monday = 0) of a date ordinal."""
+    return (day - 1) % 7
+
+
+def time_minutes(value: time) -> int:
+    """Return a time of day as minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+@lru_cache(maxsize=8)
+def get_local_day_table(tz: tzinfo) -> LocalDayTable:
+    """Return the (memoized) day table of a time zone, shared by every entry."""
+    return LocalDayTable(tz)
+
+
+class LocalDayTable:
+    """UTC offsets of a time zone for each local day, filled a few civil years at a time.
+
+    Days are date ordinals (date.toordinal()) and times of day minutes (plus seconds)
+    since local midnight. A day stores the offset in effect at its midnight; the few
+    days with a transition (DST) also store the wall-clock second from which the new
+    offset applies. This follows the fold=0 rule of datetime: skipped times use the
+    offset before the change and repeated times their first occurrence.
+
+    The table is shared by the event loop and executor threads: an extension builds new
+    arrays under a lock and publishes (first, offsets) last, so a reader always sees a
+    consistent table covering at least what it saw before.
+    """
+
+    __slots__ = ("tz", "_table", "_switches", "_transitions", "_lock")
+
+    def __init__(self, tz: tzinfo) -> None:
+        self.tz = tz
+        self._table: tuple[int, array] = (0, array("i"))
+        self._switches: dict[int, tuple[int, int]] = {}
+        self._transitions: tuple[array, array] = (array("q"), array("i"))
+        self._lock = Lock()
+
+    def epoch(self, day: int, minute: int = 0, second: int = 0) -> int:
+        """Return the epoch seconds of a local wall-clock time."""
+        wall = minute * 60 + second
+        first, offsets = self._table
+        if not 0 <= day - first < len(offsets):
+            first, offsets = self._extend(day)
+        offset = offsets[day - first]
+        switch = self._switches.get(day)
+        if switch is not None and wall >= switch[0]:
+            offset = switch[1]
+        return (day - EPOCH_DAY) * DAY_SECONDS + wall - offset
+
+    def datetime(self, day: int, minute: int = 0, second: int = 0) -> datetime:
+        """Return a local wall-clock time as an aware datetime (engine output only)."""
+        return datetime.fromtimestamp(self.epoch(day, minute, second), self.tz)
+
+    def from_epoch(self, timestamp: float) -> datetime:
+        """Return epoch seconds as an aware datetime in the table's zone."""
+        return datetime.fromtimestamp(timestamp, self.tz)
+
+    def split(self, value: datetime) -> tuple[int, int]:
+        """Return (local day ordinal, second of day) of an aware datetime (engine input)."""
+        return self.split_epoch(int(value.timestamp() // 1))
+
+    def split_epoch(self, timestamp: int) -> tuple[int, int]:
+        """Return (local day ordinal, second of day) of epoch seconds."""
+        approx = timestamp // DAY_SECONDS + EPOCH_DAY
+        first, offsets = self._table
+        if not 0 < approx - first < len(offsets) - 1:
+            first, offsets = self._extend(approx)
+        transitions, transition_offsets = self._transitions
+        pos = bisect_right(transitions, timestamp)
+        offset = transition_offsets[pos - 1] if pos else offsets[0]
+        local_day, wall = divmod(timestamp + offset, DAY_SECONDS)
+        return local_day + EPOCH_DAY, wall
+
+    def day(self, value: datetime) -> int:
+        """Return the local day ordinal of an aware datetime."""
+        return self.split(value)[0]
+
+    def _extend(self, day: int) -> tuple[int, array]:
+        """Rebuild the table so that it covers the civil years around `day`, return (first, offsets)."""
+        with self._lock:
+            current_first, current_offsets = self._table
+            # Another thread may have extended the table meanwhile
+            if 0 < day - current_first < len(current_offsets) - 1:
+                return self._table
+            return self._build(day, current_first, current_offsets)
+
+    def _build(self, day: int, current_first: int, current_offsets: array) -> tuple[int, array]:
+        year = date.fromordinal(day).year
+        if current_offsets:
+            first_year = min(year - 1, date.fromordinal(current_first).year)
+            last_year = max(year + 1, date.fromordinal(current_first + len(current_offsets) - 1).year)
+        else:
+            first_year, last_year = year - 1, year + 2
+        first = date(first_year, 1, 1).toordinal()
+        last = date(last_year + 1, 1, 1).toordinal()
+
+        offsets = array("i", (self._midnight_offset(value) for value in range(first, last + 1)))
+        switches: dict[int, tuple[int, int]] = {}
+        transitions = array("q")
+        transition_offsets = array("i")
+        for index in range(last - first):
+            before, after = offsets[index], offsets[index + 1]
+            if before == after:
+                continue
+            value = first + index
+            instant = self._transition_instant(value, before)
+            wall_midnight = (value - EPOCH_DAY) * DAY_SECONDS
+            switches[value] = (instant + max(before, after) - wall_midnight, after)
+            transitions.append(instant)
+            transition_offsets.append(after)
+
+        # Readers take the table first: publish it last, once switches and transitions cover it
+        self._switches = switches
+        self._transitions = (transitions, transition_offsets)
+        self._table = (first, offsets[:-1])
+        return self._table
+
+    def _midnight_offset(self, day: int) -> int:
+        moment = datetime.combine(date.fromordinal(day), time(), tzinfo=self.tz)
+        return int(moment.utcoffset() // timedelta(seconds=1))
+
+    def _utc_offset(self, timestamp: int) -> int:
+        return int(datetime.fromtimestamp(timestamp, self.tz).utcoffset() // timedelta(seconds=1))
+
+    def _transition_instant(self, day: int, before: int) -> int:
+        """Return the first epoch second using the new offset, around local day `day` (bisection)."""
+        low = (day - EPOCH_DAY) * DAY_SECONDS - DAY_SECONDS // 2
+        high = (day + 1 - EPOCH_DAY) * DAY_SECONDS + DAY_SECONDS // 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._utc_offset(middle) == before:
+                low = middle
+            else:
+                high = middle
+        return high
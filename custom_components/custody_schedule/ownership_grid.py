@@ -0,0 +1,158 @@
+"""Per-day and per-night custody grid without Home Assistant imports (testable in isolation)."""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from .local_time import LocalDayTable
+from .window_columns import SOURCES
+
+# Cell value 0: no custody; n > 0: custody, source_table[n - 1] of the window covering the cell
+NO_CUSTODY = 0
+
+
+class OwnershipGrid:
+    """Custody of consecutive local days and nights, one byte per cell indexed by date ordinal.
+
+    A day counts when a custody window covers part of it, a night (the night after
+    day d) when a window holds local midnight between d and d + 1. Overlapping windows
+    keep the source of the one starting first (the merge order of the windows).
+    Point lookups are an index, range counts a bytes.count over the slice.
+    """
+
+    __slots__ = ("first_day", "_days", "_nights", "_source_table")
+
+    def __init__(self, first_day: int, days: bytes, nights: bytes, source_table: Iterable[str] = SOURCES) -> None:
+        if len(days) != len(nights):
+            raise ValueError("Day and night cells must have the same length")
+        self.first_day = first_day
+        self._days = bytes(days)
+        self._nights = bytes(nights)
+        self._source_table = tuple(source_table)
+
+    @classmethod
+    def from_spans(
+        cls,
+        first_day: int,
+        last_day: int,
+        spans: Iterable[tuple[int, int, str]],
+        table: LocalDayTable,
+    ) -> OwnershipGrid:
+        """Build the grid of [first_day, last_day] from (start, end, source) epoch spans ordered by start."""
+        size = last_day - first_day + 1
+        days = bytearray(size)
+        nights = bytearray(size)
+        source_table = list(SOURCES)
+        source_codes = {name: code + 1 for code, name in enumerate(source_table)}
+
+        # Written last to first: the window starting first keeps the cells it shares
+        for start, end, source in reversed(list(spans)):
+            if end <= start:
+                continue
+            code = source_codes.get(source)
+            if code is None:
+                source_table.append(source)
+                code = source_codes[source] = len(source_table)
+            start_day, _ = table.split_epoch(start)
+            end_day, _ = table.split_epoch(end)
+
+            # Days touched by [start, end): a window ending at midnight leaves that day alone
+            last_covered = end_day if end > table.epoch(end_day) else end_day - 1
+            low, high = max(start_day, first_day), min(last_covered, last_day)
+            if low <= high:
+                days[low - first_day : high - first_day + 1] = bytes((code,)) * (high - low + 1)
+
+            # Nights whose closing midnight falls in [start, end)
+            first_night = start_day - 1 if start <= table.epoch(start_day) else start_day
+            last_night = end_day - 1 if table.epoch(end_day) < end else end_day - 2
+            low, high = max(first_night, first_day), min(last_night, last_day)
+            if low <= high:
+                nights[low - first_day : high - first_day + 1] = bytes((code,)) * (high - low + 1)
+
+        return cls(first_day, days, nights, source_table)
+
+    @classmethod
+    def join(cls, grids: Iterable[OwnershipGrid]) -> OwnershipGrid:
+        """Concatenate grids covering consecutive ranges (ordered, without gap)."""
+        grids = list(grids)
+        if not grids:
+            raise ValueError("At least one grid is needed")
+        source_table = list(grids[0]._source_table)
+        days = bytearray(grids[0]._days)
+        nights = bytearray(grids[0]._nights)
+        for grid in grids[1:]:
+            if grid.first_day != grids[0].first_day + len(days):
+                raise ValueError("Grids must cover consecutive days")
+            cells_days, cells_nights = grid._days, grid._nights
+            if grid._source_table != tuple(source_table[: len(grid._source_table)]):
+                # Different extra sources: map the codes of this grid onto the joined table
+                mapping = bytearray(range(256))
+                for code, name in enumerate(grid._source_table, start=1):
+                    if name not in source_table:
+                        source_table.append(name)
+                    mapping[code] = source_table.index(name) + 1
+                cells_days, cells_nights = cells_days.translate(mapping), cells_nights.translate(mapping)
+            days += cells_days
+            nights += cells_nights
+        return cls(grids[0].first_day, days, nights, source_table)
+
+    @property
+    def last_day(self) -> int:
+        """Return the ordinal of the last day of the grid."""
+        return self.first_day + len(self._days) - 1
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __contains__(self, day: object) -> bool:
+        return isinstance(day, int) and self.first_day <= day <= self.last_day
+
+    def clamp(self, day: int) -> int:
+        """Return `day` moved into [first_day, last_day]."""
+        return min(max(day, self.first_day), self.last_day)
+
+    def day_source(self, day: int) -> str | None:
+        """Return the source of the custody window covering `day`, None without custody."""
+        return self._source(self._days, day)
+
+    def night_source(self, day: int) -> str | None:
+        """Return the source of the custody window holding the night after `day`, None without custody."""
+        return self._source(self._nights, day)
+
+    def count_days(self, first: int, last: int) -> int:
+        """Return how many days of [first, last] (clipped to the grid) have custody."""
+        return self._count(self._days, first, last)
+
+    def count_nights(self, first: int, last: int) -> int:
+        """Return how many nights after the days of [first, last] (clipped to the grid) have custody."""
+        return self._count(self._nights, first, last)
+
+    def slice(self, first: int, last: int) -> OwnershipGrid:
+        """Return the grid restricted to [first, last] (clipped)."""
+        low, high = self._bounds(first, last)
+        return OwnershipGrid(
+            max(first, self.first_day), self._days[low:high], self._nights[low:high], self._source_table
+        )
+
+    def rows(self) -> Iterator[tuple[int, str | None, str | None]]:
+        """Yield (day, day source, night source) for every day of the grid."""
+        table = (None, *self._source_table)
+        for offset, (day_code, night_code) in enumerate(zip(self._days, self._nights)):
+            yield self.first_day + offset, table[day_code], table[night_code]
+
+    def _source(self, cells: bytes, day: int) -> str | None:
+        if day not in self:
+            raise KeyError(day)
+        code = cells[day - self.first_day]
+        return None if code == NO_CUSTODY else self._source_table[code - 1]
+
+    def _count(self, cells: bytes, first: int, last: int) -> int:
+        low, high = self._bounds(first, last)
+        if low >= high:
+            return 0
+        return high - low - cells.count(NO_CUSTODY, low, high)
+
+    def _bounds(self, first: int, last: int) -> tuple[int, int]:
+        low = max(first - self.first_day, 0)
+        high = min(last - self.first_day + 1, len(self._days))
+        return low, max(low, high)
@@ -0,0 +1,223 @@
+"""Schedule plan: the entry configuration compiled once per update for the window generators."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import Any, Mapping
+
+from .const import (
+    CONF_ALSACE_MOSELLE,
+    CONF_ARRIVAL_TIME,
+    CONF_AUTO_PARENT_DAYS,
+    CONF_COUNTRY,
+    CONF_CUSTODY_TYPE,
+    CONF_CUSTOM_PATTERN,
+    CONF_DEPARTURE_TIME,
+    CONF_ENABLE_CUSTODY,
+    CONF_END_DAY,
+    CONF_EXCEPTIONS_RECURRING,
+    CONF_PARENTAL_ROLE,
+    CONF_REFERENCE_YEAR,
+    CONF_REFERENCE_YEAR_CUSTODY,
+    CONF_START_DAY,
+    CONF_SUMMER_SPLIT_MODE,
+    CONF_VACATION_SPLIT_MODE,
+    CONF_WEEKEND_START_DAY,
+    CONF_ZONE,
+    CUSTODY_TYPES,
+    DEFAULT_COUNTRY,
+)
+from .local_time import time_minutes
+
+WEEKDAY_LOOKUP = {
+    "monday": 0,
+    "tuesday": 1,
+    "wednesday": 2,
+    "thursday": 3,
+    "friday": 4,
+    "saturday": 5,
+    "sunday": 6,
+}
+
+# Settings that shape the windows of every year (hashed into SchedulePlan.fingerprint)
+PLAN_CONFIG_KEYS = (
+    CONF_ALSACE_MOSELLE,
+    CONF_ARRIVAL_TIME,
+    CONF_AUTO_PARENT_DAYS,
+    CONF_COUNTRY,
+    CONF_CUSTODY_TYPE,
+    CONF_CUSTOM_PATTERN,
+    CONF_DEPARTURE_TIME,
+    CONF_ENABLE_CUSTODY,
+    CONF_END_DAY,
+    CONF_PARENTAL_ROLE,
+    CONF_REFERENCE_YEAR,
+    CONF_REFERENCE_YEAR_CUSTODY,
+    CONF_START_DAY,
+    CONF_SUMMER_SPLIT_MODE,
+    CONF_VACATION_SPLIT_MODE,
+    CONF_WEEKEND_START_DAY,
+    CONF_ZONE,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class RecurringException:
+    """One weekly exception with its times and optional date bounds resolved."""
+
+    weekday: int
+    start_minute: int
+    end_minute: int
+    # Date ordinals, None when open-ended
+    first_day: int | None
+    last_day: int | None
+    label: str
+
+
+@dataclass(slots=True, frozen=True)
+class SchedulePlan:
+    """Immutable view of the configuration read by the generators (no dict lookups in loops)."""
+
+    enabled: bool
+    custody_type: str
+    cycle_days: int
+    # Run-length encoded cycle: (number of days, custody on)
+    segments: tuple[tuple[int, bool], ...]
+    label: str
+    holiday_label: str
+    arrival: time
+    departure: time
+    arrival_minute: int
+    departure_minute: int
+    end_day: str
+    end_weekday: int
+    start_weekday: int
+    # Days from the ISO week Monday to the weekend start (Friday 4 / Saturday 5)
+    weekend_offset: int
+    reference_parity: str
+    week_parity: int
+    country: str
+    alsace_moselle: bool
+    zone: str | None
+    vacation_split_mode: str
+    summer_split_mode: str
+    # Role for the automatic Mother's/Father's day windows, None when disabled
+    parental_role: str | None
+    recurring: tuple[RecurringException, ...]
+    fingerprint: str
+
+
+def parse_time(value: str) -> time:
+    """Parse HH:MM strings into a time object (08:00 when invalid)."""
+    try:
+        hour, minute = value.split(":")
+        return time(int(hour), int(minute))
+    except (ValueError, AttributeError):
+        return time(8, 0)
+
+
+def _parse_day(value: Any) -> int | None:
+    """Return the ordinal of a YYYY-MM-DD date, None when missing or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value), "%Y-%m-%d").toordinal()
+    except ValueError:
+        return None
+
+
+def _run_lengths(states: list[str]) -> tuple[tuple[int, bool], ...]:
+    """Collapse day states ("on"/"off") into (days, on) runs."""
+    runs: list[tuple[int, bool]] = []
+    current_state = states[0]
+    current_count = 0
+    for state in states:
+        if state == current_state:
+            current_count += 1
+        else:
+            runs.append((current_count, current_state == "on"))
+            current_state = state
+            current_count = 1
+    runs.append((current_count, current_state == "on"))
+    return tuple(runs)
+
+
+def _compile_recurring(items: Any) -> tuple[RecurringException, ...]:
+    """Keep the valid recurring exceptions, in configuration order."""
+    if not isinstance(items, list):
+        return ()
+    compiled = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            weekday = int(item.get("weekday"))
+        except (TypeError, ValueError):
+            continue
+        if weekday < 0 or weekday > 6:
+            continue
+        start_time = parse_time(item.get("start_time"))
+        end_time = parse_time(item.get("end_time"))
+        if end_time <= start_time:
+            continue
+        compiled.append(
+            RecurringException(
+                weekday=weekday,
+                start_minute=time_minutes(start_time),
+                end_minute=time_minutes(end_time),
+                first_day=_parse_day(item.get("start_date")),
+                last_day=_parse_day(item.get("end_date")),
+                label=item.get("label") or "Recurring exception",
+            )
+        )
+    return tuple(compiled)
+
+
+def compile_plan(config: Mapping[str, Any]) -> SchedulePlan:
+    """Resolve the configuration once (called on setup and on every update_config)."""
+    custody_type = config.get(CONF_CUSTODY_TYPE, "alternate_week")
+    type_def = CUSTODY_TYPES.get(custody_type) or CUSTODY_TYPES["alternate_week"]
+    cycle_days = type_def["cycle_days"]
+    segments = tuple((segment["days"], segment["state"] == "on") for segment in type_def["pattern"])
+    if custody_type == "custom" and config.get(CONF_CUSTOM_PATTERN):
+        states = str(config.get(CONF_CUSTOM_PATTERN)).split(",")
+        cycle_days = len(states)
+        segments = _run_lengths(states)
+
+    type_label = CUSTODY_TYPES.get(custody_type, {}).get("label", "Garde")
+    arrival = parse_time(config.get(CONF_ARRIVAL_TIME, "08:00"))
+    departure = parse_time(config.get(CONF_DEPARTURE_TIME, "19:00"))
+    end_day = config.get(CONF_END_DAY, "sunday").lower()
+    reference_parity = config.get(CONF_REFERENCE_YEAR_CUSTODY, config.get(CONF_REFERENCE_YEAR, "even"))
+    role = config.get(CONF_PARENTAL_ROLE, "none") if config.get(CONF_AUTO_PARENT_DAYS, False) else "none"
+
+    encoded = json.dumps([config.get(key) for key in PLAN_CONFIG_KEYS], sort_keys=True, default=str)
+    return SchedulePlan(
+        enabled=config.get(CONF_ENABLE_CUSTODY, True),
+        custody_type=custody_type,
+        cycle_days=cycle_days,
+        segments=segments,
+        label=f"Garde - {type_label}",
+        holiday_label=f"Garde - {type_label} + Holiday",
+        arrival=arrival,
+        departure=departure,
+        arrival_minute=time_minutes(arrival),
+        departure_minute=time_minutes(departure),
+        end_day=end_day,
+        end_weekday=WEEKDAY_LOOKUP.get(end_day, 6),
+        start_weekday=WEEKDAY_LOOKUP.get(config.get(CONF_START_DAY, "monday").lower(), 0),
+        weekend_offset=5 if config.get(CONF_WEEKEND_START_DAY, "friday") == "saturday" else 4,
+        reference_parity=reference_parity,
+        week_parity=0 if reference_parity == "even" else 1,
+        country=config.get(CONF_COUNTRY, DEFAULT_COUNTRY),
+        alsace_moselle=config.get(CONF_ALSACE_MOSELLE, False),
+        zone=config.get(CONF_ZONE),
+        vacation_split_mode=config.get(CONF_VACATION_SPLIT_MODE, "odd_first"),
+        summer_split_mode=config.get(CONF_SUMMER_SPLIT_MODE, "half"),
+        parental_role=None if role == "none" else role,
+        recurring=_compile_recurring(config.get(CONF_EXCEPTIONS_RECURRING, [])),
+        fingerprint=hashlib.sha1(encoded.encode(), usedforsecurity=False).hexdigest(),
+    )
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import random
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+from urllib.parse import urlencode
 
 import aiohttp
 from homeassistant.core import HomeAssistant
@@ -14,9 +17,12 @@ from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
 from .const import HOLIDAY_API, LOGGER
+from .holiday_dataset import HolidayDataset, school_year_of
 
+_T = TypeVar("_T")
 
-@dataclass(slots=True)
+
+@dataclass(slots=True, frozen=True)
 class SchoolHoliday:
     """Represent a school holiday period."""
 
@@ -26,21 +32,233 @@ class SchoolHoliday:
     end: datetime
 
 
+@dataclass(slots=True, frozen=True)
+class HolidaySnapshot:
+    """Immutable holiday list of one (country, zone), shared by every stage of a computation.
+
+    The version changes only when the cached list for the key is replaced by a different
+    one, so callers can keep what they derived from a snapshot while the version is the same.
+    """
+
+    holidays: tuple[SchoolHoliday, ...]
+    version: int
+
+    def __len__(self) -> int:
+        return len(self.holidays)
+
+
+EMPTY_SNAPSHOT = HolidaySnapshot((), 0)
+
+
+# Requêtes simultanées par fournisseur (une par année) ; les autres attendent leur tour
+MAX_CONCURRENT_REQUESTS = 3
+
+# Disjoncteur par hôte : ouvert après BREAKER_THRESHOLD appels en échec, puis une requête
+# d'essai (semi-ouvert) après un délai qui double à chaque nouvel échec
+BREAKER_THRESHOLD = 3
+BREAKER_BASE_DELAY = timedelta(minutes=5)
+BREAKER_MAX_DELAY = timedelta(hours=6)
+
+
+def backoff(failures: int, base: timedelta, cap: timedelta) -> timedelta:
+    """Return the exponential delay after `failures` consecutive failures (base, 2 * base, ... up to cap)."""
+    return min(base * 2 ** min(max(failures - 1, 0), 16), cap)
+
+
+class HolidayProviderUnavailable(Exception):
+    """The circuit breaker of a provider host is open: no request was sent."""
+
+    def __init__(self, host: str, retry_at: datetime) -> None:
+        super().__init__(f"{host} unavailable until {retry_at.isoformat()}")
+        self.host = host
+        self.retry_at = retry_at
+
+
+class HolidaysNotModified(Exception):
+    """Every payload of a conditional fetch was unchanged (HTTP 304): the cached holidays still hold."""
+
+
+# Réponse 304 d'une requête conditionnelle : rien à relire
+NOT_MODIFIED = object()
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker of one API host, shared by every request to it."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    __slots__ = ("host", "state", "failures", "retry_at")
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.state = self.CLOSED
+        self.failures = 0
+        self.retry_at: datetime | None = None
+
+    def allow(self, now: datetime) -> bool:
+        """Return whether a call may go out; once its delay is over, an open breaker lets one probe through."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.retry_at is not None and now >= self.retry_at:
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self.state != self.CLOSED:
+            LOGGER.info("Holiday provider %s is reachable again", self.host)
+        self.state = self.CLOSED
+        self.failures = 0
+        self.retry_at = None
+
+    def record_failure(self, now: datetime) -> None:
+        """Count a failed call; open the breaker at the threshold or when the probe failed."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= BREAKER_THRESHOLD:
+            self.state = self.OPEN
+            self.retry_at = now + backoff(self.failures - BREAKER_THRESHOLD + 1, BREAKER_BASE_DELAY, BREAKER_MAX_DELAY)
+            LOGGER.warning("Holiday provider %s unavailable, next attempt at %s", self.host, self.retry_at)
+
+    def release(self) -> None:
+        """Give the probe back when it was cancelled before any outcome (the next call probes again)."""
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state as stored (and shown in the diagnostics)."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore a stored state; a probe interrupted by a restart is sent again."""
+        retry_at = dt_util.parse_datetime(data.get("retry_at") or "")
+        state = data.get("state", self.CLOSED)
+        if state == self.CLOSED or retry_at is None:
+            return
+        self.state = self.OPEN
+        self.failures = int(data.get("failures", BREAKER_THRESHOLD))
+        self.retry_at = retry_at
+
+
 class BaseHolidayProvider(ABC):
     """Base class for school holiday providers."""
 
-    def __init__(self, hass: HomeAssistant, session: aiohttp.ClientSession) -> None:
+    # API host, the scope of the circuit breaker
+    HOST = ""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
         self.hass = hass
         self.session = session
+        self.breaker = breaker or CircuitBreaker(self.HOST)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
 
     @abstractmethod
-    async def get_holidays(self, country: str, zone: str, year: int | None = None) -> list[SchoolHoliday]:
-        """Fetch holidays for a specific country, zone and year."""
+    async def get_holidays(
+        self, country: str, zone: str, year: int | None = None, validators: dict[str, dict[str, str]] | None = None
+    ) -> list[SchoolHoliday]:
+        """Fetch holidays for a specific country, zone and year.
+
+        `validators` are the HTTP validators (URL -> ETag / Last-Modified) recorded by the last
+        fetch of the same cache entry. The requests carry them, they are replaced by those of the
+        answers, and HolidaysNotModified is raised when none of the payloads changed (the caller
+        keeps what it has). Without them nothing is sent nor recorded.
+        """
+
+    async def _async_get_json(
+        self, url: str, validators: dict[str, dict[str, str]] | None, conditional: bool = True, **kwargs: Any
+    ) -> Any:
+        """GET a JSON payload, NOT_MODIFIED when the server answers 304 to the validators of this URL.
+
+        They are sent when `conditional`, replaced by those of a full answer and dropped when the request fails.
+        """
+        params = kwargs.get("params")
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        stored = validators.pop(key, {}) if validators is not None else {}
+        sent = stored if conditional else {}
+        headers = {}
+        if "etag" in sent:
+            headers["If-None-Match"] = sent["etag"]
+        if "last_modified" in sent:
+            headers["If-Modified-Since"] = sent["last_modified"]
+
+        async with self.session.get(url, headers=headers or None, **kwargs) as resp:
+            if headers and resp.status == 304:
+                validators[key] = stored
+                return NOT_MODIFIED
+            resp.raise_for_status()
+            payload = await resp.json()
+            answer = {
+                name: resp.headers[header]
+                for name, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+                if header in resp.headers
+            }
+        if answer and validators is not None:
+            validators[key] = answer
+        return payload
+
+    async def _async_gather(
+        self,
+        keys: Iterable[_T],
+        fetch: Callable[[_T, bool], Awaitable[list[SchoolHoliday] | None]],
+        conditional: bool = False,
+    ) -> list[SchoolHoliday]:
+        """Run fetch(key, conditional) for every key concurrently (bounded) and concatenate the results in key order.
+
+        A failing key is logged and left empty; the outcome of the whole call feeds the
+        circuit breaker, which raises HolidayProviderUnavailable without any request while open.
+        A conditional call raises HolidaysNotModified when no key changed; when only some
+        did, the unchanged ones are fetched again in full to rebuild the whole list.
+        """
+        if not self.breaker.allow(dt_util.now()):
+            raise HolidayProviderUnavailable(self.HOST, self.breaker.retry_at or dt_util.now())
+        keys = list(keys)
+        failed = False
+
+        async def bounded(key: _T, conditional: bool) -> list[SchoolHoliday] | None:
+            nonlocal failed
+            async with self._semaphore:
+                try:
+                    return await fetch(key, conditional)
+                except Exception as err:
+                    failed = True
+                    LOGGER.error("Error fetching holidays from %s for %s: %s", self.HOST, key, err)
+                    return []
+
+        try:
+            results = list(await asyncio.gather(*(bounded(key, conditional) for key in keys)))
+            unchanged = [index for index, result in enumerate(results) if result is None]
+            if unchanged and len(unchanged) < len(results):
+                refetched = await asyncio.gather(*(bounded(keys[index], False) for index in unchanged))
+                for index, result in zip(unchanged, refetched):
+                    results[index] = result
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        if failed:
+            self.breaker.record_failure(dt_util.now())
+        else:
+            self.breaker.record_success()
+        if results and all(result is None for result in results):
+            raise HolidaysNotModified
+        return [holiday for result in results for holiday in result or ()]
 
 
 class FranceEducationProvider(BaseHolidayProvider):
     """Provider for French school holidays using Education Nationale API."""
 
+    HOST = "data.education.gouv.fr"
+
     def _get_school_year(self, date: datetime) -> str:
         """Convert a calendar date to school year format (e.g., '2024-2025')."""
         year = date.year
@@ -59,8 +277,10 @@ class FranceEducationProvider(BaseHolidayProvider):
         }
         return zone_mapping.get(zone, zone)
 
-    async def get_holidays(self, country: str, zone: str, year: int | None = None) -> list[SchoolHoliday]:
-        """Fetch holidays from the French API."""
+    async def get_holidays(
+        self, country: str, zone: str, year: int | None = None, validators: dict[str, dict[str, str]] | None = None
+    ) -> list[SchoolHoliday]:
+        """Fetch holidays from the French API (the school years are requested concurrently)."""
         now = dt_util.now()
         school_years = set()
 
@@ -77,165 +297,313 @@ class FranceEducationProvider(BaseHolidayProvider):
                 school_years.add(f"{next_year_start + 1}-{next_year_start + 2}")
 
         normalized_zone = self._normalize_zone(zone)
-        all_holidays: list[SchoolHoliday] = []
-
-        for school_year in school_years:
-            url = HOLIDAY_API.format(zone=normalized_zone, year=school_year)
-            try:
-                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=20)) as resp:
-                    resp.raise_for_status()
-                    payload: dict[str, Any] = await resp.json()
-
-                    records = payload.get("records", [])
-
-                    # Manual fallback if zone filtering fails in the API
-                    if len(records) == 0 and normalized_zone in ["A", "B", "C"]:
-                        url_all = (
-                            "https://data.education.gouv.fr/api/records/1.0/search/"
-                            f"?dataset=fr-en-calendrier-scolaire"
-                            f"&refine.annee_scolaire={school_year}"
-                            f"&rows=100"
-                        )
-                        async with self.session.get(url_all) as resp2:
-                            resp2.raise_for_status()
-                            payload_all = await resp2.json()
-                            for r in payload_all.get("records", []):
-                                fields = r.get("fields", {})
-                                zone_field = str(fields.get("zones") or fields.get("zone") or "")
-                                if normalized_zone == zone_field or normalized_zone in zone_field.split(","):
-                                    records.append(r)
-
-                    for record in records:
-                        fields = record.get("fields", {})
-                        start_str = fields.get("start_date") or fields.get("date_debut")
-                        end_str = fields.get("end_date") or fields.get("date_fin")
-                        name = fields.get("description") or fields.get("libelle") or "Vacances scolaires"
-
-                        if not start_str or not end_str:
-                            continue
-
-                        start = dt_util.parse_datetime(start_str)
-                        end = dt_util.parse_datetime(end_str)
-
-                        if not start or not end:
-                            continue
-
-                        if year is not None and not (
-                            start.year == year or end.year == year or (start.year < year < end.year)
-                        ):
-                            continue
-
-                        all_holidays.append(
-                            SchoolHoliday(
-                                name=name,
-                                zone=zone,
-                                start=dt_util.as_local(start),
-                                end=dt_util.as_local(end),
-                            )
-                        )
-            except Exception as err:
-                LOGGER.error("Error fetching holidays from France provider: %s", err)
 
+        async def fetch(school_year: str, conditional: bool) -> list[SchoolHoliday] | None:
+            return await self._async_school_year(school_year, normalized_zone, zone, year, validators, conditional)
+
+        all_holidays = await self._async_gather(sorted(school_years), fetch, bool(validators))
         return sorted(all_holidays, key=lambda h: (h.start, h.end))
 
+    async def _async_school_year(
+        self,
+        school_year: str,
+        normalized_zone: str,
+        zone: str,
+        year: int | None,
+        validators: dict[str, dict[str, str]] | None,
+        conditional: bool,
+    ) -> list[SchoolHoliday] | None:
+        """Fetch the holidays of one school year, None when unchanged (errors are raised to _async_gather)."""
+        holidays: list[SchoolHoliday] = []
+        url = HOLIDAY_API.format(zone=normalized_zone, year=school_year)
+        payload = await self._async_get_json(url, validators, conditional, timeout=aiohttp.ClientTimeout(total=20))
+        if payload is NOT_MODIFIED:
+            return None
+
+        records = payload.get("records", [])
+
+        # Manual fallback if zone filtering fails in the API
+        if len(records) == 0 and normalized_zone in ["A", "B", "C"]:
+            url_all = (
+                "https://data.education.gouv.fr/api/records/1.0/search/"
+                f"?dataset=fr-en-calendrier-scolaire"
+                f"&refine.annee_scolaire={school_year}"
+                f"&rows=100"
+            )
+            async with self.session.get(url_all) as resp2:
+                resp2.raise_for_status()
+                payload_all = await resp2.json()
+                for r in payload_all.get("records", []):
+                    fields = r.get("fields", {})
+                    zone_field = str(fields.get("zones") or fields.get("zone") or "")
+                    if normalized_zone == zone_field or normalized_zone in zone_field.split(","):
+                        records.append(r)
+
+        for record in records:
+            fields = record.get("fields", {})
+            start_str = fields.get("start_date") or fields.get("date_debut")
+            end_str = fields.get("end_date") or fields.get("date_fin")
+            name = fields.get("description") or fields.get("libelle") or "Vacances scolaires"
+
+            if not start_str or not end_str:
+                continue
+
+            start = dt_util.parse_datetime(start_str)
+            end = dt_util.parse_datetime(end_str)
+
+            if not start or not end:
+                continue
+
+            if year is not None and not (start.year == year or end.year == year or (start.year < year < end.year)):
+                continue
+
+            holidays.append(
+                SchoolHoliday(
+                    name=name,
+                    zone=zone,
+                    start=dt_util.as_local(start),
+                    end=dt_util.as_local(end),
+                )
+            )
+        return holidays
+
 
 class OpenHolidaysProvider(BaseHolidayProvider):
     """Provider for BE, CH, LU using OpenHolidays API."""
 
-    async def get_holidays(self, country: str, zone: str, year: int | None = None) -> list[SchoolHoliday]:
-        """Fetch holidays from OpenHolidays API."""
+    HOST = "openholidaysapi.org"
+
+    async def get_holidays(
+        self, country: str, zone: str, year: int | None = None, validators: dict[str, dict[str, str]] | None = None
+    ) -> list[SchoolHoliday]:
+        """Fetch holidays from OpenHolidays API (the years are requested concurrently)."""
         now = dt_util.now()
         years = [year] if year else [now.year, now.year + 1, now.year + 2]
-        all_holidays = []
-
-        for target_year in years:
-            # OpenHolidays API: https://www.openholidaysapi.org/en/
-            # Format: /SchoolHolidays?countryIsoCode=BE&languageIsoCode=FR&validFrom=2024-01-01&validTo=2024-12-31
-            lang = "FR" if country in ["BE", "CH", "LU"] else "EN"
-            valid_from = f"{target_year}-01-01"
-            valid_to = f"{target_year + 1}-01-01"
-
-            base_url = "https://openholidaysapi.org/SchoolHolidays"
-            params = {
-                "countryIsoCode": country,
-                "languageIsoCode": lang,
-                "validFrom": valid_from,
-                "validTo": valid_to,
-            }
 
-            # If zone is specified (Subdivision/Group), add it (Canton for CH, Community for BE)
-            if zone and zone not in ["FR", "BE", "CH", "LU", "A", "B", "C", "Corse", "DOM-TOM"]:
-                if country == "BE":
-                    params["groupCode"] = zone
-                else:
-                    params["subdivisionCode"] = zone
-
-            try:
-                async with self.session.get(base_url, params=params) as resp:
-                    resp.raise_for_status()
-                    payload = await resp.json()
-                    for item in payload:
-                        name_dict = item.get("name", [])
-                        name = next((n.get("text") for n in name_dict if n.get("language") == lang.lower()), "Vacances")
-                        start_naive = dt_util.parse_datetime(item.get("startDate"))
-                        end_naive = dt_util.parse_datetime(item.get("endDate"))
-                        if start_naive and end_naive:
-                            # Use explicit combine with local timezone to prevent shifts
-                            tz = dt_util.get_time_zone(self.hass.config.time_zone)
-                            start = dt_util.as_local(
-                                datetime.combine(start_naive.date(), datetime.min.time(), tzinfo=tz)
-                            )
-                            end = dt_util.as_local(datetime.combine(end_naive.date(), datetime.max.time(), tzinfo=tz))
-
-                            all_holidays.append(
-                                SchoolHoliday(
-                                    name=name,
-                                    zone=zone,
-                                    start=start,
-                                    end=end,
-                                )
-                            )
-            except Exception as err:
-                LOGGER.error("Error fetching from OpenHolidays for %s: %s", target_year, err)
+        async def fetch(target_year: int, conditional: bool) -> list[SchoolHoliday] | None:
+            return await self._async_year(country, zone, target_year, validators, conditional)
 
+        all_holidays = await self._async_gather(years, fetch, bool(validators))
         return sorted(all_holidays, key=lambda h: h.start)
 
+    async def _async_year(
+        self,
+        country: str,
+        zone: str,
+        target_year: int,
+        validators: dict[str, dict[str, str]] | None,
+        conditional: bool,
+    ) -> list[SchoolHoliday] | None:
+        """Fetch the holidays of one calendar year, None when unchanged (errors are raised to _async_gather)."""
+        holidays: list[SchoolHoliday] = []
+        # OpenHolidays API: https://www.openholidaysapi.org/en/
+        # Format: /SchoolHolidays?countryIsoCode=BE&languageIsoCode=FR&validFrom=2024-01-01&validTo=2024-12-31
+        lang = "FR" if country in ["BE", "CH", "LU"] else "EN"
+        valid_from = f"{target_year}-01-01"
+        valid_to = f"{target_year + 1}-01-01"
+
+        base_url = "https://openholidaysapi.org/SchoolHolidays"
+        params = {
+            "countryIsoCode": country,
+            "languageIsoCode": lang,
+            "validFrom": valid_from,
+            "validTo": valid_to,
+        }
+
+        # If zone is specified (Subdivision/Group), add it (Canton for CH, Community for BE)
+        if zone and zone not in ["FR", "BE", "CH", "LU", "A", "B", "C", "Corse", "DOM-TOM"]:
+            if country == "BE":
+                params["groupCode"] = zone
+            else:
+                params["subdivisionCode"] = zone
+
+        payload = await self._async_get_json(base_url, validators, conditional, params=params)
+        if payload is NOT_MODIFIED:
+            return None
+        for item in payload:
+            name_dict = item.get("name", [])
+            name = next((n.get("text") for n in name_dict if n.get("language") == lang.lower()), "Vacances")
+            start_naive = dt_util.parse_datetime(item.get("startDate"))
+            end_naive = dt_util.parse_datetime(item.get("endDate"))
+            if start_naive and end_naive:
+                # Use explicit combine with local timezone to prevent shifts
+                tz = dt_util.get_time_zone(self.hass.config.time_zone)
+                start = dt_util.as_local(datetime.combine(start_naive.date(), datetime.min.time(), tzinfo=tz))
+                end = dt_util.as_local(datetime.combine(end_naive.date(), datetime.max.time(), tzinfo=tz))
+
+                holidays.append(
+                    SchoolHoliday(
+                        name=name,
+                        zone=zone,
+                        start=start,
+                        end=end,
+                    )
+                )
+        return holidays
+
 
 class CanadaHolidayProvider(BaseHolidayProvider):
     """Provider for Canada/Quebec. Focuses on Statutory Public Holidays for now."""
 
-    async def get_holidays(self, country: str, zone: str, year: int | None = None) -> list[SchoolHoliday]:
-        """Fetch holidays for Canada."""
+    HOST = "canada-holidays.ca"
+
+    async def get_holidays(
+        self, country: str, zone: str, year: int | None = None, validators: dict[str, dict[str, str]] | None = None
+    ) -> list[SchoolHoliday]:
+        """Fetch holidays for Canada (the years are requested concurrently)."""
         now = dt_util.now()
         years = [year] if year else [now.year, now.year + 1, now.year + 2]
-        all_holidays = []
         tz = dt_util.get_time_zone(self.hass.config.time_zone)
 
-        for target_year in years:
-            url = f"https://canada-holidays.ca/api/v1/provinces/QC?year={target_year}"
-            try:
-                async with self.session.get(url) as resp:
-                    resp.raise_for_status()
-                    payload = await resp.json()
-                    province = payload.get("province", {})
-                    for h in province.get("holidays", []):
-                        name = h.get("nameFr") or h.get("nameEn")
-                        start_date = dt_util.parse_datetime(h.get("observedDate") or h.get("date"))
-                        if start_date:
-                            start = dt_util.as_local(
-                                datetime.combine(start_date.date(), datetime.min.time(), tzinfo=tz)
-                            )
-                            end = dt_util.as_local(datetime.combine(start_date.date(), datetime.max.time(), tzinfo=tz))
-                            all_holidays.append(SchoolHoliday(name, zone, start, end))
-            except Exception as err:
-                LOGGER.error("Error fetching from Canada provider for %s: %s", target_year, err)
+        async def fetch(target_year: int, conditional: bool) -> list[SchoolHoliday] | None:
+            return await self._async_year(zone, target_year, tz, validators, conditional)
 
+        all_holidays = await self._async_gather(years, fetch, bool(validators))
         return sorted(all_holidays, key=lambda h: h.start)
 
-
-STORAGE_VERSION = 1
+    async def _async_year(
+        self,
+        zone: str,
+        target_year: int,
+        tz: tzinfo | None,
+        validators: dict[str, dict[str, str]] | None,
+        conditional: bool,
+    ) -> list[SchoolHoliday] | None:
+        """Fetch the holidays of one calendar year, None when unchanged (errors are raised to _async_gather)."""
+        holidays: list[SchoolHoliday] = []
+        url = f"https://canada-holidays.ca/api/v1/provinces/QC?year={target_year}"
+        payload = await self._async_get_json(url, validators, conditional)
+        if payload is NOT_MODIFIED:
+            return None
+        province = payload.get("province", {})
+        for h in province.get("holidays", []):
+            name = h.get("nameFr") or h.get("nameEn")
+            start_date = dt_util.parse_datetime(h.get("observedDate") or h.get("date"))
+            if start_date:
+                start = dt_util.as_local(datetime.combine(start_date.date(), datetime.min.time(), tzinfo=tz))
+                end = dt_util.as_local(datetime.combine(start_date.date(), datetime.max.time(), tzinfo=tz))
+                holidays.append(SchoolHoliday(name, zone, start, end))
+        return holidays
+
+
+# v2 : tables de noms et de zones par clé, dates en microsecondes epoch (v1 : dict ISO par vacance)
+STORAGE_VERSION = 2
 STORAGE_KEY = "custody_schedule_holidays"
 
+# Cache servi sans attendre le réseau : rafraîchi en tâche de fond après le TTL souple (moins une
+# part aléatoire, pour étaler les requêtes des clés). Après le TTL dur, la lecture attend le
+# rafraîchissement ; l'entrée expirée n'est plus servie qu'en repli, si la requête échoue.
+# Les rafraîchissements sont conditionnels (304 sans corps) : quotidiens pour suivre les corrections
+SOFT_TTL = timedelta(days=1)
+HARD_TTL = timedelta(days=30)
+REFRESH_JITTER = timedelta(hours=6)
+# Rentrée scolaire (1er septembre) : les entrées sont rafraîchies pendant l'été, pour que le
+# calendrier de l'année suivante soit en cache avant la bascule
+ROLLOVER_PREFETCH = timedelta(days=60)
+# Clé sans résultat (vide ou en échec) : nouvelle tentative après un délai exponentiel
+NEGATIVE_BASE_DELAY = timedelta(minutes=15)
+NEGATIVE_MAX_DELAY = timedelta(hours=12)
+# Entrée du Store pour les disjoncteurs (sans "|" : ignorée comme clé de cache)
+BREAKERS_STORE_KEY = "breakers"
+# Écritures du Store regroupées : une seule pour les changements des SAVE_DELAY secondes suivantes
+SAVE_DELAY = 10
+
+
+def refresh_time(fetched: datetime, jitter: float) -> datetime:
+    """Return when an entry fetched at `fetched` should be refreshed in the background.
+
+    `jitter` in [0, 1) spreads the refreshes; an entry fetched before the summer window
+    is refreshed when the window opens, so the next school year is cached before the rollover.
+    """
+    due = fetched + SOFT_TTL - REFRESH_JITTER * jitter
+    rollover = fetched.replace(month=9, day=1, hour=0, minute=0, second=0, microsecond=0)
+    if rollover <= fetched:
+        rollover = rollover.replace(year=rollover.year + 1)
+    window = rollover - ROLLOVER_PREFETCH
+    if fetched < window:
+        due = min(due, window)
+    return due
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# Une ligne par vacance dans "rows" : index du nom, index de la zone, début, fin
+_ROW_SIZE = 4
+
+
+def encode_holidays(holidays: Iterable[SchoolHoliday]) -> dict[str, Any]:
+    """Return the stored (v2) form of a holiday list: name and zone tables and flat int rows."""
+    names: dict[str, int] = {}
+    zones: dict[str, int] = {}
+    rows: list[int] = []
+    for holiday in holidays:
+        rows += (
+            names.setdefault(holiday.name, len(names)),
+            zones.setdefault(holiday.zone, len(zones)),
+            (holiday.start - _EPOCH) // _MICROSECOND,
+            (holiday.end - _EPOCH) // _MICROSECOND,
+        )
+    return {"names": list(names), "zones": list(zones), "rows": rows}
+
+
+def decode_holidays(data: dict[str, Any]) -> list[SchoolHoliday]:
+    """Rebuild the holidays stored by encode_holidays (in the local time zone)."""
+    names, zones, rows = data["names"], data["zones"], data["rows"]
+    return [
+        SchoolHoliday(
+            names[rows[pos]],
+            zones[rows[pos + 1]],
+            dt_util.as_local(_EPOCH + timedelta(microseconds=rows[pos + 2])),
+            dt_util.as_local(_EPOCH + timedelta(microseconds=rows[pos + 3])),
+        )
+        for pos in range(0, len(rows) - _ROW_SIZE + 1, _ROW_SIZE)
+    ]
+
+
+def migrate_holiday_store(data: dict[str, Any]) -> dict[str, Any]:
+    """Convert the v1 layout (a dict of ISO strings per holiday, or a bare list) to v2."""
+    migrated: dict[str, Any] = {}
+    for key_str, entry in data.items():
+        if "|" not in key_str:
+            # Disjoncteurs inchangés ; les validateurs partagés par URL ne sont pas repris (ils sont par entrée)
+            if key_str == BREAKERS_STORE_KEY:
+                migrated[key_str] = entry
+            continue
+        # Support for both old format (list) and new format (dict with timestamp)
+        if isinstance(entry, list):
+            holidays_data, timestamp = entry, None
+        else:
+            holidays_data, timestamp = entry.get("holidays", []), entry.get("timestamp")
+        holidays = []
+        for h in holidays_data:
+            start_dt = _parse_local(h.get("start", ""))
+            end_dt = _parse_local(h.get("end", ""))
+            if start_dt and end_dt:
+                holidays.append(SchoolHoliday(h.get("name", "Vacances"), h.get("zone", ""), start_dt, end_dt))
+        if holidays:
+            fetched = _parse_local(timestamp or "")
+            # Without a timestamp, force refresh by simulating an old fetch (60 days ago)
+            migrated[key_str] = {
+                "timestamp": (fetched or dt_util.now() - timedelta(days=60)).isoformat(),
+                **encode_holidays(holidays),
+            }
+    return migrated
+
+
+def _parse_local(value: str) -> datetime | None:
+    """Parse a stored ISO datetime, naive values (older versions) being in the local time zone."""
+    parsed = dt_util.parse_datetime(value)
+    return dt_util.as_local(parsed) if parsed else None
+
+
+class _HolidayStore(Store):
+    """Store of the holiday cache, migrating the v1 layout once on load."""
+
+    async def _async_migrate_func(self, old_major_version: int, old_minor_version: int, old_data: dict) -> dict:
+        if old_major_version == 1:
+            return migrate_holiday_store(old_data)
+        return old_data
+
 
 class SchoolHolidayClient:
     """Client that delegates to specific country providers."""
@@ -243,91 +611,220 @@ class SchoolHolidayClient:
     def __init__(self, hass: HomeAssistant, api_url: str | None = None) -> None:
         self._hass = hass
         self._session = aiohttp_client.async_get_clientsession(hass)
-        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._store: Store = _HolidayStore(hass, STORAGE_VERSION, STORAGE_KEY)
         self._cache_loaded = False
         self._cache: dict[tuple[str, str, str, int | None], dict[str, Any]] = {}
-        self._france_provider = FranceEducationProvider(hass, self._session)
-        self._open_provider = OpenHolidaysProvider(hass, self._session)
-        self._canada_provider = CanadaHolidayProvider(hass, self._session)
+        # Incrémenté à chaque nouvelle liste en cache (0 : aucune donnée)
+        self._version = 0
+        # Client partagé entre entrées : une seule requête en cours par clé, attendue par tous les appelants
+        self._inflight: dict[tuple[str, str, str, int | None], asyncio.Future[HolidaySnapshot]] = {}
+        self._load_lock = asyncio.Lock()
+        # Jeu de données embarqué (hors ligne) : dernier recours sous le cache, chargé avec lui
+        self._dataset: HolidayDataset | None = None
+        self._offline: dict[tuple[tuple[str, str, str, int | None], int], HolidaySnapshot] = {}
+        # Clés sans résultat : (échecs consécutifs, prochaine tentative)
+        self._failures: dict[tuple[str, str, str, int | None], tuple[int, datetime]] = {}
+        self._breakers = {
+            provider.HOST: CircuitBreaker(provider.HOST)
+            for provider in (FranceEducationProvider, OpenHolidaysProvider, CanadaHolidayProvider)
+        }
+        self._france_provider = FranceEducationProvider(
+            hass, self._session, self._breakers[FranceEducationProvider.HOST]
+        )
+        self._open_provider = OpenHolidaysProvider(hass, self._session, self._breakers[OpenHolidaysProvider.HOST])
+        self._canada_provider = CanadaHolidayProvider(hass, self._session, self._breakers[CanadaHolidayProvider.HOST])
 
     async def _async_load_cache(self) -> None:
         if self._cache_loaded:
             return
+        async with self._load_lock:
+            if not self._cache_loaded:
+                await self._async_read_store()
+
+    async def _async_read_store(self) -> None:
+        self._dataset = await self._hass.async_add_executor_job(HolidayDataset.open)
         try:
             data = await self._store.async_load()
             if data:
+                for host, state in (data.get(BREAKERS_STORE_KEY) or {}).items():
+                    if host in self._breakers:
+                        self._breakers[host].restore(state)
                 for key_str, entry in data.items():
                     parts = key_str.split("|")
-                    if len(parts) >= 3:
+                    if len(parts) >= 3 and isinstance(entry, dict) and entry.get("rows"):
                         country, zone, year_str = parts[0], parts[1], parts[2]
                         year = int(year_str) if year_str != "None" else None
                         key = (country, zone, str(year), year)
-
-                        # Support for both old format (list) and new format (dict with timestamp)
-                        if isinstance(entry, list):
-                            holidays_data = entry
-                            # Force refresh by simulating an old fetch (60 days ago)
-                            timestamp = (dt_util.now() - timedelta(days=60)).isoformat()
-                        else:
-                            holidays_data = entry.get("holidays", [])
-                            timestamp = entry.get("timestamp", (dt_util.now() - timedelta(days=60)).isoformat())
-
-                        holidays = []
-                        for h in holidays_data:
-                            start_dt = dt_util.parse_datetime(h.get("start", ""))
-                            end_dt = dt_util.parse_datetime(h.get("end", ""))
-                            if start_dt and end_dt:
-                                holidays.append(
-                                    SchoolHoliday(
-                                        name=h.get("name", "Vacances"),
-                                        zone=h.get("zone", ""),
-                                        start=start_dt,
-                                        end=end_dt,
-                                    )
-                                )
-                        if holidays:
-                            self._cache[key] = {"timestamp": timestamp, "holidays": holidays}
+                        # Décodé au premier accès à la clé (_entry_snapshot)
+                        encoded = {"names": entry["names"], "zones": entry["zones"], "rows": entry["rows"]}
+                        self._cache[key] = self._new_entry(
+                            entry["timestamp"], None, encoded, entry.get("validators") or {}
+                        )
         except Exception as err:
             LOGGER.warning("Error loading holiday cache: %s", err)
 
         self._cache_loaded = True
 
-    async def _async_save_cache(self) -> None:
-        try:
-            data = {}
-            for key, cache_entry in self._cache.items():
-                key_str = f"{key[0]}|{key[1]}|{key[2]}"
-                data[key_str] = {
-                    "timestamp": cache_entry["timestamp"],
-                    "holidays": [
-                        {
-                            "name": h.name,
-                            "zone": h.zone,
-                            "start": h.start.isoformat(),
-                            "end": h.end.isoformat(),
-                        }
-                        for h in cache_entry["holidays"]
-                    ],
-                }
-            await self._store.async_save(data)
-        except Exception as err:
-            LOGGER.warning("Error saving holiday cache: %s", err)
+    def _set_cache_entry(
+        self,
+        key: tuple[str, str, str, int | None],
+        timestamp: str,
+        holidays: list,
+        validators: dict[str, dict[str, str]] | None = None,
+    ) -> None:
+        """Store a holiday list, keeping the current snapshot (and version) when it is unchanged.
+
+        `validators` are those of the fetch that gave the list (the previous ones are kept without them).
+        """
+        previous = self._cache.get(key)
+        if validators is None:
+            validators = previous["validators"] if previous else {}
+        snapshot = self._entry_snapshot(previous) if previous else None
+        encoded = previous["encoded"] if previous else None
+        if snapshot is None or list(snapshot.holidays) != holidays:
+            self._version += 1
+            snapshot = HolidaySnapshot(tuple(holidays), self._version)
+            encoded = None
+        self._cache[key] = self._new_entry(timestamp, snapshot, encoded, validators)
+
+    @staticmethod
+    def _new_entry(
+        timestamp: str,
+        snapshot: HolidaySnapshot | None,
+        encoded: dict[str, Any] | None,
+        validators: dict[str, dict[str, str]],
+    ) -> dict[str, Any]:
+        fetched = dt_util.parse_datetime(timestamp) or dt_util.now() - HARD_TTL
+        return {
+            "timestamp": timestamp,
+            # None until the stored form is decoded (first access to the key)
+            "snapshot": snapshot,
+            "refresh_at": refresh_time(fetched, random.random()),
+            "expires_at": fetched + HARD_TTL,
+            # Forme stockée de la liste, encodée au premier enregistrement puis réutilisée tant qu'elle ne change pas
+            "encoded": encoded,
+            # Validateurs HTTP des réponses qui ont donné cette liste : un 304 ne vaut que pour elle
+            "validators": validators,
+        }
+
+    def _entry_snapshot(self, entry: dict[str, Any]) -> HolidaySnapshot:
+        """Return the snapshot of a cache entry, decoding its stored form on first access."""
+        snapshot = entry["snapshot"]
+        if snapshot is None:
+            self._version += 1
+            snapshot = entry["snapshot"] = HolidaySnapshot(tuple(decode_holidays(entry["encoded"])), self._version)
+        return snapshot
+
+    def _schedule_save(self) -> None:
+        """Write the cache after SAVE_DELAY; the changes made meanwhile share the same write."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for key, cache_entry in self._cache.items():
+            if cache_entry["encoded"] is None:
+                cache_entry["encoded"] = encode_holidays(cache_entry["snapshot"].holidays)
+            stored = {"timestamp": cache_entry["timestamp"], **cache_entry["encoded"]}
+            if cache_entry["validators"]:
+                stored["validators"] = cache_entry["validators"]
+            data[f"{key[0]}|{key[1]}|{key[2]}"] = stored
+        data[BREAKERS_STORE_KEY] = self._breaker_states()
+        return data
 
     async def async_list(self, country: str, zone: str, year: int | None = None) -> list[SchoolHoliday]:
         """Return holidays using the appropriate provider."""
+        return list((await self.async_snapshot(country, zone, year)).holidays)
+
+    async def async_snapshot(self, country: str, zone: str, year: int | None = None) -> HolidaySnapshot:
+        """Return the holiday snapshot of (country, zone), without waiting on the network when cached.
+
+        Stale-while-revalidate: a cached entry is returned at once, and a refresh is started
+        in the background when it is due. A key without any cached data, or whose entry is past
+        the hard TTL, awaits the fetch (the expired entry is only served when that fetch fails).
+        Concurrent callers for the same key share a single fetch: the first one starts it,
+        the others await the same task. A cancelled caller does not cancel it for the others.
+        """
         await self._async_load_cache()
 
         cache_key = (country, zone, str(year), year)
         now = dt_util.now()
-
-        # Try to use fresh cache (< 30 days old)
-        if cache_key in self._cache:
-            cache_entry = self._cache[cache_key]
-            # Parse timestamp safely
-            cache_time = dt_util.parse_datetime(cache_entry["timestamp"])
-            if cache_time and (now - cache_time).days < 30:
-                return cache_entry["holidays"]
-
+        failure = self._failures.get(cache_key)
+        # Négatif en cache : pas de requête avant la prochaine tentative
+        backing_off = failure is not None and now < failure[1]
+        cache_entry = self._cache.get(cache_key)
+        if cache_entry is not None:
+            if now < cache_entry["refresh_at"] or backing_off:
+                return self._entry_snapshot(cache_entry)
+            if now < cache_entry["expires_at"]:
+                self._async_start_fetch(cache_key, country, zone, year, background=True)
+                return self._entry_snapshot(cache_entry)
+            LOGGER.debug("Holidays for %s %s expired, refreshing them before use", country, zone)
+            return await asyncio.shield(self._async_start_fetch(cache_key, country, zone, year))
+        offline = self._offline_snapshot(cache_key, country, zone, year)
+        if backing_off:
+            return offline or EMPTY_SNAPSHOT
+        if offline is not None:
+            # Servi depuis le jeu embarqué pendant la première requête
+            self._async_start_fetch(cache_key, country, zone, year, background=True)
+            return offline
+
+        return await asyncio.shield(self._async_start_fetch(cache_key, country, zone, year))
+
+    def _offline_snapshot(
+        self, cache_key: tuple[str, str, str, int | None], country: str, zone: str, year: int | None
+    ) -> HolidaySnapshot | None:
+        """Return the bundled holidays of a key (same years as the providers), None when it has none."""
+        if self._dataset is None:
+            return None
+        now = dt_util.now()
+        first = school_year_of(now) if year is None else year - 1
+        snapshot = self._offline.get((cache_key, first))
+        if snapshot is None:
+            holidays = [
+                SchoolHoliday(name, zone, dt_util.as_local(start), dt_util.as_local(end))
+                for school_year in range(first, first + (3 if year is None else 2))
+                for name, start, end in self._dataset.holidays(country, zone, school_year)
+                if year is None or start.year <= year <= end.year
+            ]
+            if holidays:
+                self._version += 1
+                snapshot = HolidaySnapshot(tuple(holidays), self._version)
+            else:
+                snapshot = EMPTY_SNAPSHOT
+            self._offline[(cache_key, first)] = snapshot
+        return snapshot if len(snapshot) else None
+
+    def _async_start_fetch(
+        self,
+        cache_key: tuple[str, str, str, int | None],
+        country: str,
+        zone: str,
+        year: int | None,
+        background: bool = False,
+    ) -> asyncio.Future[HolidaySnapshot]:
+        """Return the in-flight fetch of a key, starting it if there is none (background: nobody awaits it)."""
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = self._hass.async_create_task(self._async_fetch(cache_key, country, zone, year))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda done: self._fetch_done(cache_key, done, background))
+        return task
+
+    def _fetch_done(
+        self, cache_key: tuple[str, str, str, int | None], task: asyncio.Future[HolidaySnapshot], background: bool
+    ) -> None:
+        """Forget a finished fetch (success, error or cancellation) so the next stale read starts a new one."""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # Une requête attendue remonte son erreur à l'appelant : seule une mise à jour en arrière-plan la journalise
+        if background and not task.cancelled() and task.exception() is not None:
+            LOGGER.warning("Holiday refresh failed for %s %s: %s", cache_key[0], cache_key[1], task.exception())
+
+    async def _async_fetch(
+        self, cache_key: tuple[str, str, str, int | None], country: str, zone: str, year: int | None
+    ) -> HolidaySnapshot:
+        """Fetch the holidays of one key from its provider and update the cache."""
+        now = dt_util.now()
         if country == "FR":
             provider = self._france_provider
         elif country in ["BE", "CH", "LU"]:
@@ -337,20 +834,39 @@ class SchoolHolidayClient:
         else:
             provider = self._france_provider
 
+        breakers = self._breaker_states()
+        retry_at = None
+        cached = self._cache.get(cache_key)
+        # Validateurs de cette entrée seulement (copie : gardés tels quels si la requête échoue)
+        validators = dict(cached["validators"]) if cached else {}
         try:
-            holidays = await provider.get_holidays(country, zone, year)
+            # With a cached list, unchanged payloads (304) only extend its TTL
+            holidays = await provider.get_holidays(country, zone, year, validators)
+        except HolidaysNotModified:
+            LOGGER.debug("Holidays for %s %s not modified", country, zone)
+            self._failures.pop(cache_key, None)
+            self._set_cache_entry(cache_key, now.isoformat(), list(self._entry_snapshot(cached).holidays), validators)
+            self._schedule_save()
+            return self._cache[cache_key]["snapshot"]
+        except HolidayProviderUnavailable as err:
+            LOGGER.debug("Holiday request for %s %s skipped: %s", country, zone, err)
+            holidays = []
+            retry_at = err.retry_at
         except Exception as err:
             LOGGER.error("Holiday provider error for %s %s: %s", country, zone, err)
             holidays = []
 
         if not holidays:
+            self._record_failure(cache_key, now, retry_at)
+            if self._breaker_states() != breakers:
+                self._schedule_save()
             # Fallback to expired cache if available ("anti-flood" / "fallback" mode)
             if cache_key in self._cache:
                 LOGGER.warning(
                     "Using expired fallback cache for %s %s due to API failure or empty response", country, zone
                 )
-                return self._cache[cache_key]["holidays"]
-            return []
+                return self._entry_snapshot(self._cache[cache_key])
+            return self._offline_snapshot(cache_key, country, zone, year) or EMPTY_SNAPSHOT
 
         # 1. Deduplicate by name and exact dates
         seen = set()
@@ -379,9 +895,56 @@ class SchoolHolidayClient:
                     current = next_h
             unique_holidays.append(current)
 
-        self._cache[cache_key] = {"timestamp": now.isoformat(), "holidays": unique_holidays}
-        self._hass.async_create_task(self._async_save_cache())
-        return unique_holidays
+        self._failures.pop(cache_key, None)
+        self._set_cache_entry(cache_key, now.isoformat(), unique_holidays, validators)
+        self._schedule_save()
+        return self._cache[cache_key]["snapshot"]
+
+    def _record_failure(
+        self, cache_key: tuple[str, str, str, int | None], now: datetime, retry_at: datetime | None
+    ) -> None:
+        """Cache a fetch without result: the key is not requested again before an exponential delay."""
+        failures = self._failures.get(cache_key, (0, now))[0] + 1
+        next_attempt = now + backoff(failures, NEGATIVE_BASE_DELAY, NEGATIVE_MAX_DELAY)
+        if retry_at is not None:
+            next_attempt = max(next_attempt, retry_at)
+        self._failures[cache_key] = (failures, next_attempt)
+        LOGGER.debug("No holidays for %s %s (%d in a row), next attempt at %s", *cache_key[:2], failures, next_attempt)
+
+    def _breaker_states(self) -> dict[str, dict[str, Any]]:
+        return {host: breaker.as_dict() for host, breaker in self._breakers.items()}
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the cache, negative cache and circuit breaker states (for the config entry diagnostics)."""
+        now = dt_util.now()
+        return {
+            "version": self._version,
+            "breakers": self._breaker_states(),
+            "validators": sum(len(entry["validators"]) for entry in self._cache.values()),
+            "dataset": self._dataset.revision if self._dataset is not None else None,
+            "entries": [
+                {
+                    "key": f"{key[0]}|{key[1]}|{key[2]}",
+                    "holidays": (
+                        len(entry["snapshot"])
+                        if entry["snapshot"] is not None
+                        else len(entry["encoded"]["rows"]) // _ROW_SIZE
+                    ),
+                    "decoded": entry["snapshot"] is not None,
+                    "fetched": entry["timestamp"],
+                    "refresh_at": entry["refresh_at"].isoformat(),
+                    "expires_at": entry["expires_at"].isoformat(),
+                    # Servie en repli seulement (le dernier rafraîchissement a échoué)
+                    "expired": now >= entry["expires_at"],
+                }
+                for key, entry in self._cache.items()
+            ],
+            "failures": [
+                {"key": f"{key[0]}|{key[1]}|{key[2]}", "failures": count, "retry_at": retry_at.isoformat()}
+                for key, (count, retry_at) in self._failures.items()
+            ],
+            "inflight": [f"{key[0]}|{key[1]}|{key[2]}" for key in self._inflight],
+        }
 
     async def async_test_connection(self, country: str, zone: str, year: int | None = None) -> dict[str, Any]:
         """Test API connection."""
@@ -400,4 +963,5 @@ class SchoolHolidayClient:
     def clear(self) -> None:
         """Clear cache."""
         self._cache.clear()
-        self._hass.async_create_task(self._async_save_cache())
+        self._failures.clear()
+        self._schedule_save()
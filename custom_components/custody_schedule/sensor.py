@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTime
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 from homeassistant.util import slugify
@@ -32,6 +33,7 @@ from .const import (
     CONF_CHILD_NAME,
     CONF_CHILD_NAME_DISPLAY,
     CONF_PHOTO,
+    COUNTDOWN_INTERVAL,
     DOMAIN,
 )
 from .schedule import CustodyComputation
@@ -72,6 +74,9 @@ SENSORS: tuple[SensorDefinition, ...] = (
     SensorDefinition("parent_in_charge", "mdi:account-child-circle"),
 )
 
+# Décomptes recalculés à la lecture : le coordinateur ne se réveille qu'aux transitions
+COUNTDOWN_SENSORS = {"days_remaining", "days_until_vacation"}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Set up Custody Schedule sensors."""
@@ -126,6 +131,18 @@ class CustodyScheduleSensor(CoordinatorEntity[CustodyComputation], SensorEntity)
         if photo:
             self._attr_entity_picture = photo
 
+    async def async_added_to_hass(self) -> None:
+        """Write the countdown sensors on a short interval between coordinator updates."""
+        await super().async_added_to_hass()
+        if self._definition.key in COUNTDOWN_SENSORS:
+            self.async_on_remove(async_track_time_interval(self.hass, self._async_countdown_tick, COUNTDOWN_INTERVAL))
+
+    @callback
+    def _async_countdown_tick(self, now: datetime) -> None:
+        """Publish the countdown against the current time (no schedule recomputation)."""
+        if self.coordinator.data:
+            self.async_write_ha_state()
+
     @property
     def native_value(self) -> Any:
         """Return the sensor state."""
@@ -139,7 +156,7 @@ class CustodyScheduleSensor(CoordinatorEntity[CustodyComputation], SensorEntity)
         if key == "next_departure":
             return dt_util.as_local(data.next_departure) if data.next_departure else None
         if key == "days_remaining":
-            return data.days_remaining
+            return data.days_remaining_at(dt_util.now())
         if key == "current_period":
             if data.current_period == "vacation" and data.vacation_name:
                 return data.vacation_name
@@ -149,7 +166,7 @@ class CustodyScheduleSensor(CoordinatorEntity[CustodyComputation], SensorEntity)
         if key == "next_vacation_start":
             return dt_util.as_local(data.next_vacation_start) if data.next_vacation_start else None
         if key == "days_until_vacation":
-            return data.days_until_vacation
+            return data.days_until_vacation_at(dt_util.now())
         if key == "next_change":
             if not data.next_arrival and not data.next_departure:
                 return None
@@ -221,11 +238,11 @@ class CustodyScheduleSensor(CoordinatorEntity[CustodyComputation], SensorEntity)
             "next_arrival_label": data.next_arrival_label,
             ATTR_NEXT_DEPARTURE: dt_util.as_local(data.next_departure) if data.next_departure else None,
             "next_departure_label": data.next_departure_label,
-            ATTR_DAYS_REMAINING: data.days_remaining,
+            ATTR_DAYS_REMAINING: data.days_remaining_at(dt_util.now()),
             ATTR_NEXT_VACATION_NAME: data.next_vacation_name,
             ATTR_NEXT_VACATION_START: dt_util.as_local(data.next_vacation_start) if data.next_vacation_start else None,
             ATTR_NEXT_VACATION_END: dt_util.as_local(data.next_vacation_end) if data.next_vacation_end else None,
-            ATTR_DAYS_UNTIL_VACATION: data.days_until_vacation,
+            ATTR_DAYS_UNTIL_VACATION: data.days_until_vacation_at(dt_util.now()),
             ATTR_SCHOOL_HOLIDAYS_RAW: data.school_holidays_raw,
         }
         attrs.update(data.attributes)
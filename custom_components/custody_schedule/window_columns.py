@@ -0,0 +1,126 @@
+"""Columnar storage for custody windows without Home Assistant imports (testable in isolation)."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, tzinfo
+from typing import Any, Iterable, Iterator
+
+# Small-int source enum (index = stored code); unknown sources are appended per instance
+SOURCES = ("pattern", "vacation", "vacation_filter", "summer", "custom", "manual", "exception_recurring", "special")
+
+Row = tuple[datetime, datetime, str, str]
+
+
+class WindowColumns:
+    """Immutable windows stored as parallel arrays, ordered by start.
+
+    Starts and ends are int64 epoch seconds, sources a small-int enum and labels
+    indexes in an interned label table: a window costs a few bytes instead of a
+    dataclass, two aware datetimes and a label string. Datetimes are only rebuilt
+    (in `tz`) when rows are read.
+    """
+
+    __slots__ = ("_tz", "_starts", "_ends", "_max_ends", "_sources", "_source_table", "_labels", "_label_table")
+
+    def __init__(
+        self,
+        tz: tzinfo,
+        starts: Iterable[int] = (),
+        ends: Iterable[int] = (),
+        sources: Iterable[int] = (),
+        source_table: Iterable[str] = SOURCES,
+        labels: Iterable[int] = (),
+        label_table: Iterable[str] = (),
+    ) -> None:
+        self._tz = tz
+        self._starts = array("q", starts)
+        self._ends = array("q", ends)
+        self._sources = array("B", sources)
+        self._source_table = tuple(source_table)
+        self._labels = array("H", labels)
+        self._label_table = tuple(label_table)
+        if not len(self._starts) == len(self._ends) == len(self._sources) == len(self._labels):
+            raise ValueError("Window columns must have the same length")
+        # Running maximum of the ends (see IntervalIndex): "touching [start, end]" is a bisect
+        self._max_ends = array("q")
+        running = None
+        for value in self._ends:
+            if running is None or value > running:
+                running = value
+            self._max_ends.append(running)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Row], tz: tzinfo) -> WindowColumns:
+        """Build the columns from (start, end, label, source) rows (stable sort by start)."""
+        source_table = list(SOURCES)
+        source_codes = {name: code for code, name in enumerate(source_table)}
+        label_table: list[str] = []
+        label_codes: dict[str, int] = {}
+        starts, ends, sources, labels = [], [], [], []
+        for start, end, label, source in sorted(rows, key=lambda row: row[0]):
+            starts.append(int(start.timestamp()))
+            ends.append(int(end.timestamp()))
+            if source not in source_codes:
+                source_codes[source] = len(source_table)
+                source_table.append(source)
+            sources.append(source_codes[source])
+            if label not in label_codes:
+                label_codes[label] = len(label_table)
+                label_table.append(label)
+            labels.append(label_codes[label])
+        return cls(tz, starts, ends, sources, source_table, labels, label_table)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], tz: tzinfo) -> WindowColumns:
+        """Rebuild the columns saved by to_dict."""
+        return cls(
+            tz,
+            data["starts"],
+            data["ends"],
+            data["sources"],
+            data.get("source_table", SOURCES),
+            data["labels"],
+            data["label_table"],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable form (plain lists of ints and the two tables)."""
+        return {
+            "starts": self._starts.tolist(),
+            "ends": self._ends.tolist(),
+            "sources": self._sources.tolist(),
+            "source_table": list(self._source_table),
+            "labels": self._labels.tolist(),
+            "label_table": list(self._label_table),
+        }
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Row]:
+        return self.rows()
+
+    def rows(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[Row]:
+        """Yield (start, end, label, source) rows touching [start, end] (bounds inclusive), ordered by start."""
+        lower = 0 if start is None else bisect_left(self._max_ends, int(start.timestamp()))
+        upper = len(self._starts) if end is None else bisect_right(self._starts, int(end.timestamp()))
+        start_ts = None if start is None else start.timestamp()
+        for pos in range(lower, upper):
+            if start_ts is None or self._ends[pos] >= start_ts:
+                yield self._row(pos)
+
+    def spans(self) -> Iterator[tuple[int, int, str]]:
+        """Yield (start, end, source) with epoch seconds, ordered by start (no datetime built)."""
+        source_table = self._source_table
+        for start, end, source in zip(self._starts, self._ends, self._sources):
+            yield start, end, source_table[source]
+
+    def _row(self, pos: int) -> Row:
+        return (
+            datetime.fromtimestamp(self._starts[pos], self._tz),
+            datetime.fromtimestamp(self._ends[pos], self._tz),
+            self._label_table[self._labels[pos]],
+            self._source_table[self._sources[pos]],
+        )
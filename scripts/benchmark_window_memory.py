@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Compare the resident memory of custody windows as dataclasses and as columns (tracemalloc).
+
+Usage: python scripts/benchmark_window_memory.py [entries] [years]
+Home Assistant is not needed: the engine modules are loaded without the integration's __init__.
+"""
+
+from __future__ import annotations
+
+import gc
+import importlib
+import sys
+import tracemalloc
+import types
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "custody_schedule"
+_package = types.ModuleType("custody_schedule")
+_package.__path__ = [str(PACKAGE_DIR)]
+sys.modules["custody_schedule"] = _package
+
+engine = importlib.import_module("custody_schedule.engine")
+schedule_plan = importlib.import_module("custody_schedule.schedule_plan")
+CustodyWindow = engine.CustodyWindow
+WindowColumns = importlib.import_module("custody_schedule.window_columns").WindowColumns
+
+CUSTODY_TYPES = ("alternate_week", "alternate_weekend", "two_two_three", "two_two_five_five")
+
+
+def generate(entries: int, years: int) -> list[list[CustodyWindow]]:
+    """Generate `years` years of windows for `entries` children, like the calendar tiles hold."""
+    tz = ZoneInfo("Europe/Paris")
+    now = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+    per_entry = []
+    for index in range(entries):
+        config = {
+            "custody_type": CUSTODY_TYPES[index % len(CUSTODY_TYPES)],
+            "exceptions_recurring": [{"weekday": 2, "start_time": "12:00", "end_time": "18:00"}],
+        }
+        schedule = engine.ScheduleEngine(schedule_plan.compile_plan(config), tz)
+        start = now - timedelta(days=365 * (years - 1))
+        windows, _ = schedule.collect_windows(now, start, now + timedelta(days=365), None)
+        per_entry.append(windows)
+    return per_entry
+
+
+def measure(build) -> tuple[int, object]:
+    """Return the bytes still allocated by build() (and its result, kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return size, result
+
+
+def main() -> None:
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    windows = generate(entries, years)
+    count = sum(len(entry) for entry in windows)
+    rows = [[(w.start, w.end, w.label, w.source) for w in entry] for entry in windows]
+    tz = windows[0][0].start.tzinfo
+
+    # Fresh copies so that both layouts pay for their own objects (labels rebuilt like the generators do)
+    as_objects, _ = measure(
+        lambda: [
+            [
+                CustodyWindow(start + timedelta(0), end + timedelta(0), "".join(label), source)
+                for start, end, label, source in entry
+            ]
+            for entry in rows
+        ]
+    )
+    as_columns, _ = measure(lambda: [WindowColumns.from_rows(entry, tz) for entry in rows])
+
+    print(f"{entries} entries x {years} years: {count} windows")
+    print(f"  CustodyWindow list : {as_objects / 1024:8.1f} KiB ({as_objects / count:.0f} B/window)")
+    print(f"  WindowColumns      : {as_columns / 1024:8.1f} KiB ({as_columns / count:.0f} B/window)")
+    print(f"  ratio              : {as_objects / max(as_columns, 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Regenerate the bundled offline school holiday dataset from local copies of the provider exports.
+
+Usage: python scripts/build_holiday_dataset.py <exports dir> [output] [revision]
+
+The exports are the raw JSON answers (or dataset exports) of the providers, one
+directory per country and zone: <exports>/<country>/<zone>/*.json, for example
+FR/A/2025-2026.json (data.education.gouv.fr), BE/fr/2026.json (openholidaysapi.org)
+or CA_QC/QC/2026.json (canada-holidays.ca). The daily calendar of metropolitan France
+shipped by the vacances-scolaires-france package (data/data.csv, built from the
+data.education.gouv.fr dataset) is read as well when copied as FR/<zone>/*.csv.
+The output defaults to the file read by the integration. The revision defaults to the
+date ordinal of the last holiday end in the exports, so the same exports always give
+the same file. Home Assistant is not needed.
+"""
+
+from __future__ import annotations
+
+import csv
+import importlib
+import io
+import json
+import sys
+import types
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Iterator
+from zoneinfo import ZoneInfo
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "custody_schedule"
+_package = types.ModuleType("custody_schedule")
+_package.__path__ = [str(PACKAGE_DIR)]
+sys.modules["custody_schedule"] = _package
+
+holiday_dataset = importlib.import_module("custody_schedule.holiday_dataset")
+
+# Fuseau des dates sans heure (OpenHolidays, Canada) ; les dates françaises portent leur décalage
+TIME_ZONES = {
+    "FR": "Europe/Paris",
+    "BE": "Europe/Brussels",
+    "CH": "Europe/Zurich",
+    "LU": "Europe/Luxembourg",
+    "CA_QC": "America/Toronto",
+}
+
+
+def france_holidays(payload: Any, zone: str, tz: ZoneInfo) -> Iterator[tuple[str, datetime, datetime]]:
+    """Read a data.education.gouv.fr answer ({"records": [...]}) or export (list of records)."""
+    records = payload.get("records", []) if isinstance(payload, dict) else payload
+    for record in records:
+        fields = record.get("fields", record)
+        zones = str(fields.get("zones") or fields.get("zone") or "")
+        if zones and zone not in zones.split(",") and f"Zone {zone}" not in zones.split(","):
+            continue
+        start = fields.get("start_date") or fields.get("date_debut")
+        end = fields.get("end_date") or fields.get("date_fin")
+        if start and end:
+            name = fields.get("description") or fields.get("libelle") or "Vacances scolaires"
+            yield name, _parse(start, tz), _parse(end, tz)
+
+
+def open_holidays(payload: Any, zone: str, tz: ZoneInfo) -> Iterator[tuple[str, datetime, datetime]]:
+    """Read an openholidaysapi.org SchoolHolidays answer (whole days)."""
+    for item in payload:
+        names = item.get("name", [])
+        name = next((n.get("text") for n in names if n.get("language") == "fr"), None)
+        name = name or next((n.get("text") for n in names), "Vacances")
+        yield name, *_whole_days(item["startDate"], item["endDate"], tz)
+
+
+def canada_holidays(payload: Any, zone: str, tz: ZoneInfo) -> Iterator[tuple[str, datetime, datetime]]:
+    """Read a canada-holidays.ca province answer (one day per holiday)."""
+    for holiday in payload.get("province", {}).get("holidays", []):
+        day = holiday.get("observedDate") or holiday.get("date")
+        if day:
+            yield holiday.get("nameFr") or holiday.get("nameEn"), *_whole_days(day, day, tz)
+
+
+def france_daily(text: str, zone: str, tz: ZoneInfo) -> Iterator[tuple[str, datetime, datetime]]:
+    """Read the vacances-scolaires-france daily calendar (date, vacances_zone_a/b/c, nom_vacances)."""
+    column = f"vacances_zone_{zone.lower()}"
+    run: tuple[str, date] | None = None
+    for row in csv.DictReader(io.StringIO(text)):
+        day = date.fromisoformat(row["date"])
+        name = row["nom_vacances"] if row.get(column) == "True" else None
+        if run is not None and name != run[0]:
+            # Même découpage que l'API : du premier jour à 0 h au jour de reprise à 0 h
+            yield FRANCE_NAMES.get(run[0], run[0]), _midnight(run[1], tz), _midnight(day, tz)
+            run = None
+        if name and run is None:
+            run = (name, day)
+    # Une période encore ouverte au dernier jour du fichier n'a pas de fin connue : ignorée
+
+
+# Libellés du jeu data.education.gouv.fr (le calendrier journalier les écrit en minuscules)
+FRANCE_NAMES = {
+    "Vacances d'hiver": "Vacances d'Hiver",
+    "Vacances de printemps": "Vacances de Printemps",
+    "Vacances d'été": "Vacances d'Été",
+}
+
+READERS = {
+    "FR": france_holidays,
+    "BE": open_holidays,
+    "CH": open_holidays,
+    "LU": open_holidays,
+    "CA_QC": canada_holidays,
+}
+
+
+def _parse(value: str, tz: ZoneInfo) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+
+def _midnight(day: date, tz: ZoneInfo) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=tz)
+
+
+def _whole_days(first: str, last: str, tz: ZoneInfo) -> tuple[datetime, datetime]:
+    start = _midnight(date.fromisoformat(first[:10]), tz)
+    return start, datetime.combine(date.fromisoformat(last[:10]), time(23, 59, 59), tzinfo=tz)
+
+
+def _read_export(path: Path, country: str, zone: str) -> Iterator[tuple[str, datetime, datetime]] | None:
+    """Return the holidays of one export file, None when its country or format is unknown."""
+    if country not in READERS:
+        return None
+    tz = ZoneInfo(TIME_ZONES[country])
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        return READERS[country](json.loads(text), zone, tz)
+    if path.suffix == ".csv" and country == "FR":
+        return france_daily(text, zone, tz)
+    return None
+
+
+def read_exports(exports: Path) -> tuple[list[Any], int]:
+    """Return the dataset records of every export and the revision (date of the last holiday end).
+
+    The revision only depends on the contents: file dates change with a checkout or a copy.
+    """
+    records = []
+    revision = 0
+    for path in sorted(exports.glob("*/*/*")):
+        country, zone = path.parent.parent.name, path.parent.name
+        holidays = _read_export(path, country, zone)
+        if holidays is None:
+            print(f"Skipping {path}: unknown country {country} or format")
+            continue
+        tz = ZoneInfo(TIME_ZONES[country])
+        for name, start, end in holidays:
+            school_year = holiday_dataset.school_year_of(start.astimezone(tz))
+            records.append((country, zone, school_year, name, start, end))
+            revision = max(revision, end.astimezone(tz).date().toordinal())
+    return records, revision
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    exports = Path(sys.argv[1])
+    output = Path(sys.argv[2]) if len(sys.argv) > 2 else holiday_dataset.DATASET_PATH
+    records, revision = read_exports(exports)
+    if len(sys.argv) > 3:
+        revision = int(sys.argv[3])
+    data = holiday_dataset.build_dataset(records, revision)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(data)
+
+    dataset = holiday_dataset.HolidayDataset(data)
+    print(f"{output}: {len(records)} holidays, {len(dataset)} school years, {len(data)} bytes, revision {revision}")
+
+
+if __name__ == "__main__":
+    main()
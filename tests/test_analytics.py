@@ -0,0 +1,110 @@
+"""Tests for the custody share analytics (interval arithmetic)."""
+
+import asyncio
+import random
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+from custom_components.custody_schedule.analytics import CustodyIntervals, count_weekday, custody_share, month_ranges
+from custom_components.custody_schedule.local_time import LocalDayTable
+from custom_components.custody_schedule.ownership_grid import OwnershipGrid
+from custom_components.custody_schedule.schedule import CustodyScheduleManager
+from custom_components.custody_schedule.school_holidays import EMPTY_SNAPSHOT
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+class NoHolidays:
+    async def async_snapshot(self, country, zone):
+        return EMPTY_SNAPSHOT
+
+
+async def run_job(func, *args):
+    return func(*args)
+
+
+def _epoch(day: date, hour: int, minute: int = 0) -> int:
+    return int(datetime.combine(day, time(hour, minute), tzinfo=PARIS).timestamp())
+
+
+def test_intervals_are_merged_and_overrides_applied():
+    intervals = CustodyIntervals([(50, 60), (0, 10), (5, 20), (20, 30), (40, 40)])
+    assert list(intervals) == [(0, 30), (50, 60)]
+    assert list(intervals.with_interval(25, 55, present=False)) == [(0, 25), (55, 60)]
+    assert list(intervals.with_interval(30, 50, present=True)) == [(0, 60)]
+    assert intervals.touching(10, 50) == [(0, 30), (50, 60)]
+    assert intervals.touching(30, 49) == []
+
+
+def test_share_of_a_week():
+    table = LocalDayTable(PARIS)
+    monday = date(2025, 3, 24)
+    # Friday 18:00 -> Monday 08:00 across the spring DST change, the week ends on Sunday
+    intervals = CustodyIntervals([(_epoch(date(2025, 3, 28), 18), _epoch(date(2025, 3, 31), 8))])
+    share = custody_share(intervals, monday.toordinal(), monday.toordinal() + 6, table)
+
+    assert share.total_seconds == 7 * 86400 - 3600
+    # Friday 18:00 -> Monday 00:00 inside the week, minus the skipped hour
+    assert share.custody_seconds == 53 * 3600
+    # The Sunday night closes at Monday 00:00 and is still counted
+    assert (share.days, share.nights, share.weekends, share.total_weekends) == (3, 3, 1, 1)
+    assert share.longest_stay == 53 * 3600
+    # Monday 00:00 -> Friday 18:00
+    assert share.longest_separation == 4 * 86400 + 18 * 3600
+    assert share.night_share == round(100 * 3 / 7, 2)
+
+
+def test_counts_match_the_ownership_grid_and_sampling():
+    table = LocalDayTable(PARIS)
+    rng = random.Random(15)
+    first = date(2025, 1, 1).toordinal()
+    last = first + 364
+    base = _epoch(date(2025, 1, 1), 0)
+    for _ in range(20):
+        spans = []
+        for _ in range(rng.randint(0, 40)):
+            start = base + rng.randrange(-5 * 86400, 370 * 86400, 900)
+            spans.append((start, start + rng.randrange(900, 9 * 86400, 900), "pattern"))
+        intervals = CustodyIntervals((start, end) for start, end, _ in spans)
+        share = custody_share(intervals, first, last, table)
+        grid = OwnershipGrid.from_spans(first, last, sorted(spans), table)
+
+        assert share.days == grid.count_days(first, last)
+        assert share.nights == grid.count_nights(first, last)
+        saturdays = [day for day in range(first, last + 1) if (day - 1) % 7 == 5]
+        assert share.weekends == sum(grid.night_source(day) is not None for day in saturdays)
+        # Quarter-hour sampling of the (quarter-hour aligned) intervals gives the exact time share
+        high = table.epoch(last + 1)
+        sampled = sum(900 for start, end in intervals for instant in range(max(start, base), min(end, high), 900))
+        assert share.custody_seconds == sampled
+
+
+def test_calendar_helpers():
+    assert count_weekday(date(2025, 3, 1).toordinal(), date(2025, 3, 31).toordinal(), 5) == 5
+    assert count_weekday(date(2025, 3, 2).toordinal(), date(2025, 3, 7).toordinal(), 5) == 0
+    ranges = month_ranges(date(2024, 11, 15), 3)
+    assert [(date.fromordinal(a), date.fromordinal(b)) for a, b in ranges] == [
+        (date(2024, 11, 1), date(2024, 11, 30)),
+        (date(2024, 12, 1), date(2024, 12, 31)),
+        (date(2025, 1, 1), date(2025, 1, 31)),
+    ]
+
+
+def test_manager_monthly_shares_cover_ten_years():
+    hass = MagicMock()
+    hass.config.time_zone = "Europe/Paris"
+    hass.async_add_executor_job = run_job
+    manager = CustodyScheduleManager(hass, {"custody_type": "alternate_week"}, NoHolidays())
+    now = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+    months = asyncio.run(manager.async_monthly_shares(date(2020, 1, 1), 120, now))
+    assert len(months) == 120
+    # Monday 08:00 -> Sunday 19:00 every other week: 6 nights out of 14
+    assert all(35 <= month.night_share <= 52 for month in months)
+
+    whole = asyncio.run(manager.async_custody_share(date(2020, 1, 1), date(2029, 12, 31), now))
+    assert whole.nights == sum(month.nights for month in months)
+    assert abs(whole.nights - whole.total_days * 6 / 14) < 10
+    assert 45 <= whole.share <= 48
+    assert timedelta(seconds=whole.longest_separation) < timedelta(days=8)
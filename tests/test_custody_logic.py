@@ -1,19 +1,30 @@
+import asyncio
 import unittest
-from datetime import date, datetime, timezone
-from unittest.mock import MagicMock
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
 
+from custom_components.custody_schedule import CustodyScheduleCoordinator, _calendar_sync_interval
+from custom_components.custody_schedule.engine import _first_cycle_boundary, _iso_mondays_with_parity
 from custom_components.custody_schedule.schedule import CustodyScheduleManager
+from custom_components.custody_schedule.school_holidays import EMPTY_SNAPSHOT, HolidaySnapshot, SchoolHoliday
 
 
 class MockHolidays:
-    async def async_list(self, country, zone):
-        return []
+    async def async_snapshot(self, country, zone):
+        return EMPTY_SNAPSHOT
+
+
+async def run_job(func, *args):
+    """Stand-in for hass.async_add_executor_job (runs inline)."""
+    return func(*args)
 
 
 class TestCustodyLogic(unittest.TestCase):
     def setUp(self):
         self.hass = MagicMock()
         self.hass.config.time_zone = "UTC"
+        self.hass.async_add_executor_job = run_job
         self.holidays = MockHolidays()
 
     def test_calculate_end_date_sunday_default(self):
@@ -25,7 +36,7 @@ class TestCustodyLogic(unittest.TestCase):
         start_date = datetime(2025, 10, 3, 8, 0, tzinfo=timezone.utc)
         holidays = set()
 
-        end_date = manager._calculate_end_date(start_date, holidays)
+        end_date = manager._engine.calculate_end_date(start_date, holidays)
 
         # Should be Sunday Oct 5, 2025
         self.assertEqual(end_date.date(), date(2025, 10, 5))
@@ -39,7 +50,7 @@ class TestCustodyLogic(unittest.TestCase):
         start_date = datetime(2025, 10, 3, 8, 0, tzinfo=timezone.utc)
         holidays = set()
 
-        end_date = manager._calculate_end_date(start_date, holidays)
+        end_date = manager._engine.calculate_end_date(start_date, holidays)
 
         # Should be Monday Oct 6, 2025
         self.assertEqual(end_date.date(), date(2025, 10, 6))
@@ -54,7 +65,7 @@ class TestCustodyLogic(unittest.TestCase):
         # Monday Oct 6 is a holiday
         holidays = {date(2025, 10, 6)}
 
-        end_date = manager._calculate_end_date(start_date, holidays)
+        end_date = manager._engine.calculate_end_date(start_date, holidays)
 
         # Should be Tuesday Oct 7, 2025
         self.assertEqual(end_date.date(), date(2025, 10, 7))
@@ -69,7 +80,7 @@ class TestCustodyLogic(unittest.TestCase):
         # Monday Oct 6 and Tuesday Oct 7 are holidays
         holidays = {date(2025, 10, 6), date(2025, 10, 7)}
 
-        end_date = manager._calculate_end_date(start_date, holidays)
+        end_date = manager._engine.calculate_end_date(start_date, holidays)
 
         # Should be Wednesday Oct 8, 2025
         self.assertEqual(end_date.date(), date(2025, 10, 8))
@@ -83,7 +94,7 @@ class TestCustodyLogic(unittest.TestCase):
         start_date = datetime(2025, 10, 6, 8, 0, tzinfo=timezone.utc)
         holidays = set()
 
-        end_date = manager._calculate_end_date(start_date, holidays)
+        end_date = manager._engine.calculate_end_date(start_date, holidays)
 
         # Should be Monday Oct 13, 2025 (7 days later)
         self.assertEqual(end_date.date(), date(2025, 10, 13))
@@ -101,11 +112,11 @@ class TestCustodyLogic(unittest.TestCase):
         # Friday Oct 3, 2025
         now = datetime(2025, 10, 3, 8, 0, tzinfo=timezone.utc)
 
-        # The general loop uses self._reference_start(now, custody_type)
+        # The general loop uses self._reference_day(now, custody_type)
         # reference_year for 2025 (odd) with default "even" config will be 2024.
         # base = Jan 1, 2024 (Monday). start_day default = monday. delta = 0.
         # So reference starts Mon Jan 1, 2024.
-        windows = manager._generate_pattern_windows(now)
+        windows = manager._engine.generate_pattern_windows(now)
 
         self.assertTrue(len(windows) > 0)
         # 2-2-3 pattern starts with 2 days ON.
@@ -114,6 +125,271 @@ class TestCustodyLogic(unittest.TestCase):
         # duration = days-1 = 1 day -> ends 2024-01-02.
         self.assertEqual(windows[0].end.date(), date(2024, 1, 2))
 
+    def test_next_transition_matches_next_change(self):
+        config = {
+            "arrival_time": "08:00",
+            "departure_time": "19:00",
+            "custody_type": "alternate_week",
+        }
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+
+        now = datetime(2025, 10, 3, 12, 0, tzinfo=timezone.utc)
+        state = asyncio.run(manager.async_calculate(now))
+
+        # The coordinator wakes up when presence flips, not on a fixed polling interval
+        if state.is_present:
+            expected = state.next_departure - timedelta(minutes=1)
+        else:
+            expected = state.next_arrival
+        self.assertEqual(state.next_transition, expected)
+        self.assertGreater(state.next_transition, now)
+
+    def test_next_transition_includes_override_expiry(self):
+        config = {"arrival_time": "08:00", "departure_time": "19:00", "custody_type": "alternate_week"}
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+
+        # Vendredi midi : la prochaine fenêtre est bien après l'expiration de l'override
+        now = datetime(2025, 10, 3, 12, 0, tzinfo=timezone.utc)
+        with patch("custom_components.custody_schedule.schedule.dt_util.now", return_value=now):
+            manager.override_presence("on", timedelta(minutes=30))
+        state = asyncio.run(manager.async_calculate(now))
+
+        self.assertEqual(state.next_transition, now + timedelta(minutes=30, seconds=1))
+
+    def test_ownership_read_after_midnight_starts_today(self):
+        config = {"arrival_time": "08:00", "departure_time": "19:00", "custody_type": "alternate_week"}
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+
+        # Calculée dimanche 23 h, lue lundi 1 h avant le prochain rafraîchissement
+        grid = asyncio.run(manager.async_calculate(datetime(2025, 10, 5, 23, 0, tzinfo=timezone.utc))).ownership
+        fresh = asyncio.run(manager.async_calculate(datetime(2025, 10, 6, 1, 0, tzinfo=timezone.utc))).ownership
+        today = grid.clamp(date(2025, 10, 6).toordinal())
+
+        self.assertIsNone(grid.night_source(grid.first_day))
+        self.assertEqual(grid.night_source(today), fresh.night_source(fresh.first_day))
+        self.assertEqual(grid.count_nights(today, grid.last_day), fresh.count_nights(fresh.first_day, grid.last_day))
+        self.assertEqual(grid.clamp(date(2026, 1, 1).toordinal()), grid.last_day)
+
+    def test_calendar_sync_runs_on_its_own_interval(self):
+        entry = MagicMock(entry_id="entry", data={"calendar_sync_interval_hours": "2"}, options={})
+        coordinator = CustodyScheduleCoordinator(self.hass, MagicMock(), entry)
+
+        with patch("custom_components.custody_schedule.async_track_time_interval") as track:
+            coordinator.async_track_calendar_sync()
+        self.assertEqual(track.call_args.args[2], timedelta(hours=2))
+        # Bornes de l'option : 1 à 24 h, 1 h si invalide
+        self.assertEqual(_calendar_sync_interval({"calendar_sync_interval_hours": 48}), timedelta(hours=24))
+        self.assertEqual(_calendar_sync_interval({"calendar_sync_interval_hours": "x"}), timedelta(hours=1))
+
+    def test_holiday_timeline_built_once_per_holiday_list(self):
+        holidays = [
+            SchoolHoliday(
+                "Vacances de la Toussaint",
+                "A",
+                datetime(2025, 10, 18, tzinfo=timezone.utc),
+                datetime(2025, 11, 3, tzinfo=timezone.utc),
+            ),
+            SchoolHoliday(
+                "Vacances de Noël",
+                "A",
+                datetime(2025, 12, 20, tzinfo=timezone.utc),
+                datetime(2026, 1, 5, tzinfo=timezone.utc),
+            ),
+        ]
+
+        class StaticHolidays:
+            calls = 0
+
+            async def async_snapshot(self, country, zone):
+                StaticHolidays.calls += 1
+                return HolidaySnapshot(tuple(holidays), 1)
+
+        config = {"arrival_time": "08:00", "departure_time": "19:00", "zone": "A"}
+        manager = CustodyScheduleManager(self.hass, config, StaticHolidays())
+
+        state = asyncio.run(manager.async_calculate(datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)))
+        timeline = manager._timeline
+        # One snapshot per computation, shared by the state, the next vacation and the ownership grid
+        self.assertEqual(StaticHolidays.calls, 1)
+        self.assertIsNotNone(state.ownership)
+        self.assertEqual(state.current_period, "school")
+        # 2025 is odd: first half of the Toussaint, from the Friday pickup
+        self.assertEqual(state.next_vacation_name, "Vacances de la Toussaint")
+        self.assertEqual(state.next_vacation_start, datetime(2025, 10, 17, 8, 0, tzinfo=timezone.utc))
+
+        state = asyncio.run(manager.async_calculate(datetime(2025, 10, 20, 12, 0, tzinfo=timezone.utc)))
+        self.assertIs(manager._timeline, timeline)
+        self.assertEqual(state.current_period, "vacation")
+        self.assertEqual(state.vacation_name, "Vacances de la Toussaint")
+
+        manager.update_config({"departure_time": "18:00"})
+        asyncio.run(manager.async_calculate(datetime(2025, 10, 20, 12, 0, tzinfo=timezone.utc)))
+        self.assertIsNot(manager._timeline, timeline)
+
+    def test_iso_mondays_with_parity_across_53_week_years(self):
+        # 2020 and 2026 have a week 53: weeks 53 and 1 are consecutive odd weeks
+        first, last = date(2019, 12, 1), date(2027, 2, 1)
+        mondays = [
+            first + timedelta(days=d) for d in range((last - first).days) if (first + timedelta(days=d)).weekday() == 0
+        ]
+        for parity in (0, 1):
+            expected = [d for d in mondays if d.isocalendar().week % 2 == parity]
+            self.assertEqual(list(_iso_mondays_with_parity(first, last, parity)), expected)
+        self.assertIn(date(2020, 12, 28), list(_iso_mondays_with_parity(date(2020, 12, 1), date(2021, 1, 10), 1)))
+        self.assertIn(date(2021, 1, 4), list(_iso_mondays_with_parity(date(2020, 12, 1), date(2021, 1, 10), 1)))
+
+    def test_first_cycle_boundary_before_and_after_anchor(self):
+        anchor = date(2024, 1, 1).toordinal()
+        self.assertEqual(_first_cycle_boundary(anchor, 14, anchor), anchor)
+        self.assertEqual(_first_cycle_boundary(anchor, 14, date(2024, 1, 2).toordinal()), date(2024, 1, 15).toordinal())
+        self.assertEqual(
+            _first_cycle_boundary(anchor, 14, date(2023, 12, 10).toordinal()), date(2023, 12, 18).toordinal()
+        )
+
+    def test_pattern_range_far_from_reference_matches_full_generation(self):
+        now = datetime(2025, 3, 5, 12, 0, tzinfo=timezone.utc)
+        for custody_type in ("alternate_week", "alternate_weekend", "alternate_week_parity", "two_two_three"):
+            manager = CustodyScheduleManager(self.hass, {"custody_type": custody_type}, self.holidays)
+            full = manager._engine.generate_pattern_windows(now)
+            start = datetime(2025, 9, 1, tzinfo=timezone.utc)
+            end = datetime(2025, 12, 1, tzinfo=timezone.utc)
+            ranged = manager._engine.generate_pattern_windows(now, start=start, end=end)
+            expected = [w for w in full if start <= w.start < end]
+            self.assertEqual(
+                [(w.start, w.end) for w in ranged if w.start >= start], [(w.start, w.end) for w in expected]
+            )
+
+    def test_state_only_generates_the_next_weeks(self):
+        config = {"arrival_time": "08:00", "departure_time": "19:00", "custody_type": "alternate_weekend"}
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+        now = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+        state = asyncio.run(manager.async_calculate(now))
+        self.assertTrue(state.windows)
+        self.assertTrue(all(w.start <= now + timedelta(days=28) for w in state.windows))
+
+        # The calendar pulls its own range, consistent with the state
+        ranged = asyncio.run(manager.async_windows(now, now + timedelta(days=180), now=now))
+        self.assertEqual(ranged[0].start, state.next_arrival)
+        self.assertGreater(ranged[-1].start, now + timedelta(days=150))
+        self.assertEqual([w.start for w in ranged], sorted(w.start for w in ranged))
+
+    def test_state_lookahead_extends_when_next_arrival_is_far(self):
+        config = {
+            "arrival_time": "08:00",
+            "departure_time": "19:00",
+            "enable_custody": True,
+            "custody_type": "custom",
+            "custom_pattern": ",".join(["off"] * 60 + ["on"] * 2),
+        }
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+        now = datetime(2025, 1, 8, 12, 0, tzinfo=timezone.utc)
+
+        state = asyncio.run(manager.async_calculate(now))
+        full = [w for w in manager._engine.generate_pattern_windows(now) if w.start > now]
+        self.assertGreater(full[0].start, now + timedelta(days=28))
+        self.assertEqual(state.next_arrival, full[0].start)
+        self.assertEqual(state.next_departure, full[0].end)
+
+    def test_calendar_range_beyond_one_year_uses_cached_tiles(self):
+        config = {"arrival_time": "08:00", "departure_time": "19:00", "custody_type": "alternate_week"}
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+        now = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+        start = datetime(2027, 3, 1, tzinfo=timezone.utc)
+        end = datetime(2027, 4, 1, tzinfo=timezone.utc)
+
+        windows = asyncio.run(manager.async_windows(start, end, now=now))
+        expected, _ = manager._engine.collect_windows(now, start, end, None)
+        self.assertEqual([(w.start, w.end, w.label) for w in windows], [(w.start, w.end, w.label) for w in expected])
+        self.assertTrue(windows)
+
+        tile = manager._window_tiles[2027]
+        asyncio.run(manager.async_windows(start + timedelta(days=31), end + timedelta(days=30), now=now))
+        self.assertIs(manager._window_tiles[2027], tile)
+
+        # A range across New Year does not duplicate the window spanning it
+        windows = asyncio.run(
+            manager.async_windows(
+                datetime(2026, 12, 20, tzinfo=timezone.utc), datetime(2027, 1, 10, tzinfo=timezone.utc), now=now
+            )
+        )
+        keys = [(w.start, w.end, w.label) for w in windows]
+        self.assertEqual(len(keys), len(set(keys)))
+
+        manager.update_config({"departure_time": "18:00"})
+        windows = asyncio.run(manager.async_windows(start, end, now=now))
+        self.assertIsNot(manager._window_tiles[2027], tile)
+        self.assertEqual(windows[0].end.hour, 18)
+
+    def test_custom_rule_only_invalidates_its_year(self):
+        config = {"arrival_time": "08:00", "departure_time": "19:00"}
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+        now = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+        first, last = datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2027, 12, 31, tzinfo=timezone.utc)
+        asyncio.run(manager.async_windows(first, last, now=now))
+        tiles = dict(manager._window_tiles)
+
+        manager.update_config(
+            {"custom_rules": [{"start": "2026-03-10T10:00:00+00:00", "end": "2026-03-11T10:00:00+00:00"}]}
+        )
+        windows = asyncio.run(manager.async_windows(first, last, now=now))
+
+        self.assertIs(manager._window_tiles[2025], tiles[2025])
+        self.assertIs(manager._window_tiles[2027], tiles[2027])
+        self.assertIsNot(manager._window_tiles[2026], tiles[2026])
+        self.assertIn("Custom rule", [w.label for w in windows])
+
+    def test_window_tiles_reloaded_from_store(self):
+        class MemoryStore:
+            def __init__(self):
+                self.data = None
+
+            async def async_load(self):
+                return self.data
+
+            def async_delay_save(self, data_func, delay=0):
+                self.data = data_func()
+
+        store = MemoryStore()
+        config = {"arrival_time": "08:00", "departure_time": "19:00", "custody_type": "alternate_weekend"}
+        now = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+        start, end = datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 6, 30, tzinfo=timezone.utc)
+
+        manager = CustodyScheduleManager(self.hass, config, self.holidays)
+        manager._window_store = store
+        expected = asyncio.run(manager.async_windows(start, end, now=now))
+        self.assertIn("2026", store.data["tiles"])
+
+        # A restart loads the tiles instead of generating them again
+        restarted = CustodyScheduleManager(self.hass, config, self.holidays)
+        restarted._window_store = store
+        restarted._engine.collect_windows = MagicMock(side_effect=AssertionError("tile regenerated"))
+        windows = asyncio.run(restarted.async_windows(start, end, now=now))
+        self.assertEqual(
+            [(w.start, w.end, w.label, w.source) for w in windows],
+            [(w.start, w.end, w.label, w.source) for w in expected],
+        )
+
+    def test_effective_bounds_follow_the_configured_time_zone_across_dst(self):
+        self.hass.config.time_zone = "Europe/Paris"
+        paris = ZoneInfo("Europe/Paris")
+        manager = CustodyScheduleManager(self.hass, {"arrival_time": "08:00", "departure_time": "19:00"}, self.holidays)
+        holiday = SchoolHoliday(
+            name="Vacances de printemps",
+            zone="A",
+            start=datetime(2024, 3, 23, tzinfo=paris),
+            end=datetime(2024, 4, 8, tzinfo=paris),
+        )
+
+        start, end, midpoint = manager._engine.effective_holiday_bounds(holiday)
+
+        self.assertEqual(start, datetime(2024, 3, 22, 8, 0, tzinfo=paris))
+        self.assertEqual(end, datetime(2024, 4, 7, 19, 0, tzinfo=paris))
+        self.assertEqual((start.utcoffset(), end.utcoffset()), (timedelta(hours=1), timedelta(hours=2)))
+        # Half of the wall-clock span, whatever the time zone of the host process
+        self.assertEqual(midpoint.timestamp(), datetime(2024, 3, 30, 13, 30, tzinfo=paris).timestamp())
+        self.assertIs(midpoint.tzinfo, manager._tz)
+
 
 if __name__ == "__main__":
     unittest.main()
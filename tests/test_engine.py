@@ -0,0 +1,149 @@
+"""Tests for the synchronous schedule engine, loaded without Home Assistant."""
+
+import importlib
+import sys
+import types
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_PACKAGE = Path(__file__).resolve().parents[1] / "custom_components" / "custody_schedule"
+# Package without its __init__ (the Home Assistant entry point): only the engine and its HA-free modules load
+_package = types.ModuleType("custody_engine")
+_package.__path__ = [str(_PACKAGE)]
+sys.modules.setdefault("custody_engine", _package)
+engine = importlib.import_module("custody_engine.engine")
+schedule_plan = importlib.import_module("custody_engine.schedule_plan")
+
+PARIS = ZoneInfo("Europe/Paris")
+CONFIG = {"custody_type": "alternate_week", "arrival_time": "08:00", "departure_time": "19:00", "zone": "A"}
+
+
+@dataclass
+class Holiday:
+    name: str
+    zone: str
+    start: datetime
+    end: datetime
+
+
+TOUSSAINT = Holiday(
+    "Vacances de la Toussaint", "A", datetime(2025, 10, 18, tzinfo=PARIS), datetime(2025, 11, 3, tzinfo=PARIS)
+)
+
+
+def _engine(config=CONFIG):
+    return engine.ScheduleEngine(schedule_plan.compile_plan(config), PARIS)
+
+
+def test_state_follows_the_windows():
+    schedule = _engine()
+    now = datetime(2025, 9, 10, 12, 0, tzinfo=PARIS)
+    windows, _ = schedule.collect_windows(now, now - timedelta(days=14), now + timedelta(days=28), None)
+    current = next((w for w in windows if w.start <= now < w.end), None)
+
+    state = schedule.compute_state(now, None)
+
+    assert state.is_present is (current is not None)
+    upcoming = [w for w in windows if w.start > now]
+    if current:
+        assert state.next_departure == current.end
+    else:
+        assert state.next_arrival == upcoming[0].start
+    assert state.next_transition is not None and state.next_transition > now
+    assert state.current_period == "school"
+    assert state.ownership is None and state.attributes == {}
+
+
+def test_override_is_taken_as_given():
+    schedule = _engine()
+    now = datetime(2025, 9, 10, 12, 0, tzinfo=PARIS)
+    until = now + timedelta(hours=5)
+
+    state = schedule.compute_state(now, None, {"state": "off", "until": until})
+    assert state.is_present is False
+    assert state.next_transition <= until + timedelta(seconds=1)
+
+    state = schedule.compute_state(now, None, {"state": "on", "until": until})
+    assert state.is_present is True
+
+
+def test_holiday_timeline_gives_the_period_and_next_vacation():
+    schedule = _engine()
+    timeline = schedule.build_timeline([TOUSSAINT])
+
+    before = datetime(2025, 10, 1, 12, 0, tzinfo=PARIS)
+    name, start, _, days_until, rows = schedule.next_vacation(before, timeline)
+    # 2025 is odd: first half of the Toussaint, from the Friday pickup
+    assert (name, start) == ("Vacances de la Toussaint", datetime(2025, 10, 17, 8, 0, tzinfo=PARIS))
+    assert days_until > 0 and rows[0]["name"] == "Vacances de la Toussaint"
+    assert schedule.determine_period(before, timeline) == ("school", None)
+
+    during = datetime(2025, 10, 20, 12, 0, tzinfo=PARIS)
+    state = schedule.compute_state(during, timeline)
+    assert (state.current_period, state.vacation_name) == ("vacation", "Vacances de la Toussaint")
+
+
+def test_countdowns_can_be_recomputed_from_the_next_instants():
+    schedule = _engine()
+    now = datetime(2025, 10, 1, 12, 0, tzinfo=PARIS)
+    state = schedule.compute_state(now, schedule.build_timeline([TOUSSAINT]))
+
+    assert state.days_remaining_at(now) == state.days_remaining
+    assert state.days_until_vacation_at(now) == state.days_until_vacation
+    # Six hours later the countdown moves without a new computation
+    later = now + timedelta(hours=6)
+    assert state.days_until_vacation_at(later) == engine.countdown_days(later, state.next_vacation_start)
+    assert state.days_until_vacation_at(later) == round(state.days_until_vacation - 0.25, 2)
+    assert engine.countdown_days(now, None) is None
+    assert engine.countdown_days(now, now - timedelta(days=1)) == 0
+
+
+def test_vacation_countdown_is_zero_during_a_vacation():
+    schedule = _engine()
+    # 2024 is even: the custody segment is the second half, still ahead during the first one
+    toussaint = Holiday(
+        "Vacances de la Toussaint", "A", datetime(2024, 10, 19, tzinfo=PARIS), datetime(2024, 11, 4, tzinfo=PARIS)
+    )
+    now = datetime(2024, 10, 21, 12, 0, tzinfo=PARIS)
+    state = schedule.compute_state(now, schedule.build_timeline([toussaint]))
+
+    assert state.current_period == "vacation" and state.next_vacation_start > now
+    assert state.days_until_vacation == 0
+    assert state.days_until_vacation_at(now + timedelta(hours=6)) == 0
+
+
+def test_summer_windows_follow_the_timeline_split():
+    schedule = _engine({**CONFIG, "summer_split_mode": "quarter"})
+    # English name and a June start: still the summer break, split in quarters everywhere
+    summer = Holiday("Summer holidays", "A", datetime(2025, 6, 28, tzinfo=PARIS), datetime(2025, 8, 30, tzinfo=PARIS))
+    timeline = schedule.build_timeline([summer])
+    bounds = timeline.entries[0]
+
+    windows, _ = schedule.collect_windows(bounds.start, bounds.start, bounds.end, timeline)
+    vacation = [(w.start, w.end) for w in windows if w.source == "vacation"]
+
+    assert len(bounds.segments) == 2
+    assert vacation == list(bounds.segments)
+    assert all(w.label.endswith("(Quinzaine)") for w in windows if w.source == "vacation")
+
+
+def test_tiles_hold_the_windows_of_their_year():
+    schedule = _engine()
+    now = datetime(2025, 9, 10, 12, 0, tzinfo=PARIS)
+    timeline = schedule.build_timeline([TOUSSAINT])
+    fingerprint = schedule.tile_fingerprint(now, 2025, timeline)
+
+    tiles = schedule.build_tiles(now, {2025: fingerprint}, timeline)
+    expected, _ = schedule.collect_windows(now, *schedule.year_bounds(2025), timeline)
+
+    assert tiles[2025].fingerprint == fingerprint
+    assert [row[:3] for row in tiles[2025].columns.rows(*schedule.year_bounds(2025))] == [
+        (w.start, w.end, w.label) for w in expected
+    ]
+    # Manual windows are part of the fingerprint of the years they touch only
+    manual = engine.CustodyWindow(datetime(2025, 12, 24, tzinfo=PARIS), datetime(2025, 12, 26, tzinfo=PARIS), "Noël")
+    other = schedule.with_manual_windows([manual])
+    assert other.tile_fingerprint(now, 2025, timeline) != fingerprint
+    assert other.tile_fingerprint(now, 2027, timeline) == schedule.tile_fingerprint(now, 2027, timeline)
@@ -0,0 +1,75 @@
+"""Tests for the bundled offline school holiday dataset."""
+
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_DATASET = Path(__file__).resolve().parents[1] / "custom_components" / "custody_schedule" / "holiday_dataset.py"
+_spec = importlib.util.spec_from_file_location("custody_holiday_dataset", _DATASET)
+hd = importlib.util.module_from_spec(_spec)
+assert _spec.loader is not None
+_spec.loader.exec_module(hd)
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+def _records():
+    records = []
+    for zone, shift in (("A", 0), ("B", 7), ("C", 14)):
+        for school_year in range(2020, 2030):
+            toussaint = datetime(school_year, 10, 18, tzinfo=PARIS) + timedelta(days=shift)
+            hiver = datetime(school_year + 1, 2, 7, tzinfo=PARIS) + timedelta(days=shift)
+            records.append(("FR", zone, school_year, "Vacances d'Hiver", hiver, hiver + timedelta(days=16)))
+            records.append(
+                ("FR", zone, school_year, "Vacances de la Toussaint", toussaint, toussaint + timedelta(days=16))
+            )
+    records.append(
+        ("BE", "fr", 2025, "Congé de détente", datetime(2026, 2, 16, tzinfo=PARIS), datetime(2026, 3, 1, tzinfo=PARIS))
+    )
+    return records
+
+
+def test_lookup_by_country_zone_and_school_year(tmp_path):
+    path = tmp_path / "school_holidays.bin"
+    path.write_bytes(hd.build_dataset(_records() + _records(), revision=739000))
+    dataset = hd.HolidayDataset.open(path)
+
+    assert dataset is not None and dataset.revision == 739000 and len(dataset) == 31
+    holidays = dataset.holidays("FR", "B", 2025)
+    # Duplicates dropped, ordered by start, instants kept (UTC)
+    assert [name for name, _, _ in holidays] == ["Vacances de la Toussaint", "Vacances d'Hiver"]
+    assert holidays[0][1] == datetime(2025, 10, 25, tzinfo=PARIS) and holidays[0][1].tzinfo == timezone.utc
+    assert dataset.holidays("BE", "fr", 2025)[0][0] == "Congé de détente"
+    assert dataset.holidays("FR", "A", 2035) == []
+    assert dataset.holidays("FR", "Corse", 2025) == []
+    assert dataset.holidays("CH", "A", 2025) == []
+
+
+def test_missing_or_invalid_files_are_ignored(tmp_path):
+    assert hd.HolidayDataset.open(tmp_path / "missing.bin") is None
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert hd.HolidayDataset.open(empty) is None
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(hd.build_dataset(_records(), revision=1)[:-3])
+    assert hd.HolidayDataset.open(truncated) is None
+
+
+def test_school_year_starts_in_september():
+    assert hd.school_year_of(datetime(2025, 8, 31)) == 2024
+    assert hd.school_year_of(datetime(2025, 9, 1)) == 2025
+
+
+def test_bundled_dataset_covers_the_french_zones():
+    dataset = hd.HolidayDataset.open()
+    assert dataset is not None and dataset.revision > 0
+
+    school_year = hd.school_year_of(datetime.now(PARIS))
+    for zone in ("A", "B", "C"):
+        holidays = dataset.holidays("FR", zone, school_year)
+        names = {name for name, _, _ in holidays}
+        assert {"Vacances de la Toussaint", "Vacances de Noël", "Vacances d'Été"} <= names, zone
+        assert all(start < end for _, start, end in holidays)
+    # Les zones décalent les vacances d'hiver
+    assert len({dataset.holidays("FR", zone, 2025)[2][1] for zone in ("A", "B", "C")}) == 3
@@ -0,0 +1,64 @@
+"""Tests for the bisect-backed interval index (custody windows lookups)."""
+
+import importlib.util
+import random
+from pathlib import Path
+
+_INDEX = Path(__file__).resolve().parents[1] / "custom_components" / "custody_schedule" / "interval_index.py"
+_spec = importlib.util.spec_from_file_location("custody_interval_index", _INDEX)
+ii = importlib.util.module_from_spec(_spec)
+assert _spec.loader is not None
+_spec.loader.exec_module(ii)
+
+
+def _index(intervals):
+    return ii.IntervalIndex(intervals, lambda item: item[0], lambda item: item[1])
+
+
+def test_lookups_match_linear_scans_with_overlaps():
+    """Every query returns what the previous next(...) scans returned."""
+    rng = random.Random(42)
+    for _ in range(200):
+        intervals = []
+        for _ in range(rng.randint(0, 30)):
+            start = rng.randint(0, 200)
+            intervals.append((start, start + rng.randint(1, 40)))
+        ordered = sorted(intervals, key=lambda item: item[0])
+        index = _index(intervals)
+
+        for t in range(-5, 250, 3):
+            margin = t + rng.randint(0, 2)
+            assert index.containing(t, end_after=margin) == next(
+                (w for w in ordered if w[0] <= t < w[1] and w[1] > margin), None
+            )
+            assert index.first_starting_after(t, end_after=margin) == next(
+                (w for w in ordered if w[0] > t and w[1] > margin), None
+            )
+            assert index.first_ending_after(t) == next((w for w in ordered if w[1] > t), None)
+            upper = t + rng.randint(0, 50)
+            assert list(index.overlapping(t, upper)) == [w for w in ordered if not (w[1] < t or w[0] > upper)]
+
+
+def test_nested_interval_found_after_long_one():
+    """A long interval does not hide a shorter nested one ending later than the query."""
+    index = _index([(0, 100), (10, 20), (30, 40)])
+    assert index.containing(35) == (0, 100)
+    assert index.containing(35, end_after=150) is None
+    assert index.first_starting_after(15) == (30, 40)
+    assert index.first_ending_after(100) is None
+
+
+def test_empty_index():
+    index = _index([])
+    assert len(index) == 0
+    assert index.containing(1) is None
+    assert index.first_starting_after(1) is None
+    assert index.first_ending_after(1) is None
+    assert list(index.overlapping(0, 10)) == []
+
+
+def test_ending_after_inclusive_and_strict():
+    index = _index([(0, 10), (2, 5), (4, 20), (30, 40)])
+    assert list(index.ending_after(10)) == [(4, 20), (30, 40)]
+    assert list(index.ending_after(10, inclusive=True)) == [(0, 10), (4, 20), (30, 40)]
+    assert list(index.ending_after(40)) == []
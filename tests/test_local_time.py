@@ -0,0 +1,49 @@
+"""Tests for the local day table (day ordinals and per-day UTC offsets)."""
+
+import importlib.util
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_LOCAL_TIME = Path(__file__).resolve().parents[1] / "custom_components" / "custody_schedule" / "local_time.py"
+_spec = importlib.util.spec_from_file_location("custody_local_time", _LOCAL_TIME)
+lt = importlib.util.module_from_spec(_spec)
+assert _spec.loader is not None
+_spec.loader.exec_module(lt)
+
+# Paris (02:00/03:00), Santiago (changes at midnight), Lord Howe (30 minutes), Apia (skipped a whole day in 2011)
+ZONES = ("Europe/Paris", "America/Santiago", "Australia/Lord_Howe", "Pacific/Apia", "UTC")
+
+
+def test_epoch_matches_zoneinfo_including_gaps_and_folds():
+    for name in ZONES:
+        tz = ZoneInfo(name)
+        table = lt.LocalDayTable(tz)
+        for day in range(date(2010, 1, 1).toordinal(), date(2013, 1, 1).toordinal()):
+            for minute in range(0, 1440, 30):
+                value = datetime.combine(date.fromordinal(day), time(minute // 60, minute % 60), tzinfo=tz)
+                assert table.epoch(day, minute) == value.timestamp(), (name, value)
+
+
+def test_split_matches_local_wall_clock():
+    for name in ZONES:
+        tz = ZoneInfo(name)
+        table = lt.LocalDayTable(tz)
+        moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        while moment.year < 2026:
+            local = moment.astimezone(tz)
+            expected = (local.toordinal(), local.hour * 3600 + local.minute * 60 + local.second)
+            assert table.split(moment) == expected, (name, moment)
+            moment += timedelta(minutes=1327)
+
+
+def test_datetime_is_built_in_the_table_zone():
+    tz = ZoneInfo("Europe/Paris")
+    table = lt.get_local_day_table(tz)
+    assert table is lt.get_local_day_table(tz)
+    # Fall back: 02:30 exists twice, the first occurrence (CEST) is used
+    value = table.datetime(date(2025, 10, 26).toordinal(), 150)
+    assert value.tzinfo is tz
+    assert value.utcoffset() == timedelta(hours=2)
+    assert lt.weekday_of(date(2025, 10, 26).toordinal()) == 6
+    assert lt.time_minutes(time(16, 15)) == 975
@@ -0,0 +1,116 @@
+"""Tests for the per-day / per-night custody grid."""
+
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from custom_components.custody_schedule.local_time import LocalDayTable
+from custom_components.custody_schedule.ownership_grid import OwnershipGrid
+from custom_components.custody_schedule.schedule import CustodyScheduleManager
+from custom_components.custody_schedule.school_holidays import EMPTY_SNAPSHOT
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+class NoHolidays:
+    async def async_snapshot(self, country, zone):
+        return EMPTY_SNAPSHOT
+
+
+async def run_job(func, *args):
+    return func(*args)
+
+
+def _epoch(day: date, hour: int, minute: int = 0) -> int:
+    return int(datetime.combine(day, time(hour, minute), tzinfo=PARIS).timestamp())
+
+
+def test_days_and_nights_of_a_window():
+    table = LocalDayTable(PARIS)
+    first = date(2025, 3, 24)
+    # Friday 18:00 -> Monday 08:00 (across the spring DST change), then a Wednesday afternoon
+    spans = [
+        (_epoch(date(2025, 3, 28), 18), _epoch(date(2025, 3, 31), 8), "pattern"),
+        (_epoch(date(2025, 4, 2), 14), _epoch(date(2025, 4, 2), 18), "exception_recurring"),
+    ]
+    grid = OwnershipGrid.from_spans(first.toordinal(), first.toordinal() + 13, spans, table)
+
+    days = [date.fromordinal(day) for day, source, _ in grid.rows() if source]
+    nights = [date.fromordinal(day) for day, _, source in grid.rows() if source]
+    assert days == [date(2025, 3, 28), date(2025, 3, 29), date(2025, 3, 30), date(2025, 3, 31), date(2025, 4, 2)]
+    assert nights == [date(2025, 3, 28), date(2025, 3, 29), date(2025, 3, 30)]
+    assert grid.day_source(date(2025, 4, 2).toordinal()) == "exception_recurring"
+    assert grid.night_source(date(2025, 4, 2).toordinal()) is None
+    assert grid.count_nights(first.toordinal(), first.toordinal() + 6) == 3
+    assert grid.count_days(date(2025, 3, 31).toordinal(), date(2025, 4, 30).toordinal()) == 2
+
+
+def test_window_ending_at_midnight_leaves_the_next_day():
+    table = LocalDayTable(PARIS)
+    day = date(2025, 6, 14)
+    spans = [(_epoch(day, 0), _epoch(day + timedelta(days=1), 0), "special")]
+    grid = OwnershipGrid.from_spans(day.toordinal() - 1, day.toordinal() + 1, spans, table)
+
+    assert [source for _, source, _ in grid.rows()] == [None, "special", None]
+    # Midnight at the start belongs to the night before, midnight at the end is excluded
+    assert [source for _, _, source in grid.rows()] == ["special", None, None]
+
+
+def test_join_slice_and_bounds():
+    left = OwnershipGrid(10, bytes([0, 1]), bytes([1, 0]), ("pattern",))
+    right = OwnershipGrid(12, bytes([1, 2]), bytes([0, 2]), ("vacation", "pattern"))
+    grid = OwnershipGrid.join([left, right])
+
+    assert [row[1:] for row in grid.rows()] == [
+        (None, "pattern"),
+        ("pattern", None),
+        ("vacation", None),
+        ("pattern", "pattern"),
+    ]
+    assert grid.slice(11, 99).first_day == 11
+    assert grid.count_days(0, 99) == 3
+    assert grid.count_nights(13, 13) == 1
+    with pytest.raises(KeyError):
+        grid.day_source(14)
+    with pytest.raises(ValueError):
+        OwnershipGrid.join([left, OwnershipGrid(20, b"\0", b"\0")])
+
+
+def test_manager_grid_matches_the_windows():
+    hass = MagicMock()
+    hass.config.time_zone = "Europe/Paris"
+    hass.async_add_executor_job = run_job
+    manager = CustodyScheduleManager(
+        hass,
+        {
+            "custody_type": "two_two_three",
+            "exceptions_recurring": [{"weekday": 2, "start_time": "12:00", "end_time": "18:00"}],
+        },
+        NoHolidays(),
+    )
+    now = datetime(2025, 12, 10, 12, 0, tzinfo=timezone.utc)
+    first, last = date(2025, 12, 1), date(2026, 1, 31)
+    grid = asyncio.run(manager.async_ownership(first, last, now))
+    windows = asyncio.run(
+        manager.async_windows(
+            datetime.combine(first, time(), tzinfo=PARIS), datetime.combine(last, time(23, 59), tzinfo=PARIS), now
+        )
+    )
+
+    assert (grid.first_day, grid.last_day) == (first.toordinal(), last.toordinal())
+    for day, day_source, night_source in grid.rows():
+        midnight = datetime.combine(date.fromordinal(day), time(), tzinfo=PARIS)
+        next_midnight = datetime.combine(date.fromordinal(day + 1), time(), tzinfo=PARIS)
+        touching = [w for w in windows if w.start < next_midnight and w.end > midnight]
+        holding = [w for w in windows if w.start <= next_midnight < w.end]
+        assert (day_source is not None) == bool(touching), date.fromordinal(day)
+        assert (night_source is not None) == bool(holding), date.fromordinal(day)
+
+    state = asyncio.run(manager.async_calculate(now.astimezone(PARIS)))
+    today = date(2025, 12, 10).toordinal()
+    assert state.ownership is not None
+    assert (state.ownership.first_day, len(state.ownership)) == (today, 30)
+    assert state.ownership.count_nights(today, today + 29) == grid.count_nights(today, today + 29)
@@ -0,0 +1,76 @@
+"""Tests for the expansion of cycled custody patterns (pure Python and NumPy paths)."""
+
+import importlib.util
+import random
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+_PATTERN_EXPAND = Path(__file__).resolve().parents[1] / "custom_components" / "custody_schedule" / "pattern_expand.py"
+_spec = importlib.util.spec_from_file_location("custody_pattern_expand", _PATTERN_EXPAND)
+pe = importlib.util.module_from_spec(_spec)
+assert _spec.loader is not None
+_spec.loader.exec_module(pe)
+
+TWO_TWO_THREE = ((2, True), (2, False), (3, True), (2, False), (2, True), (3, False))
+START = date(2025, 1, 6).toordinal()
+# A two-day run inside an "off" segment, then a three-day run on the end of a custody segment
+HOLIDAYS = frozenset({START + 3, START + 4, START + 15, START + 16, START + 17})
+
+
+def _random_cases(count: int):
+    rng = random.Random(13)
+    for _ in range(count):
+        states = [rng.random() < 0.5 for _ in range(rng.randint(1, 60))]
+        segments = []
+        for state in states:
+            if segments and segments[-1][1] == state:
+                segments[-1] = (segments[-1][0] + 1, state)
+            else:
+                segments.append((1, state))
+        first = START + rng.randint(-400, 400)
+        holidays = frozenset(START + rng.randint(-500, 1200) for _ in range(rng.randint(0, 80)))
+        yield tuple(segments), len(states), first, first + rng.randint(-5, 900), holidays
+
+
+def test_segments_are_extended_over_holidays_and_keep_their_place():
+    pairs = pe.expand_cycled_pattern(TWO_TWO_THREE, 14, START, START + 14, HOLIDAYS)
+    offsets = [(start - START, end - START) for start, end in pairs]
+    # Only ends falling on a holiday move: the first cycle is untouched
+    assert offsets[:3] == [(0, 1), (4, 6), (9, 10)]
+    # Tuesday 15 is a holiday (15..17): the segment runs to 18, the next one still starts on day 18
+    assert offsets[3:] == [(14, 18), (18, 20), (23, 24)]
+
+
+def test_empty_range_and_pattern_without_custody():
+    assert pe.expand_cycled_pattern(TWO_TWO_THREE, 14, START, START - 1, HOLIDAYS) == []
+    assert pe.expand_cycled_pattern(((7, False),), 7, START, START + 70, HOLIDAYS) == []
+
+
+def test_python_expansion_matches_day_by_day_walk():
+    for segments, cycle_days, first, last, holidays in _random_cases(200):
+        expected = []
+        pointer = first
+        while pointer <= last:
+            for segment_days, custody_on in segments:
+                end = pointer + segment_days - 1
+                while end in holidays:
+                    end += 1
+                if custody_on:
+                    expected.append((pointer, end))
+                pointer += segment_days
+        cycles = (last - first) // cycle_days + 1 if last >= first else 0
+        assert pe._expand_python(segments, cycle_days, first, cycles, holidays) == expected
+
+
+def test_vectorized_expansion_matches_python():
+    pytest.importorskip("numpy")
+    for segments, cycle_days, first, last, holidays in _random_cases(300):
+        if last < first:
+            continue
+        cycles = (last - first) // cycle_days + 1
+        expected = pe._expand_python(segments, cycle_days, first, cycles, holidays)
+        result = pe._expand_vectorized(segments, cycle_days, first, cycles, holidays)
+        assert result == expected
+        assert all(type(value) is int for pair in result for value in pair)
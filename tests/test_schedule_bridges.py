@@ -45,3 +45,34 @@ def test_chained_holidays_after_last_day():
     end = datetime(2026, 5, 31, 0, 0, 0)
     extended = hb.apply_public_holiday_bridge_after_last_day(end, holidays)
     assert extended.date() == date(2026, 6, 2)
+
+
+def test_public_holidays_are_memoized_and_frozen():
+    """The holiday calendar is computed once per (year, country, alsace_moselle) and shared."""
+    first = hb.get_public_holidays(2027, "FR", True)
+    assert first is hb.get_public_holidays(2027, "FR", True)
+    assert isinstance(first, frozenset)
+    assert date(2027, 12, 26) in first
+
+    union = hb.get_public_holidays_range(2026, 2028, "FR", False)
+    assert union is hb.get_public_holidays_range(2026, 2028, "FR", False)
+    assert union == (
+        hb.get_public_holidays(2026, "FR", False)
+        | hb.get_public_holidays(2027, "FR", False)
+        | hb.get_public_holidays(2028, "FR", False)
+    )
+
+    ordinals = hb.get_public_holiday_ordinals(2026, 2028, "FR", False)
+    assert list(ordinals) == sorted(day.toordinal() for day in union)
+
+
+def test_ordinal_bridges_match_datetime_bridges():
+    """The day-ordinal bridges used by the engine agree with the datetime helpers."""
+    holidays = hb.get_public_holidays_range(2026, 2027, "FR", True)
+    ordinals = frozenset(day.toordinal() for day in holidays)
+    for day in (date(2026, 4, 5), date(2026, 5, 31), date(2026, 12, 24), date(2027, 3, 26)):
+        moment = datetime.combine(day, datetime.min.time())
+        after = hb.apply_public_holiday_bridge_after_last_day(moment, holidays).date()
+        before = hb.apply_public_holiday_bridge_before_weekend_start(moment, holidays).date()
+        assert hb.public_holiday_bridge_end_day(day.toordinal(), ordinals) == after.toordinal()
+        assert hb.public_holiday_bridge_start_day(day.toordinal(), ordinals) == before.toordinal()
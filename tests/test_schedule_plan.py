@@ -0,0 +1,70 @@
+"""Tests for the compiled schedule plan."""
+
+import dataclasses
+from datetime import date, time
+
+import pytest
+
+from custom_components.custody_schedule.schedule_plan import compile_plan
+
+
+def test_custom_pattern_is_run_length_encoded_once():
+    plan = compile_plan({"custody_type": "custom", "custom_pattern": "on,on,on,off,off,on,off"})
+
+    assert plan.cycle_days == 7
+    assert plan.segments == ((3, True), (2, False), (1, True), (1, False))
+    assert plan.label == "Garde - Custom"
+    assert plan.holiday_label == "Garde - Custom + Holiday"
+
+
+def test_settings_are_resolved():
+    plan = compile_plan(
+        {
+            "custody_type": "alternate_weekend",
+            "arrival_time": "16:15",
+            "departure_time": "bad",
+            "end_day": "Monday",
+            "weekend_start_day": "saturday",
+            "reference_year_custody": "odd",
+            "auto_parent_days": True,
+            "parental_role": "mother",
+        }
+    )
+
+    assert (plan.arrival, plan.departure) == (time(16, 15), time(8, 0))
+    assert (plan.arrival_minute, plan.departure_minute) == (975, 480)
+    assert (plan.end_day, plan.end_weekday, plan.start_weekday) == ("monday", 0, 0)
+    assert (plan.weekend_offset, plan.week_parity) == (5, 1)
+    assert plan.parental_role == "mother"
+    assert compile_plan({"parental_role": "mother"}).parental_role is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        plan.custody_type = "custom"
+
+
+def test_recurring_exceptions_are_validated_and_parsed():
+    plan = compile_plan(
+        {
+            "exceptions_recurring": [
+                {"weekday": 2, "start_time": "14:00", "end_time": "18:00", "start_date": "2025-09-01"},
+                {"weekday": 9, "start_time": "14:00", "end_time": "18:00"},
+                {"weekday": 3, "start_time": "18:00", "end_time": "14:00"},
+                {"weekday": "x"},
+            ]
+        }
+    )
+
+    (item,) = plan.recurring
+    assert (item.weekday, item.start_minute, item.end_minute) == (2, 840, 1080)
+    assert (item.first_day, item.last_day) == (date(2025, 9, 1).toordinal(), None)
+    assert item.label == "Recurring exception"
+
+
+def test_fingerprint_only_covers_global_settings():
+    base = {"custody_type": "two_two_three", "zone": "A"}
+    plan = compile_plan(base)
+
+    assert compile_plan(dict(base)).fingerprint == plan.fingerprint
+    assert compile_plan({**base, "arrival_time": "09:00"}).fingerprint != plan.fingerprint
+    # Dated entries are hashed per year by the window tiles, not by the plan
+    recurring = [{"weekday": 2, "start_time": "14:00", "end_time": "18:00"}]
+    assert compile_plan({**base, "exceptions_recurring": recurring}).fingerprint == plan.fingerprint
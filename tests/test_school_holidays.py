@@ -0,0 +1,704 @@
+"""Tests for the school holiday client cache (snapshots and versions)."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.custody_schedule import school_holidays
+from custom_components.custody_schedule.holiday_dataset import build_dataset
+from custom_components.custody_schedule.school_holidays import SchoolHoliday, SchoolHolidayClient
+
+TOUSSAINT = SchoolHoliday(
+    "Vacances de la Toussaint",
+    "A",
+    datetime(2025, 10, 18, tzinfo=timezone.utc),
+    datetime(2025, 11, 3, tzinfo=timezone.utc),
+)
+NOEL = SchoolHoliday(
+    "Vacances de Noël", "A", datetime(2025, 12, 20, tzinfo=timezone.utc), datetime(2026, 1, 5, tzinfo=timezone.utc)
+)
+
+
+class FakeProvider:
+    def __init__(self, holidays):
+        self.holidays = holidays
+        self.calls = 0
+
+    async def get_holidays(self, country, zone, year=None, validators=None):
+        self.calls += 1
+        return list(self.holidays)
+
+
+class MemoryStore:
+    """Store stand-in: delayed saves wait for flush(), as they wait for their timer in Home Assistant."""
+
+    def __init__(self):
+        self.data = None
+        self.pending = None
+        self.writes = 0
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay=0):
+        self.pending = data_func
+
+    def flush(self):
+        if self.pending is not None:
+            self.data = self.pending()
+            self.pending = None
+            self.writes += 1
+
+
+async def run_job(func, *args):
+    return func(*args)
+
+
+def _client(monkeypatch, provider):
+    monkeypatch.setattr(school_holidays.aiohttp_client, "async_get_clientsession", lambda hass: MagicMock())
+    # Without the bundled dataset unless a test sets one
+    monkeypatch.setattr(school_holidays.HolidayDataset, "open", staticmethod(lambda *args: None))
+    hass = MagicMock()
+    hass.async_create_task = asyncio.ensure_future
+    hass.async_add_executor_job = run_job
+    client = SchoolHolidayClient(hass)
+    client._store = MemoryStore()
+    client._france_provider = provider
+    return client
+
+
+def _expire(client, days=2):
+    for key, entry in list(client._cache.items()):
+        client._set_cache_entry(
+            key, (dt_util.now() - timedelta(days=days)).isoformat(), list(client._entry_snapshot(entry).holidays)
+        )
+
+
+def _retry_now(client):
+    """End the backoff of the keys without result."""
+    for key, (failures, _) in client._failures.items():
+        client._failures[key] = (failures, dt_util.now() - timedelta(seconds=1))
+
+
+async def _settle(client):
+    """Wait for the background refreshes."""
+    await asyncio.gather(*client._inflight.values())
+
+
+def test_snapshot_version_only_changes_with_the_holidays(monkeypatch):
+    provider = FakeProvider([TOUSSAINT, NOEL])
+    client = _client(monkeypatch, provider)
+
+    async def scenario():
+        first = await client.async_snapshot("FR", "A")
+        assert first.holidays == (TOUSSAINT, NOEL) and first.version > 0
+        # Fresh cache: the same snapshot, no new request
+        assert await client.async_snapshot("FR", "A") is first
+        assert provider.calls == 1
+
+        # Stale cache refetched with the same content: same snapshot and version
+        _expire(client)
+        assert await client.async_snapshot("FR", "A") is first
+        await _settle(client)
+        assert provider.calls == 2
+        assert await client.async_snapshot("FR", "A") is first
+
+        _expire(client)
+        provider.holidays = [NOEL]
+        # Served from the cache, the refresh lands for the next read
+        assert await client.async_snapshot("FR", "A") is first
+        await _settle(client)
+        changed = await client.async_snapshot("FR", "A")
+        assert changed.holidays == (NOEL,) and changed.version > first.version
+        assert await client.async_list("FR", "A") == [NOEL]
+
+    asyncio.run(scenario())
+
+
+def test_empty_provider_falls_back_to_the_previous_snapshot(monkeypatch):
+    provider = FakeProvider([])
+    client = _client(monkeypatch, provider)
+
+    async def scenario():
+        assert len(await client.async_snapshot("FR", "A")) == 0
+        provider.holidays = [TOUSSAINT]
+        _retry_now(client)
+        first = await client.async_snapshot("FR", "A")
+        _expire(client)
+        provider.holidays = []
+        assert await client.async_snapshot("FR", "A") is first
+        await _settle(client)
+        assert provider.calls == 3
+        # The failed refresh backs off: the stale entry is served without a new request
+        assert await client.async_snapshot("FR", "A") is first
+        assert provider.calls == 3 and client._inflight == {}
+
+    asyncio.run(scenario())
+
+
+class GatedProvider(FakeProvider):
+    def __init__(self, holidays):
+        super().__init__(holidays)
+        self.release = asyncio.Event()
+
+    async def get_holidays(self, country, zone, year=None, validators=None):
+        self.calls += 1
+        await self.release.wait()
+        return list(self.holidays)
+
+
+def test_concurrent_callers_share_one_fetch(monkeypatch):
+    provider = GatedProvider([TOUSSAINT, NOEL])
+    client = _client(monkeypatch, provider)
+
+    async def scenario():
+        callers = [asyncio.ensure_future(client.async_snapshot("FR", "A")) for _ in range(5)]
+        await asyncio.sleep(0)
+        provider.release.set()
+        snapshots = await asyncio.gather(*callers)
+        assert provider.calls == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert client._inflight == {}
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_fetch(monkeypatch):
+    provider = GatedProvider([TOUSSAINT])
+    client = _client(monkeypatch, provider)
+
+    async def scenario():
+        first = asyncio.ensure_future(client.async_snapshot("FR", "A"))
+        second = asyncio.ensure_future(client.async_snapshot("FR", "A"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        provider.release.set()
+        assert (await second).holidays == (TOUSSAINT,)
+        assert first.cancelled()
+        assert provider.calls == 1 and client._inflight == {}
+        # The fetch ended: a later stale read starts a new one
+        _expire(client)
+        await client.async_snapshot("FR", "A")
+        await _settle(client)
+        assert provider.calls == 2
+
+    asyncio.run(scenario())
+
+
+class SlowSession:
+    """aiohttp session stand-in: every request takes a short delay and records how many overlap.
+
+    URLs with an ETag in `etags` answer 304 to a matching If-None-Match.
+    """
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.active = 0
+        self.peak = 0
+        self.urls = []
+        self.etags = {}
+        self.parsed = 0
+
+    def get(self, url, headers=None, **kwargs):
+        session = self
+        etag = self.etags.get(url)
+        not_modified = etag is not None and (headers or {}).get("If-None-Match") == etag
+
+        class Response:
+            status = 304 if not_modified else 200
+            headers = {"ETag": etag} if etag is not None else {}
+
+            async def __aenter__(self):
+                session.urls.append(url)
+                session.active += 1
+                session.peak = max(session.peak, session.active)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc):
+                session.active -= 1
+
+            def raise_for_status(self):
+                pass
+
+            async def json(self):
+                session.parsed += 1
+                return session.payload(url)
+
+        return Response()
+
+
+def _record(description, start, end):
+    return {"fields": {"description": description, "start_date": start, "end_date": end}}
+
+
+def test_school_years_are_fetched_concurrently_and_merged_in_order():
+    def payload(url):
+        first = int(url.split("annee_scolaire=")[1][:4]) if "annee_scolaire=" in url else 2025
+        return {
+            "records": [_record(f"Noël {first}", f"{first}-12-20T00:00:00+00:00", f"{first + 1}-01-05T00:00:00+00:00")]
+        }
+
+    session = SlowSession(payload)
+    provider = school_holidays.FranceEducationProvider(MagicMock(), session)
+    holidays = asyncio.run(provider.get_holidays("FR", "A", 2026))
+
+    # Two school years for an explicit year, both in flight at once
+    assert session.peak == 2
+    assert [h.start for h in holidays] == sorted(h.start for h in holidays)
+
+
+def test_concurrent_requests_are_bounded(monkeypatch):
+    monkeypatch.setattr(school_holidays, "MAX_CONCURRENT_REQUESTS", 2)
+    session = SlowSession(lambda url: [])
+    hass = MagicMock()
+    hass.config.time_zone = "Europe/Paris"
+    provider = school_holidays.OpenHolidaysProvider(hass, session)
+
+    assert asyncio.run(provider.get_holidays("BE", "fr")) == []
+    assert len(session.urls) == 3
+    assert session.peak == 2
+
+
+def test_stale_entry_is_served_while_it_is_refreshed(monkeypatch):
+    provider = GatedProvider([TOUSSAINT])
+    client = _client(monkeypatch, provider)
+
+    async def scenario():
+        provider.release.set()
+        first = await client.async_snapshot("FR", "A")
+        provider.release.clear()
+        provider.holidays = [TOUSSAINT, NOEL]
+
+        # Within the soft TTL: no refresh
+        _expire(client, days=0.5)
+        assert await client.async_snapshot("FR", "A") is first
+        assert provider.calls == 1 and client._inflight == {}
+
+        # Past the soft TTL the entry is still served at once, a single refresh runs behind it
+        _expire(client)
+        for _ in range(3):
+            assert await client.async_snapshot("FR", "A") is first
+        await asyncio.sleep(0)
+        assert provider.calls == 2 and len(client._inflight) == 1
+        provider.release.set()
+        await _settle(client)
+        assert (await client.async_snapshot("FR", "A")).holidays == (TOUSSAINT, NOEL)
+
+    asyncio.run(scenario())
+
+
+def test_entry_past_the_hard_ttl_is_refreshed_before_use(monkeypatch):
+    provider = FakeProvider([TOUSSAINT])
+    client = _client(monkeypatch, provider)
+    key = ("FR", "A", "None", None)
+
+    async def scenario():
+        await client.async_snapshot("FR", "A")
+        provider.holidays = [TOUSSAINT, NOEL]
+        _expire(client, days=31)
+        # The read waits for the new list instead of serving the expired one
+        assert (await client.async_snapshot("FR", "A")).holidays == (TOUSSAINT, NOEL)
+        assert provider.calls == 2 and client._inflight == {}
+        assert not client.diagnostics()["entries"][0]["expired"]
+
+        # When that refresh fails, the expired entry is the fallback and is flagged as such
+        provider.holidays = []
+        _expire(client, days=31)
+        expired = client._cache[key]["snapshot"]
+        assert await client.async_snapshot("FR", "A") is expired
+        assert provider.calls == 3
+        assert client.diagnostics()["entries"][0]["expired"]
+
+    asyncio.run(scenario())
+
+
+def test_fetch_errors_are_logged_once(monkeypatch, caplog):
+    provider = FakeProvider([TOUSSAINT])
+    client = _client(monkeypatch, provider)
+
+    def broken_save():
+        raise RuntimeError("disk full")
+
+    async def scenario():
+        await client._async_load_cache()
+        client._schedule_save = broken_save
+        # Awaited first fetch: the caller gets the error, the callback does not log it again
+        with pytest.raises(RuntimeError):
+            await client.async_snapshot("FR", "A")
+        assert "Holiday refresh failed" not in caplog.text
+
+        # Background refresh: nobody awaits it, the callback logs it
+        del client._schedule_save
+        await client.async_snapshot("FR", "A")
+        client._schedule_save = broken_save
+        _expire(client)
+        await client.async_snapshot("FR", "A")
+        await asyncio.gather(*client._inflight.values(), return_exceptions=True)
+        assert caplog.text.count("Holiday refresh failed") == 1
+
+    asyncio.run(scenario())
+
+
+def test_refresh_is_jittered_and_brought_forward_before_the_rollover():
+    autumn = datetime(2025, 10, 1, tzinfo=timezone.utc)
+    assert school_holidays.refresh_time(autumn, 0) == autumn + school_holidays.SOFT_TTL
+    assert (
+        school_holidays.refresh_time(autumn, 0.5)
+        == autumn + school_holidays.SOFT_TTL - school_holidays.REFRESH_JITTER / 2
+    )
+    # Fetched just before the summer window: refreshed when it opens
+    window = datetime(2026, 9, 1, tzinfo=timezone.utc) - school_holidays.ROLLOVER_PREFETCH
+    june = window - timedelta(hours=1)
+    assert school_holidays.refresh_time(june, 0) == window
+    # Fetched inside the window: the usual soft TTL
+    assert school_holidays.refresh_time(window, 0) == window + school_holidays.SOFT_TTL
+
+
+def test_empty_results_are_cached_with_an_exponential_backoff(monkeypatch):
+    provider = FakeProvider([])
+    client = _client(monkeypatch, provider)
+    key = ("FR", "A", "None", None)
+
+    async def scenario():
+        for _ in range(10):
+            assert await client.async_snapshot("FR", "A") is school_holidays.EMPTY_SNAPSHOT
+        assert provider.calls == 1
+        first_delay = client._failures[key][1] - dt_util.now()
+
+        _retry_now(client)
+        await client.async_snapshot("FR", "A")
+        assert provider.calls == 2
+        failures, retry_at = client._failures[key]
+        assert failures == 2 and retry_at - dt_util.now() > first_delay
+
+        provider.holidays = [TOUSSAINT]
+        _retry_now(client)
+        assert (await client.async_snapshot("FR", "A")).holidays == (TOUSSAINT,)
+        assert key not in client._failures
+
+    asyncio.run(scenario())
+
+
+def _down(url):
+    raise aiohttp.ClientError("service unavailable")
+
+
+def test_circuit_breaker_opens_then_probes(monkeypatch):
+    monkeypatch.setattr(school_holidays, "BREAKER_THRESHOLD", 2)
+    session = SlowSession(_down)
+    provider = school_holidays.FranceEducationProvider(MagicMock(), session)
+    breaker = provider.breaker
+
+    async def scenario():
+        for _ in range(2):
+            assert await provider.get_holidays("FR", "A", 2026) == []
+        assert breaker.state == breaker.OPEN and len(session.urls) == 4
+
+        # Open: no request at all
+        with pytest.raises(school_holidays.HolidayProviderUnavailable):
+            await provider.get_holidays("FR", "A", 2026)
+        assert len(session.urls) == 4
+
+        # Failed probe: open again, for longer
+        first_delay = breaker.retry_at - dt_util.now()
+        breaker.retry_at = dt_util.now() - timedelta(seconds=1)
+        await provider.get_holidays("FR", "A", 2026)
+        assert breaker.state == breaker.OPEN and breaker.retry_at - dt_util.now() > first_delay
+
+        breaker.retry_at = dt_util.now() - timedelta(seconds=1)
+        session.payload = lambda url: {"records": []}
+        await provider.get_holidays("FR", "A", 2026)
+        assert (breaker.state, breaker.failures) == (breaker.CLOSED, 0)
+
+    asyncio.run(scenario())
+
+
+def test_breaker_state_is_stored_and_shown_in_the_diagnostics(monkeypatch):
+    provider = FakeProvider([TOUSSAINT])
+    client = _client(monkeypatch, provider)
+    host = school_holidays.FranceEducationProvider.HOST
+
+    async def scenario():
+        for _ in range(school_holidays.BREAKER_THRESHOLD):
+            client._breakers[host].record_failure(dt_util.now())
+        await client.async_snapshot("FR", "A")
+        client._store.flush()
+        assert client._store.data["breakers"][host]["state"] == "open"
+
+        restored = _client(monkeypatch, provider)
+        restored._store = client._store
+        await restored._async_load_cache()
+        assert restored._breakers[host].as_dict() == client._breakers[host].as_dict()
+
+        diagnostics = restored.diagnostics()
+        assert diagnostics["breakers"][host]["state"] == "open"
+        assert [entry["key"] for entry in diagnostics["entries"]] == ["FR|A|None"]
+
+    asyncio.run(scenario())
+
+
+def test_unchanged_payloads_are_not_downloaded_again():
+    def payload(url):
+        first = int(url.split("annee_scolaire=")[1][:4])
+        return {
+            "records": [_record(f"Noël {first}", f"{first}-12-20T00:00:00+00:00", f"{first + 1}-01-05T00:00:00+00:00")]
+        }
+
+    session = SlowSession(payload)
+    provider = school_holidays.FranceEducationProvider(MagicMock(), session)
+
+    async def scenario():
+        validators = {}
+        holidays = await provider.get_holidays("FR", "A", 2026, validators)
+        session.etags = {url: '"v1"' for url in session.urls}
+        # No validator stored yet: full answers, their ETags are kept
+        assert validators == {}
+        assert await provider.get_holidays("FR", "A", 2026, validators) == holidays
+        assert len(validators) == 2 and session.parsed == 4
+
+        with pytest.raises(school_holidays.HolidaysNotModified):
+            await provider.get_holidays("FR", "A", 2026, validators)
+        assert session.parsed == 4 and len(validators) == 2
+
+        # One school year changed: the other one is fetched again to rebuild the whole list
+        changed = session.urls[0]
+        session.etags[changed] = '"v2"'
+        session.urls.clear()
+        assert await provider.get_holidays("FR", "A", 2026, validators) == holidays
+        assert sorted(session.urls) == sorted([*session.etags, *(url for url in session.etags if url != changed)])
+        assert validators[changed] == {"etag": '"v2"'}
+
+    asyncio.run(scenario())
+
+
+def test_validators_only_revalidate_their_own_entry(monkeypatch):
+    version = {"tag": "v1"}
+
+    def payload(url):
+        first = int(url.split("annee_scolaire=")[1][:4])
+        end = f"{first + 1}-01-05" if version["tag"] == "v1" else f"{first + 1}-01-06"
+        return {"records": [_record(f"Noël {first}", f"{first}-12-20T00:00:00+00:00", f"{end}T00:00:00+00:00")]}
+
+    session = SlowSession(payload)
+    client = _client(monkeypatch, FakeProvider([]))
+    client._france_provider = school_holidays.FranceEducationProvider(
+        MagicMock(), session, client._breakers[school_holidays.FranceEducationProvider.HOST]
+    )
+    monkeypatch.setattr(school_holidays.dt_util, "now", lambda: datetime(2025, 10, 1, tzinfo=timezone.utc))
+
+    async def scenario():
+        # Both keys ask for 2025-2026 and 2026-2027 (plus 2027-2028 without a year)
+        session.etags = {}
+        await client.async_snapshot("FR", "A", 2026)
+        session.etags = {url: '"v1"' for url in session.urls}
+        await client.async_snapshot("FR", "A")
+        assert client._cache[("FR", "A", "2026", 2026)]["validators"] == {}
+
+        version["tag"] = "v2"
+        session.etags = {url: '"v2"' for url in session.etags}
+        _expire(client)
+        await client.async_snapshot("FR", "A")
+        await _settle(client)
+        # The 304 earned by the year-less key does not validate the older list of the 2026 key
+        await client.async_snapshot("FR", "A", 2026)
+        await _settle(client)
+        holidays = (await client.async_snapshot("FR", "A", 2026)).holidays
+        assert [h.end.day for h in holidays] == [6, 6]
+        assert client._cache[("FR", "A", "2026", 2026)]["validators"].keys() <= session.etags.keys()
+        assert client.diagnostics()["validators"] == 4
+        # Stored with their entry
+        client._store.flush()
+        assert "validators" not in client._store.data
+        assert client._store.data["FR|A|2026"]["validators"] == client._cache[("FR", "A", "2026", 2026)]["validators"]
+
+    asyncio.run(scenario())
+
+
+class ConditionalProvider(FakeProvider):
+    async def get_holidays(self, country, zone, year=None, validators=None):
+        self.calls += 1
+        if validators:
+            raise school_holidays.HolidaysNotModified
+        if validators is not None:
+            validators["https://example.org/holidays"] = {"etag": '"v1"'}
+        return list(self.holidays)
+
+
+def test_not_modified_extends_the_cached_entry(monkeypatch):
+    provider = ConditionalProvider([TOUSSAINT])
+    client = _client(monkeypatch, provider)
+    key = ("FR", "A", "None", None)
+
+    async def scenario():
+        first = await client.async_snapshot("FR", "A")
+        _expire(client)
+        assert await client.async_snapshot("FR", "A") is first
+        await _settle(client)
+
+        assert provider.calls == 2
+        entry = client._cache[key]
+        assert entry["snapshot"] is first
+        assert dt_util.now() - dt_util.parse_datetime(entry["timestamp"]) < timedelta(minutes=1)
+        assert dt_util.now() < entry["refresh_at"]
+
+    asyncio.run(scenario())
+
+
+def test_saves_are_coalesced_and_unchanged_entries_not_encoded_again(monkeypatch):
+    provider = FakeProvider([TOUSSAINT, NOEL])
+    client = _client(monkeypatch, provider)
+    store = client._store
+
+    async def scenario():
+        for zone in ("A", "B", "C"):
+            await client.async_snapshot("FR", zone)
+        store.flush()
+        assert store.writes == 1 and {"FR|A|None", "FR|B|None", "FR|C|None"} <= set(store.data)
+        rows = store.data["FR|A|None"]["rows"]
+        assert school_holidays.decode_holidays(store.data["FR|A|None"]) == [TOUSSAINT, NOEL]
+
+        # Refreshed with the same list: new timestamp, the encoded holidays are reused
+        _expire(client)
+        await client.async_snapshot("FR", "A")
+        await _settle(client)
+        store.flush()
+        assert store.writes == 2
+        assert store.data["FR|A|None"]["rows"] is rows
+        assert store.data["FR|A|None"]["timestamp"] == client._cache[("FR", "A", "None", None)]["timestamp"]
+
+        provider.holidays = [NOEL]
+        _expire(client)
+        await client.async_snapshot("FR", "A")
+        await _settle(client)
+        store.flush()
+        assert store.data["FR|A|None"]["names"] == [NOEL.name]
+
+    asyncio.run(scenario())
+
+
+def test_v1_store_is_migrated_to_the_compact_layout():
+    v1 = {
+        "FR|A|None": {
+            "timestamp": "2025-09-01T00:00:00+00:00",
+            "holidays": [
+                {"name": h.name, "zone": h.zone, "start": h.start.isoformat(), "end": h.end.isoformat()}
+                for h in (TOUSSAINT, NOEL)
+            ],
+        },
+        # Oldest layout: a bare list, refreshed as if fetched long ago
+        "FR|B|2025": [
+            {"name": "Noël", "zone": "B", "start": "2025-12-20T00:00:00+01:00", "end": "2026-01-05T00:00:00+01:00"}
+        ],
+        "FR|C|None": {"timestamp": "2025-09-01T00:00:00+00:00", "holidays": []},
+        "breakers": {"openholidaysapi.org": {"state": "closed", "failures": 0, "retry_at": None}},
+    }
+    v2 = school_holidays.migrate_holiday_store(v1)
+
+    assert set(v2) == {"FR|A|None", "FR|B|2025", "breakers"}
+    assert v2["FR|A|None"]["names"] == [TOUSSAINT.name, NOEL.name] and v2["FR|A|None"]["zones"] == ["A"]
+    assert school_holidays.decode_holidays(v2["FR|A|None"]) == [TOUSSAINT, NOEL]
+    assert dt_util.parse_datetime(v2["FR|B|2025"]["timestamp"]) < dt_util.now() - school_holidays.HARD_TTL
+    assert v2["breakers"] is v1["breakers"]
+
+
+def test_v1_naive_datetimes_are_read_in_the_local_time_zone(monkeypatch):
+    paris = dt_util.get_time_zone("Europe/Paris")
+    monkeypatch.setattr(dt_util, "DEFAULT_TIME_ZONE", paris)
+    v1 = {
+        "FR|A|None": {
+            "timestamp": "2025-09-01T08:00:00",
+            "holidays": [{"name": "Noël", "zone": "A", "start": "2025-12-20T00:00:00", "end": "2026-01-05T00:00:00"}],
+        }
+    }
+    v2 = school_holidays.migrate_holiday_store(v1)
+
+    [noel] = school_holidays.decode_holidays(v2["FR|A|None"])
+    assert noel.start == datetime(2025, 12, 20, tzinfo=paris) and noel.end == datetime(2026, 1, 5, tzinfo=paris)
+    assert dt_util.parse_datetime(v2["FR|A|None"]["timestamp"]) == datetime(2025, 9, 1, 8, tzinfo=paris)
+
+
+def test_stored_entries_are_decoded_on_first_access(monkeypatch):
+    provider = FakeProvider([])
+    client = _client(monkeypatch, provider)
+    fetched = dt_util.now().isoformat()
+    client._store.data = {
+        "FR|A|None": {"timestamp": fetched, **school_holidays.encode_holidays([TOUSSAINT, NOEL])},
+        "FR|B|None": {"timestamp": fetched, **school_holidays.encode_holidays([NOEL])},
+    }
+
+    async def scenario():
+        await client._async_load_cache()
+        assert all(entry["snapshot"] is None for entry in client._cache.values())
+        assert [entry["holidays"] for entry in client.diagnostics()["entries"]] == [2, 1]
+
+        snapshot = await client.async_snapshot("FR", "A")
+        assert snapshot.holidays == (TOUSSAINT, NOEL) and snapshot.version > 0
+        assert await client.async_snapshot("FR", "A") is snapshot
+        assert client._cache[("FR", "B", "None", None)]["snapshot"] is None
+        assert provider.calls == 0
+
+        # Saved again without decoding the untouched key
+        client._schedule_save()
+        client._store.flush()
+        assert school_holidays.decode_holidays(client._store.data["FR|B|None"]) == [NOEL]
+        assert client._cache[("FR", "B", "None", None)]["snapshot"] is None
+
+    asyncio.run(scenario())
+
+
+def _dataset(*holidays):
+    records = [("FR", h.zone, school_holidays.school_year_of(h.start), h.name, h.start, h.end) for h in holidays]
+    return school_holidays.HolidayDataset(build_dataset(records, revision=1))
+
+
+def test_bundled_dataset_is_served_until_the_first_answer(monkeypatch):
+    provider = GatedProvider([TOUSSAINT, NOEL])
+    client = _client(monkeypatch, provider)
+    monkeypatch.setattr(school_holidays.dt_util, "now", lambda: datetime(2025, 9, 10, tzinfo=timezone.utc))
+
+    async def scenario():
+        await client._async_load_cache()
+        client._dataset = _dataset(TOUSSAINT)
+
+        offline = await client.async_snapshot("FR", "A")
+        assert offline.holidays == (TOUSSAINT,)
+        assert await client.async_snapshot("FR", "A") is offline
+        # Other zones are not in the dataset: they wait for the provider
+        other = asyncio.ensure_future(client.async_snapshot("FR", "B"))
+        await asyncio.sleep(0)
+        assert not other.done()
+
+        provider.release.set()
+        await _settle(client)
+        live = await client.async_snapshot("FR", "A")
+        assert live.holidays == (TOUSSAINT, NOEL) and live.version > offline.version
+        assert (await other).holidays == (TOUSSAINT, NOEL)
+
+    asyncio.run(scenario())
+
+
+def test_bundled_dataset_backs_failed_fetches(monkeypatch):
+    provider = FakeProvider([])
+    client = _client(monkeypatch, provider)
+    monkeypatch.setattr(school_holidays.dt_util, "now", lambda: datetime(2025, 9, 10, tzinfo=timezone.utc))
+
+    async def scenario():
+        await client._async_load_cache()
+        client._dataset = _dataset(TOUSSAINT, NOEL)
+
+        offline = await client.async_snapshot("FR", "A")
+        await _settle(client)
+        assert provider.calls == 1 and ("FR", "A", "None", None) not in client._cache
+        # Backing off after the empty answer: still the bundled holidays
+        assert await client.async_snapshot("FR", "A") is offline
+        assert (await client.async_snapshot("FR", "A", 2026)).holidays == (NOEL,)
+        assert client.diagnostics()["dataset"] == 1
+        await _settle(client)
+
+    asyncio.run(scenario())
@@ -0,0 +1,85 @@
+"""Regression corpus for the sweep-line vacation filter."""
+
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from custom_components.custody_schedule.schedule import CustodyScheduleManager, CustodyWindow
+
+BASE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _legacy_filter(pattern_windows, vacation_windows):
+    """Previous O(patterns x vacations) implementation, kept as the reference."""
+    vacation_periods = [(vw.start, vw.end) for vw in vacation_windows if vw.source == "vacation_filter"]
+    if not vacation_periods:
+        vacation_periods = [(vw.start, vw.end) for vw in vacation_windows]
+    vacation_periods.sort(key=lambda x: x[0])
+
+    result = []
+    for item in pattern_windows:
+        fragments = [item]
+        for vac_start, vac_end in vacation_periods:
+            if item.end <= vac_start:
+                break
+            next_fragments = []
+            for frag in fragments:
+                if vac_end <= frag.start or vac_start >= frag.end:
+                    next_fragments.append(frag)
+                else:
+                    if frag.start < vac_start:
+                        next_fragments.append(CustodyWindow(frag.start, vac_start, frag.label, frag.source))
+                    if frag.end > vac_end:
+                        next_fragments.append(CustodyWindow(vac_end, frag.end, frag.label, frag.source))
+            fragments = next_fragments
+        result.extend(fragments)
+    return result
+
+
+def _window(rng, label, source, max_hours):
+    start = BASE + timedelta(hours=rng.randint(0, 24 * 90))
+    return CustodyWindow(start, start + timedelta(hours=rng.randint(0, max_hours)), label, source)
+
+
+def _key(windows):
+    return sorted((w.start, w.end, w.label, w.source) for w in windows)
+
+
+def test_sweep_matches_legacy_filter_on_random_corpus():
+    hass = MagicMock()
+    hass.config.time_zone = "UTC"
+    manager = CustodyScheduleManager(hass, {}, MagicMock())
+    rng = random.Random(2025)
+
+    for _ in range(500):
+        # Pattern windows are generated chronologically and never overlap
+        patterns = []
+        cursor = BASE
+        for _ in range(rng.randint(0, 25)):
+            cursor += timedelta(hours=rng.randint(0, 100))
+            end = cursor + timedelta(hours=rng.randint(1, 80))
+            patterns.append(CustodyWindow(cursor, end, "Garde", "pattern"))
+            cursor = end
+        vacations = [_window(rng, "Vacances", rng.choice(["vacation_filter", "vacation"]), 400) for _ in range(8)]
+        # Touching and zero-length periods are edge cases of the merge
+        if vacations and rng.random() < 0.3:
+            vacations.append(CustodyWindow(vacations[0].end, vacations[0].end, "Pont", "vacation_filter"))
+
+        expected = _legacy_filter(patterns, vacations)
+        actual = manager._engine.filter_windows_by_vacations(patterns, vacations)
+        assert _key(actual) == _key(expected)
+
+
+def test_untouched_windows_are_not_copied():
+    hass = MagicMock()
+    hass.config.time_zone = "UTC"
+    manager = CustodyScheduleManager(hass, {}, MagicMock())
+    before = CustodyWindow(BASE, BASE + timedelta(days=2), "Garde", "pattern")
+    inside = CustodyWindow(BASE + timedelta(days=10), BASE + timedelta(days=12), "Garde", "pattern")
+    across = CustodyWindow(BASE + timedelta(days=19), BASE + timedelta(days=23), "Garde", "pattern")
+    vacation = CustodyWindow(BASE + timedelta(days=9), BASE + timedelta(days=20), "Toussaint", "vacation_filter")
+
+    result = manager._engine.filter_windows_by_vacations([before, inside, across], [vacation])
+
+    assert result[0] is before
+    assert [(w.start, w.end) for w in result[1:]] == [(vacation.end, across.end)]
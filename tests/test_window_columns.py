@@ -0,0 +1,63 @@
+"""Tests for the columnar custody window storage."""
+
+import importlib.util
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_COLUMNS = Path(__file__).resolve().parents[1] / "custom_components" / "custody_schedule" / "window_columns.py"
+_spec = importlib.util.spec_from_file_location("custody_window_columns", _COLUMNS)
+wc = importlib.util.module_from_spec(_spec)
+assert _spec.loader is not None
+_spec.loader.exec_module(wc)
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+def _rows(rng, count):
+    rows = []
+    for _ in range(count):
+        start = datetime(2025, 1, 1, tzinfo=PARIS) + timedelta(hours=rng.randint(0, 24 * 365))
+        end = start + timedelta(hours=rng.randint(1, 24 * 20))
+        label = rng.choice(["Garde - Semaines alternées (1/1)", "Vacances scolaires - Noël (1ère moitié)", "Mercredi"])
+        rows.append((start, end, label, rng.choice(["pattern", "vacation", "exception_recurring"])))
+    return rows
+
+
+def test_rows_in_range_match_linear_scan():
+    rng = random.Random(10)
+    rows = _rows(rng, 200)
+    columns = wc.WindowColumns.from_rows(rows, PARIS)
+    ordered = sorted(rows, key=lambda row: row[0])
+    assert list(columns) == ordered
+
+    for _ in range(100):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(hours=rng.randint(-100, 24 * 380))
+        end = start + timedelta(hours=rng.randint(0, 24 * 60))
+        assert list(columns.rows(start, end)) == [row for row in ordered if row[1] >= start and row[0] <= end]
+
+
+def test_labels_are_interned_and_round_trip_json():
+    rows = _rows(random.Random(11), 50) + [
+        (datetime(2025, 6, 1, tzinfo=PARIS), datetime(2025, 6, 2, tzinfo=PARIS), "Fête", "brand_new_source")
+    ]
+    columns = wc.WindowColumns.from_rows(rows, PARIS)
+    data = json.loads(json.dumps(columns.to_dict()))
+    assert len(data["label_table"]) == 4
+    assert "brand_new_source" in data["source_table"]
+
+    restored = wc.WindowColumns.from_dict(data, PARIS)
+    assert list(restored) == list(columns)
+    assert len(restored) == len(rows)
+    # Views rebuilt in the configured time zone
+    assert all(row[0].tzinfo is PARIS for row in restored)
+
+
+def test_empty_columns():
+    columns = wc.WindowColumns(timezone.utc)
+    assert len(columns) == 0
+    assert (
+        list(columns.rows(datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2026, 1, 1, tzinfo=timezone.utc))) == []
+    )